@@ -3,7 +3,7 @@ from .core import *
 
 # Integrate dfply tools
 # --------------------------------------------------
-from .dfply import Intention, dfdelegate, make_symbolic, convert_type
+from .dfply import Intention, compile_intention, dfdelegate, make_symbolic, convert_type
 from .dfply import var_in, is_nan, not_nan
 from .dfply import starts_with, ends_with, contains, matches, everything
 from .dfply import num_range, one_of, columns_between, columns_from, columns_to
@@ -82,6 +82,7 @@ from .mutate_helpers import *
 
 ## Load grama tools
 # --------------------------------------------------
+from .eval_sink import *
 from .eval_defaults import *
 from .tran_tools import *
 
@@ -93,5 +94,7 @@ from .eval_opt import *
 from .plot_auto import *
 from .tran_shapley import *
 from .tran_summaries import *
+from .tran_lazy import *
 
 from .fit_synonyms import *
+from .fit_pce import *
@@ -1,56 +1,296 @@
-__all__ = ["comp_metamodel", "cp_metamodel"]
+__all__ = ["comp_metamodel", "cp_metamodel", "comp_update", "cp_update"]
 
 ## Fitting via statsmodels package
 import grama as gr
 from grama import add_pipe, pipe
+from inspect import signature
+from numpy import abs as npabs, argmax, argmin, isfinite, maximum, minimum
+from numpy import nanmax, sqrt, where, zeros
+from numpy import sum as npsum
+from numpy.random import RandomState
+from pandas import DataFrame, concat
 from toolz import curry
 
+## Helper functions
+# --------------------------------------------------
+def _cv_error(md_fit, df, ft, out, k=5, seed=None):
+    r"""Estimate normalized metamodel error by cross-validation
+
+    Uses closed-form leave-one-out residuals where every fitted function
+    provides loo(); otherwise k-fold CV via tran_kfolds.
+
+    Returns:
+        dict: Normalized RMS error (RMSE / output sd) for each output
+        array or None: Per-observation max normalized LOO residual
+    """
+    scale = df[out].std().values
+    scale = where(scale > 1e-16, scale, 1)
+
+    if all(map(lambda f: hasattr(f, "loo"), md_fit.functions)):
+        df_loo = concat([f.loo() for f in md_fit.functions], axis=1)[out]
+        E = npabs(df_loo.values) / scale
+        E = where(isfinite(E), E, nanmax(where(isfinite(E), E, 0)))
+        err = sqrt((E ** 2).mean(axis=0))
+
+        return dict(zip(out, err)), E.max(axis=1)
+
+    ## tran_kfolds uses folds of size ceil(n / k); avoid empty folds
+    n = df.shape[0]
+    k = min(k, n)
+    while (k > 2) and (-(-n // k) * (k - 1) >= n):
+        k -= 1
+    df_cv = gr.tran_kfolds(df, k=k, ft=ft, summaries=dict(mse=gr.mse), seed=seed)
+    err = sqrt(df_cv[["mse_" + o for o in out]].mean().values) / scale
+
+    return dict(zip(out, err)), None
+
+
+def _select_points(X_cand, X_train, base, m):
+    r"""Greedily select m candidates with largest base error
+
+    Each candidate's score base_j is discounted in proportion to its distance
+    to the nearest evaluated point, relative to that distance before selection;
+    this spreads a batch of selections apart.
+    """
+    d0 = zeros(X_cand.shape[0]) + float("inf")
+    for x in X_train:
+        d0 = minimum(d0, npsum((X_cand - x) ** 2, axis=1))
+    d = d0.copy()
+
+    I = []
+    for i in range(m):
+        score = base * where(d0 > 0, d / maximum(d0, 1e-300), 0)
+        score[I] = -1
+        I.append(int(argmax(score)))
+        d = minimum(d, npsum((X_cand - X_cand[I[-1]]) ** 2, axis=1))
+
+    return I
+
+
 ## Fit a metamodel
 # --------------------------------------------------
 @curry
-def comp_metamodel(model, n=1, ev=None, ft=None, seed=None):
+def comp_metamodel(
+    model,
+    n=1,
+    ev=None,
+    ft=None,
+    seed=None,
+    adaptive=False,
+    n_init=None,
+    n_add=None,
+    n_cand=500,
+    tol=1e-2,
+):
     r"""Create a metamodel
 
     Composition: Create a metamodel from an existing model. This convenience
     function essentially applies a recipe of Evaluation followed by Fitting.
-    Default methods are Latin Hypercube Evaluation and Ordinary Least Squares
-    Fitting with linear features.
+    Default methods are Latin Hypercube Evaluation (at nominal deterministic
+    levels) and Ordinary Least Squares Fitting with linear features in the
+    random variables.
+
+    With adaptive=True the metamodel is built sequentially: fit on n_init
+    points, estimate the error by cross-validation, and add n_add points where
+    the estimated error is largest, until the error falls below tol or n
+    evaluations are spent. Error is estimated by closed-form leave-one-out
+    residuals when the fitted functions support it (fit_ols, fit_gp), and by
+    5-fold CV (tran_kfolds) otherwise. New points are chosen from n_cand
+    candidates drawn by ev: by predicted standard deviation when the
+    metamodel reports one (e.g. fit_gp(return_std=True)), else by the LOO
+    residual of the nearest evaluated point weighted by distance to it, else
+    by distance alone (space-filling).
 
     Args:
         model (gr.model): Original model, to be evaluated and fit
-        n (numeric): Number of samples to draw
-        ev (gr.eval_): Evaluation strategy, default eval_lhs
-        ft (gr.fit_): Fitting strategy, default fit_ols w/ linear features
+        n (numeric): Number of samples to draw; evaluation budget when
+            adaptive
+        ev (gr.eval_): Evaluation strategy, default eval_lhs; called as
+            ev(model, n=n, seed=seed), and with skip=True when adaptive
+        ft (gr.fit_ or gr.ft_): Fitting strategy, default fit_ols w/ linear
+            features; applied as df >> ft
         seed (int): Random seed, default None
+        adaptive (bool): Build the metamodel sequentially?
+        n_init (int or None): Initial sample size when adaptive; default
+            max(n // 4, n_var_rand + 2)
+        n_add (int or None): Points added per iteration when adaptive; default
+            max(1, n // 10)
+        n_cand (int): Candidate points per iteration when adaptive
+        tol (float): Target normalized error (CV RMSE / output sd) when
+            adaptive; iteration stops once every output meets it
 
     Returns:
-        gr.model: Metamodel
+        gr.model: Metamodel; when adaptive, its history field holds the
+            convergence history as a DataFrame with columns n_eval, error
+            (max over outputs), and error_[out] for each output. The history
+            is kept by Model.copy(), and so by subsequent comp_ verbs
 
-    """
-    ## Extract model information
-    inputs = model.domain.inputs
-    outputs = model.outputs
+    Examples:
+        >>> import grama as gr
+        >>> from grama.fit import ft_gp
+        >>> from grama.models import make_cantilever_beam
+        >>> md = make_cantilever_beam()
+        >>> md_meta = md >> gr.cp_metamodel(n=100, seed=101)
+        >>> md_gp = md >> gr.cp_metamodel(
+        >>>     n=100,
+        >>>     ft=ft_gp(md=md, return_std=True),
+        >>>     adaptive=True,
+        >>>     tol=1e-3,
+        >>>     seed=101,
+        >>> )
+        >>> md_gp.history
 
+    """
     ## Assign default arguments
     if ev is None:
-        ev = gr.eval_lhs
+        from grama.eval import eval_lhs
+
+        ev = lambda md, n=1, seed=None, skip=False: eval_lhs(
+            md, n=n, df_det="nom", seed=seed, skip=skip
+        )
 
     if ft is None:
-        # Linear features for each output
-        sum_inputs = "+".join(inputs)
-        formulae = list(map(lambda output: output + "~" + sum_inputs, outputs))
+        from grama.fit import fit_ols
 
-        ft = lambda df: gr.fit_ols(
+        # Linear features for each output, sharing one design matrix
+        formulae = ["+".join(model.out) + "~" + "+".join(model.var_rand)]
+        ft = lambda df: fit_ols(
             df, formulae=formulae, domain=model.domain, density=model.density
         )
 
-    ## Generate data
-    df_results = ev(model, n_samples=n, seed=seed)
+    if not isinstance(ft, pipe):
+        ft = pipe(ft)
+
+    if not adaptive:
+        ## Generate data
+        df_results = ev(model, n=n, seed=seed)
 
-    ## Fit a model
-    model = ft(df_results)
+        ## Fit a model
+        return df_results >> ft
+
+    ## Adaptive construction
+    n = int(n)
+    if n_init is None:
+        n_init = max(n // 4, model.n_var_rand + 2)
+    if n_add is None:
+        n_add = max(1, n // 10)
+    n_init = min(n_init, n)
+    rng = RandomState(seed)
+    out = model.out
+
+    df_results = ev(model, n=n_init, seed=rng.randint(2 ** 31))
+    history = []
+    while True:
+        md_fit = df_results >> ft
+        err, E = _cv_error(md_fit, df_results, ft, out, seed=rng.randint(2 ** 31))
+        history.append(
+            dict(
+                n_eval=df_results.shape[0],
+                error=max(err.values()),
+                **{"error_" + o: e for o, e in err.items()}
+            )
+        )
+        if (max(err.values()) <= tol) or (df_results.shape[0] >= n):
+            break
 
-    return model
+        ## Score candidates
+        df_cand = ev(model, n=n_cand, seed=rng.randint(2 ** 31), skip=True)
+        var = [v for v in model.var if df_results[v].std() > 0]
+        lo, den = df_results[var].mean().values, df_results[var].std().values
+        X_cand = (df_cand[var].values - lo) / den
+        X_train = (df_results[var].values - lo) / den
+
+        out_std = [o + "_std" for o in out]
+        if set(out_std).issubset(set(md_fit.out)):
+            df_pred = gr.eval_df(md_fit, df=df_cand, append=False)
+            scale = df_results[out].std().values
+            base = (df_pred[out_std].values / where(scale > 1e-16, scale, 1)).max(
+                axis=1
+            )
+        else:
+            d0 = zeros((X_cand.shape[0], X_train.shape[0]))
+            for i, x in enumerate(X_train):
+                d0[:, i] = npsum((X_cand - x) ** 2, axis=1)
+            e_nn = 1 if E is None else E[argmin(d0, axis=1)]
+            base = e_nn * d0.min(axis=1)
+
+        I = _select_points(X_cand, X_train, base, min(n_add, n - df_results.shape[0]))
+        df_new = gr.eval_df(model, df=df_cand.iloc[I].reset_index(drop=True))
+        df_results = concat((df_results, df_new), axis=0, sort=False).reset_index(
+            drop=True
+        )
+
+    md_fit.history = DataFrame(history)
+
+    return md_fit
 
 
 cp_metamodel = add_pipe(comp_metamodel)
+
+
+## Update a fitted model
+# --------------------------------------------------
+@curry
+def comp_update(model, df=None, **kwargs):
+    r"""Update a fitted model with new data
+
+    Composition: Update the fitted functions of a model with new observations,
+    without retraining from scratch. Functions that do not support updating
+    (those without an update() method) are left unchanged.
+
+    Args:
+        model (gr.model): Fitted model, e.g. from gr.fit_gp() or gr.fit_rf()
+        df (DataFrame): New observations; must contain the var and out of each
+            updated function
+
+    Keyword Arguments:
+        Passed to the update() method of each function that accepts them; for
+        instance optimize (FunctionGPR) or n_estimators (FunctionRFR).
+
+    Returns:
+        gr.model: Updated model
+
+    Examples:
+        >>> import grama as gr
+        >>> from grama.fit import ft_gp
+        >>> from grama.models import make_test
+        >>> md = make_test()
+        >>> df_train = md >> gr.ev_monte_carlo(n=20, df_det="nom")
+        >>> md_gp = df_train >> ft_gp(md=md)
+        >>> df_new = md >> gr.ev_monte_carlo(n=5, df_det="nom")
+        >>> md_gp_new = md_gp >> gr.cp_update(df=df_new)
+
+    """
+    if df is None:
+        raise ValueError("Must provide `df` argument")
+    if all(map(lambda f: not hasattr(f, "update"), model.functions)):
+        raise ValueError("model has no functions that support update()")
+
+    ## Pass each function only the keyword arguments its update() accepts
+    accepted = [
+        set(signature(f.update).parameters.keys()) if hasattr(f, "update") else set()
+        for f in model.functions
+    ]
+    unused = set(kwargs.keys()).difference(set().union(*accepted))
+    if len(unused) > 0:
+        raise ValueError(
+            "Keyword arguments {} not accepted by any function's update()".format(
+                unused
+            )
+        )
+
+    functions = [
+        f.update(df, **{k: v for k, v in kwargs.items() if k in keys})
+        if hasattr(f, "update")
+        else f
+        for f, keys in zip(model.functions, accepted)
+    ]
+
+    model_new = model.copy()
+    model_new.functions = functions
+    model_new.update()
+
+    return model_new
+
+
+cp_update = add_pipe(comp_update)
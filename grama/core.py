@@ -924,7 +924,7 @@ class Model:
     """
 
     def __init__(
-        self, name=None, functions=None, domain=None, density=None,
+        self, name=None, functions=None, domain=None, density=None, history=None,
     ):
         r"""Constructor
 
@@ -937,6 +937,8 @@ class Model:
                 f(x) : R^n_in -> R^n_out along with function input and output names
             domain (gr.Domain): Model domain
             density (gr.Density): Model density
+            history (DataFrame or None): Construction history, e.g. the
+                convergence history of an adaptive metamodel; kept by copy()
 
         Returns:
             gr.Model: grama model
@@ -973,6 +975,7 @@ class Model:
         self.functions = functions
         self.domain = domain
         self.density = density
+        self.history = history
 
         self.update()
 
@@ -1066,11 +1069,16 @@ class Model:
 
         return DataFrame(data=data)
 
-    def evaluate_df(self, df):
+    def evaluate_df(self, df, checkpoint=None, chunk=1000, verbose=True):
         """Evaluate function using an input dataframe
 
         Args:
             df (DataFrame): Variable values at which to evaluate model functions
+            checkpoint (str or Path): Directory for checkpointing; results are
+                saved in chunks as they finish, and a restarted evaluation
+                recomputes only the chunks missing from the checkpoint
+            chunk (int): Number of rows per checkpointed chunk
+            verbose (bool): Report work reused from the checkpoint?
 
         Returns:
             DataFrame: Output results
@@ -1084,6 +1092,11 @@ class Model:
                 + "missing var = {}".format(var_diff)
             )
 
+        if checkpoint is not None:
+            from grama.eval_sink import _eval_checkpoint
+
+            return _eval_checkpoint(self, df, checkpoint, chunk=chunk, verbose=verbose)
+
         df_tmp = df.copy().drop(self.out, axis=1, errors="ignore")
         ## Evaluate each function
         for func in self.functions:
@@ -1280,6 +1293,7 @@ class Model:
             functions=copy.deepcopy(self.functions),
             domain=self.domain.copy(),
             density=self.density.copy(),
+            history=None if self.history is None else self.history.copy(),
         )
         new_model.update()
 
@@ -60,4 +60,16 @@ References:
     OH, 1984.
 """
 
-from .datasets import *
+from . import datasets
+from .datasets import __all__
+
+## Datasets load on first access; see datasets.py
+def __getattr__(name):
+    if name in __all__:
+        return getattr(datasets, name)
+
+    raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__, name))
+
+
+def __dir__():
+    return sorted(list(globals().keys()) + __all__)
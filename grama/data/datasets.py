@@ -7,21 +7,69 @@ __all__ = [
 ]
 
 import os
-from pandas import read_csv
+import sys
+from pandas import read_csv, read_pickle
 from pathlib import Path
 
 path_this = Path(__file__)
 path_grama = path_this.parents[1]
 
-# Stang (tidy form)
-df_stang = read_csv(Path(path_grama / "data/stang_long.csv"))
+## Dataset files
+_FILES = {
+    # Stang (tidy form)
+    "df_stang": "stang_long.csv",
+    # Diamonds
+    "df_diamonds": "diamonds.csv",
+    # Ruff (tidy form)
+    "df_ruff": "ruff.csv",
+    # Trajectories
+    "df_trajectory_full": "trajectory_full.csv",
+    "df_trajectory_windowed": "trajectory_windowed.csv",
+}
+_LOADED = {}
 
-# Stang (tidy form)
-df_diamonds = read_csv(Path(path_grama / "data/diamonds.csv"))
+## Lazy loading
+# --------------------------------------------------
+# Datasets are parsed on first access, and cached in binary (pickle) form next
+# to the CSV; the CSV remains the source of truth.
+def _load(name):
+    path_csv = Path(path_grama / "data" / _FILES[name])
+    path_pkl = path_csv.with_suffix(".pkl")
 
-# Ruff (tidy form)
-df_ruff = read_csv(Path(path_grama / "data/ruff.csv"))
+    if path_pkl.exists() and (path_pkl.stat().st_mtime >= path_csv.stat().st_mtime):
+        try:
+            return read_pickle(str(path_pkl))
+        except Exception:
+            pass
 
-# Trajectories
-df_trajectory_full = read_csv(Path(path_grama / "data/trajectory_full.csv"))
-df_trajectory_windowed = read_csv(Path(path_grama / "data/trajectory_windowed.csv"))
+    df = read_csv(path_csv)
+    ## Cache is optional; e.g. installs may be read-only
+    try:
+        path_tmp = path_pkl.with_name(
+            "{0:}.{1:}.tmp".format(path_pkl.name, os.getpid())
+        )
+        df.to_pickle(str(path_tmp))
+        path_tmp.replace(path_pkl)
+    except OSError:
+        pass
+
+    return df
+
+
+def __getattr__(name):
+    if name in _FILES:
+        if name not in _LOADED:
+            _LOADED[name] = _load(name)
+        return _LOADED[name]
+
+    raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__, name))
+
+
+def __dir__():
+    return sorted(list(globals().keys()) + list(_FILES.keys()))
+
+
+## Module __getattr__ (PEP 562) requires Python 3.7; load eagerly otherwise
+if sys.version_info < (3, 7):
+    for _name in _FILES:
+        globals()[_name] = _load(_name)
@@ -16,3 +16,22 @@ from .vector import *
 for verb in dir():
     if "ize" in verb:
         exec(verb.replace("ize", "ise") + "=" + verb)
+
+## Verbs that never write into their input; see gr.set_pipe_copy()
+from ..tools import _register_cow
+
+_register_cow(
+    group_by,
+    ungroup,
+    mask,
+    select,
+    drop,
+    rename,
+    arrange,
+    head,
+    tail,
+    distinct,
+    mutate,
+    transmute,
+    summarize,
+)
@@ -5,6 +5,14 @@ from functools import partial, wraps
 
 from .. import pipe  # Use grama pipe to preserve metadata
 
+try:
+    import numexpr
+
+    _NUMEXPR = True
+
+except ModuleNotFoundError:
+    _NUMEXPR = False
+
 
 def _recursive_apply(f, l):
     if isinstance(l, (list, tuple)):
@@ -59,32 +67,43 @@ def make_symbolic(f):
         delay = _check_delayed_eval(args, kwargs)
         if delay:
             delayed = _delayed_function(f, args, kwargs)
-            return Intention(delayed)
+            return Intention(delayed, expr=("fn", f, args, kwargs))
         else:
             return f(*args, **kwargs)
 
     ## Preserve documentation
     wrapper.__doc__ = f.__doc__
     wrapper.__name__ = f.__name__
+    wrapper.__wrapped__ = f
 
     return wrapper
 
 
 class Intention(object):
-    def __init__(self, function=lambda x: x, invert=False):
+    def __init__(self, function=None, invert=False, expr=None):
+        if function is None:
+            function, expr = (lambda x: x), ("ctx",)
         self.function = function
         self.inverted = invert
+        ## Expression tree; None for opaque functions. Stored under mangled
+        ## names, so that X.<name> refers to columns for any other name
+        self.__expr = expr
+        self.__compiled = None
 
     def evaluate(self, context):
-        return self.function(context)
+        if self.__compiled is None:
+            self.__compiled = _compile(self)
+        return self.__compiled(context)
 
     def __getattr__(self, attribute):
         return Intention(
-            lambda x: getattr(self.function(x), attribute), invert=self.inverted
+            lambda x: getattr(self.function(x), attribute),
+            invert=self.inverted,
+            expr=("attr", self, attribute),
         )
 
     def __invert__(self):
-        return Intention(self.function, invert=not self.inverted)
+        return Intention(self.function, invert=not self.inverted, expr=self.__expr)
 
     def __call__(self, *args, **kwargs):
         return Intention(
@@ -92,9 +111,223 @@ class Intention(object):
                 *_context_args(args)(x), **_context_kwargs(kwargs)(x)
             ),
             invert=self.inverted,
+            expr=("call", self, args, kwargs),
         )
 
 
+def _expr(intention):
+    r"""Expression tree of an Intention; None for opaque Intentions"""
+    return intention._Intention__expr
+
+
+## Intention compilation
+# ------------------------------------------------------------------------------
+# Expression trees are compiled once per Intention into a single flat lambda,
+# replacing the nested closures and per-evaluation argument walks. Purely
+# arithmetic expressions over columns are also compiled to a DataFrame.eval()
+# string, used for large frames when numexpr is available.
+
+_EVAL_ROWS = 100000
+
+_EVAL_OPS = {
+    "__add__": "+",
+    "__sub__": "-",
+    "__mul__": "*",
+    "__truediv__": "/",
+    "__pow__": "**",
+    "__gt__": ">",
+    "__ge__": ">=",
+    "__lt__": "<",
+    "__le__": "<=",
+    "__eq__": "==",
+    "__ne__": "!=",
+    "__and__": "&",
+    "__or__": "|",
+}
+_EVAL_ROPS = {
+    "__radd__": "+",
+    "__rsub__": "-",
+    "__rmul__": "*",
+    "__rtruediv__": "/",
+    "__rpow__": "**",
+}
+
+## Operators acting elementwise on columns
+_ELEMENTWISE = set(_EVAL_OPS) | set(_EVAL_ROPS) | {"__neg__", "__pos__", "__abs__"}
+
+
+class _Compiler(object):
+    def __init__(self):
+        self.consts = []
+
+    def const(self, value):
+        self.consts.append(value)
+        return "c[{}]".format(len(self.consts) - 1)
+
+    def args(self, args, kwargs):
+        code = [self.code(a) for a in args]
+        if len(kwargs) > 0:
+            code.append(
+                "**{"
+                + ", ".join(
+                    "{0!r}: {1}".format(k, self.code(v)) for k, v in kwargs.items()
+                )
+                + "}"
+            )
+        return ", ".join(code)
+
+    def code(self, node):
+        ## Mirror _recursive_apply() over lists and tuples
+        if isinstance(node, list):
+            return "[" + "".join(self.code(v) + ", " for v in node) + "]"
+        if isinstance(node, tuple):
+            return "(" + "".join(self.code(v) + ", " for v in node) + ")"
+        if not isinstance(node, Intention):
+            return self.const(node)
+        expr = _expr(node)
+        if expr is None:
+            return self.const(node.function) + "(x)"
+
+        kind = expr[0]
+        if kind == "ctx":
+            return "x"
+        if kind == "attr":
+            return "getattr({0}, {1!r})".format(self.code(expr[1]), expr[2])
+        if kind == "method":
+            _, parent, name, args, kwargs = expr
+            return "getattr({0}, {1!r})({2})".format(
+                self.code(parent), name, self.args(args, kwargs)
+            )
+        if kind == "call":
+            _, parent, args, kwargs = expr
+            return "{0}({1})".format(self.code(parent), self.args(args, kwargs))
+        if kind == "fn":
+            _, f, args, kwargs = expr
+            return "{0}({1})".format(self.const(f), self.args(args, kwargs))
+
+        raise ValueError("Unrecognized expression {}".format(kind))
+
+
+def _eval_string(node, names):
+    r"""DataFrame.eval() string for an arithmetic expression, or None
+
+    Appends referenced column names to names.
+    """
+    if isinstance(node, (int, float)) and not isinstance(node, bool):
+        return repr(node)
+    if (not isinstance(node, Intention)) or (_expr(node) is None):
+        return None
+
+    expr = _expr(node)
+    kind = expr[0]
+    if kind == "attr":
+        _, parent, name = expr
+        if (_expr(parent) == ("ctx",)) and name.isidentifier():
+            names.append(name)
+            return name
+    if kind == "method":
+        _, parent, name, args, kwargs = expr
+        if len(kwargs) > 0:
+            return None
+        if (name == "__neg__") and (len(args) == 0):
+            p = _eval_string(parent, names)
+            return None if p is None else "(-{})".format(p)
+        if (name in _EVAL_OPS) and (len(args) == 1):
+            p, a = _eval_string(parent, names), _eval_string(args[0], names)
+            if (p is None) or (a is None):
+                return None
+            return "({0} {1} {2})".format(p, _EVAL_OPS[name], a)
+        if (name in _EVAL_ROPS) and (len(args) == 1):
+            p, a = _eval_string(parent, names), _eval_string(args[0], names)
+            if (p is None) or (a is None):
+                return None
+            return "({0} {1} {2})".format(a, _EVAL_ROPS[name], p)
+
+    return None
+
+
+def _column_name(df, arg):
+    r"""Column name referenced by an Intention like X.y or X["y"], or None"""
+    if (not isinstance(arg, Intention)) or (_expr(arg) is None) or arg.inverted:
+        return None
+    expr = _expr(arg)
+    if (expr[0] == "attr") and (_expr(expr[1]) == ("ctx",)):
+        name = expr[2]
+    elif (
+        (expr[0] == "method")
+        and (_expr(expr[1]) == ("ctx",))
+        and (expr[2] == "__getitem__")
+        and (len(expr[3]) == 1)
+        and (len(expr[4]) == 0)
+    ):
+        name = expr[3][0]
+    else:
+        return None
+    if isinstance(name, str) and (name in df.columns):
+        return name
+
+    return None
+
+
+def _build(intention):
+    compiler = _Compiler()
+    source = "lambda x: " + compiler.code(intention)
+    names = []
+    string = None
+    if _expr(intention)[0] == "method":
+        string = _eval_string(intention, names)
+
+    return source, compiler.consts, string, names
+
+
+def compile_intention(intention):
+    r"""Inspect the compiled form of an Intention
+
+    Returns:
+        str or None: Source of the flat lambda evaluating the Intention; None
+            for opaque Intentions
+        str or None: DataFrame.eval() string, if the Intention is arithmetic
+            over columns
+
+    """
+    if _expr(intention) is None:
+        return None, None
+    source, _, string, _ = _build(intention)
+
+    return source, string
+
+
+def _compile(intention):
+    if _expr(intention) is None:
+        return intention.function
+    source, consts, string, names = _build(intention)
+    fun = eval(source, {"c": consts})
+    if (not _NUMEXPR) or (string is None):
+        return fun
+
+    def fun_eval(x):
+        if (
+            isinstance(x, pd.DataFrame)
+            and (x.shape[0] >= _EVAL_ROWS)
+            and all(
+                (n in x.columns) and pd.api.types.is_numeric_dtype(x[n]) for n in names
+            )
+        ):
+            ## Columns may clash with numexpr builtins (e.g. sin; raises a
+            ## NameError) or keywords (SyntaxError), or hold values eval()
+            ## does not support; fall back to the closure. eval() also drops
+            ## the Series name, recovered from the closure on no rows
+            try:
+                res = x.eval(string)
+            except (NameError, SyntaxError, TypeError, ValueError):
+                return fun(x)
+            res.name = fun(x.iloc[:0]).name
+            return res
+        return fun(x)
+
+    return fun_eval
+
+
 _magic_method_names = [
     "__abs__",
     "__add__",
@@ -185,6 +418,7 @@ def _set_magic_method(name):
                 *_context_args(args)(x), **_context_kwargs(kwargs)(x)
             ),
             invert=self.inverted,
+            expr=("method", self, name, args, kwargs),
         )
 
     return magic_method
@@ -358,11 +592,20 @@ def symbolic_evaluation(
 class group_delegation(object):
     __name__ = "group_delegation"
 
-    def __init__(self, function):
+    def __init__(self, function, native=None):
         self.function = function
+        self.native = native
         self.__doc__ = function.__doc__
 
     def _apply(self, df, *args, **kwargs):
+        ## Vectorized implementation, if provided and applicable
+        if self.native is not None:
+            dff = self.native(df, *args, **kwargs)
+            if dff is not None:
+                for field in df._metadata:
+                    setattr(dff, field, getattr(df, field))
+                return dff
+
         grouped = df.groupby(df._grouped_by)
 
         dff = grouped.apply(self.function, *args, **kwargs)
@@ -396,8 +639,8 @@ class group_delegation(object):
             return applied
 
 
-def dfpipe(f):
-    return pipe(group_delegation(symbolic_evaluation(f)))
+def dfpipe(f, native=None):
+    return pipe(group_delegation(symbolic_evaluation(f), native=native))
 
 
 def dfdelegate(f):
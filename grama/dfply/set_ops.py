@@ -1,5 +1,6 @@
 from .base import *
 import warnings
+import numpy as np
 import pandas as pd
 
 
@@ -27,13 +28,91 @@ def validate_set_ops(df, other):
         return
 
 
+def _validate_by(df, other, by):
+    r"""Columns compared by a set operation"""
+    if by is None:
+        validate_set_ops(df, other)
+        return list(df.columns)
+
+    by = [by] if isinstance(by, str) else list(by)
+    missing = [
+        col for col in by if (col not in df.columns) or (col not in other.columns)
+    ]
+    if len(missing) > 0:
+        raise ValueError("Columns {} must be in both DataFrames".format(missing))
+    if len(df.index.names) != len(other.index.names):
+        raise ValueError("Index dimension mismatch")
+
+    return by
+
+
+def _value_key(value):
+    r"""Hashable key for a value; missing values are equal, bools are not 1"""
+    if pd.isnull(value):
+        return ("nan",)
+    if isinstance(value, (bool, np.bool_)):
+        return ("bool", bool(value))
+
+    return ("value", value)
+
+
+def _row_keys(df, other, by, index):
+    r"""Label the rows of two DataFrames; equal rows share a label
+
+    Rows are hashed (both frames together, so that columns share a common
+    dtype); rows sharing a hash are confirmed equal on their values, so that
+    hash collisions, and e.g. 1 and "1" in object columns, are told apart.
+
+    Returns:
+        numpy array: Row labels of df
+        numpy array: Row labels of other
+    """
+    stacked = pd.concat([df[by], other[by]], ignore_index=not index)
+    for col in by:
+        ## Normalize -0.0 to 0.0, as in merges
+        if pd.api.types.is_float_dtype(stacked[col]):
+            stacked[col] = stacked[col] + 0.0
+    hashes = pd.util.hash_pandas_object(stacked, index=index).values
+    labels, _ = pd.factorize(hashes)
+
+    ## Compare each row with the first row sharing its hash
+    first = np.full(labels.max() + 1, -1)
+    first[labels[::-1]] = np.arange(len(labels))[::-1]
+    columns = [stacked[col].values for col in by]
+    if index:
+        columns.extend(
+            stacked.index.get_level_values(i).values
+            for i in range(stacked.index.nlevels)
+        )
+    same = np.ones(len(labels), dtype=bool)
+    for values in columns:
+        reps = values[first[labels]]
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            equal = np.asarray(values == reps, dtype=bool)
+        same &= equal | (pd.isnull(values) & pd.isnull(reps))
+
+    ## Relabel the (rare) rows differing from their representative
+    if not same.all():
+        relabel = {}
+        n_labels = labels.max() + 1
+        for i in np.flatnonzero(~same):
+            key = (labels[i],) + tuple(_value_key(values[i]) for values in columns)
+            if key not in relabel:
+                relabel[key] = n_labels
+                n_labels += 1
+            labels[i] = relabel[key]
+
+    return labels[: df.shape[0]], labels[df.shape[0] :]
+
+
 # ------------------------------------------------------------------------------
 # `union`
 # ------------------------------------------------------------------------------
 
 
 @pipe
-def union(df, other, index=False, keep="first"):
+def union(df, other, index=False, keep="first", by=None):
     """
     Returns rows that appear in either DataFrame.
 
@@ -47,22 +126,18 @@ def union(df, other, index=False, keep="first"):
             as part of the set operation (default `False`).
         keep (str): Indicates which duplicate should be kept. Options are `'first'`
             and `'last'`.
+        by (str or list): Columns compared to identify duplicate rows (default
+            all columns).
     """
+    ## Stacking requires matching columns, even when comparing a subset
     validate_set_ops(df, other)
+    by = _validate_by(df, other, by)
+    h_df, h_other = _row_keys(df, other, by, index)
     stacked = df.append(other)
-    if index:
-        stacked_reset_indexes = stacked.reset_index()
-        index_cols = [
-            col for col in stacked_reset_indexes.columns if col not in df.columns
-        ]
-        index_name = df.index.names
-        return_df = stacked_reset_indexes.drop_duplicates(keep=keep).set_index(
-            index_cols
-        )
-        return_df.index.names = index_name
-        return return_df
-    else:
-        return stacked.drop_duplicates(keep=keep)
+
+    return stacked[
+        ~pd.Series(np.concatenate((h_df, h_other))).duplicated(keep=keep).values
+    ]
 
 
 # ------------------------------------------------------------------------------
@@ -71,10 +146,13 @@ def union(df, other, index=False, keep="first"):
 
 
 @pipe
-def intersect(df, other, index=False, keep="first"):
+def intersect(df, other, index=False, keep="first", by=None):
     """
     Returns rows that appear in both DataFrames.
 
+    Rows are compared by hashing, so the cost is linear in the number of rows;
+    rows with equal hashes are confirmed equal on their values.
+
     Args:
         df (pandas.DataFrame): data passed in through the pipe.
         other (pandas.DataFrame): other DataFrame to use for set operation with
@@ -85,34 +163,18 @@ def intersect(df, other, index=False, keep="first"):
             as part of the set operation (default `False`).
         keep (str): Indicates which duplicate should be kept. Options are `'first'`
             and `'last'`.
+        by (str or list): Columns compared to match rows (default all columns).
+            Rows of the first DataFrame are returned.
     """
+    by = _validate_by(df, other, by)
+    h_df, h_other = _row_keys(df, other, by, index)
+    h_df = pd.Series(h_df)
+    mask = h_df.isin(h_other).values & ~h_df.duplicated(keep=keep).values
 
-    validate_set_ops(df, other)
-    if index:
-        df_reset_index = df.reset_index()
-        other_reset_index = other.reset_index()
-        index_cols = [col for col in df_reset_index.columns if col not in df.columns]
-        df_index_names = df.index.names
-        return_df = pd.merge(
-            df_reset_index,
-            other_reset_index,
-            how="inner",
-            left_on=df_reset_index.columns.values.tolist(),
-            right_on=df_reset_index.columns.values.tolist(),
-        ).set_index(index_cols)
-        return_df.index.names = df_index_names
-        return_df = return_df.drop_duplicates(keep=keep)
-        return return_df
-    else:
-        return_df = pd.merge(
-            df,
-            other,
-            how="inner",
-            left_on=df.columns.values.tolist(),
-            right_on=df.columns.values.tolist(),
-        )
-        return_df = return_df.drop_duplicates(keep=keep)
-        return return_df
+    return_df = df[mask]
+    if not index:
+        return_df = return_df.reset_index(drop=True)
+    return return_df
 
 
 # ------------------------------------------------------------------------------
@@ -121,10 +183,13 @@ def intersect(df, other, index=False, keep="first"):
 
 
 @pipe
-def set_diff(df, other, index=False, keep="first"):
+def set_diff(df, other, index=False, keep="first", by=None):
     """
     Returns rows that appear in the first DataFrame but not the second.
 
+    Rows are compared by hashing, so the cost is linear in the number of rows;
+    rows with equal hashes are confirmed equal on their values.
+
     Args:
         df (pandas.DataFrame): data passed in through the pipe.
         other (pandas.DataFrame): other DataFrame to use for set operation with
@@ -135,35 +200,13 @@ def set_diff(df, other, index=False, keep="first"):
             as part of the set operation (default `False`).
         keep (str): Indicates which duplicate should be kept. Options are `'first'`
             and `'last'`.
+        by (str or list): Columns compared to match rows (default all columns).
     """
-
-    validate_set_ops(df, other)
-    if index:
-        df_reset_index = df.reset_index()
-        other_reset_index = other.reset_index()
-        index_cols = [col for col in df_reset_index.columns if col not in df.columns]
-        df_index_names = df.index.names
-        return_df = pd.merge(
-            df_reset_index,
-            other_reset_index,
-            how="left",
-            left_on=df_reset_index.columns.values.tolist(),
-            right_on=other_reset_index.columns.values.tolist(),
-            indicator=True,
-        ).set_index(index_cols)
-        return_df = return_df[return_df._merge == "left_only"]
-        return_df.index.names = df_index_names
-        return_df = return_df.drop_duplicates(keep=keep)[df.columns]
-        return return_df
-    else:
-        return_df = pd.merge(
-            df,
-            other,
-            how="left",
-            left_on=df.columns.values.tolist(),
-            right_on=df.columns.values.tolist(),
-            indicator=True,
-        )
-        return_df = return_df[return_df._merge == "left_only"]
-        return_df = return_df.drop_duplicates(keep=keep)[df.columns]
-        return return_df
+    by = _validate_by(df, other, by)
+    h_df, h_other = _row_keys(df, other, by, index)
+    h_df = pd.Series(h_df)
+    mask = ~h_df.isin(h_other).values & ~h_df.duplicated(keep=keep).values
+
+    if not index:
+        df = df.reset_index(drop=True)
+    return df[mask]
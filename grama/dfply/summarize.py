@@ -1,11 +1,131 @@
 from .base import *
+from .base import _column_name, _expr
+from .summary_functions import mean, sd, var, median, colmin, colmax, colsum
+from .summary_functions import n, quant, IQR
 
+## Native grouped summaries
+# ------------------------------------------------------------------------------
+# Grouped summaries built only from recognized reducers are computed with
+# vectorized groupby reductions, rather than one symbolic evaluation per group.
 
-@dfpipe
+_AGG_FUNCTIONS = {
+    mean.__wrapped__: "mean",
+    sd.__wrapped__: "std",
+    var.__wrapped__: "var",
+    median.__wrapped__: "median",
+    colmin.__wrapped__: "min",
+    colmax.__wrapped__: "max",
+    colsum.__wrapped__: "sum",
+    n.__wrapped__: "size",
+}
+_AGG_METHODS = {
+    "mean": "mean",
+    "std": "std",
+    "var": "var",
+    "median": "median",
+    "min": "min",
+    "max": "max",
+    "sum": "sum",
+}
+
+
+def _reducer(df, value):
+    r"""Translate a summary to (column, aggregation), or None
+
+    Aggregations are either a groupby reduction name or a list of
+    ("quantile", p, sign) tuples, summed.
+    """
+    if (not isinstance(value, Intention)) or (_expr(value) is None) or value.inverted:
+        return None
+    expr = _expr(value)
+
+    ## Summary functions, e.g. gr.mean(X.y)
+    if expr[0] == "fn":
+        _, f, args, kwargs = expr
+        if (len(args) < 1) or (_column_name(df, args[0]) is None):
+            return None
+        col = _column_name(df, args[0])
+        if (f in _AGG_FUNCTIONS) and (len(args) == 1) and (len(kwargs) == 0):
+            return col, _AGG_FUNCTIONS[f]
+        if f is IQR.__wrapped__ and (len(args) == 1) and (len(kwargs) == 0):
+            return col, [("quantile", 0.75, +1), ("quantile", 0.25, -1)]
+        if f is quant.__wrapped__:
+            p = args[1] if len(args) > 1 else kwargs.get("p")
+            if (
+                (len(args) + len(kwargs) == 2)
+                and isinstance(p, (int, float))
+                and not isinstance(p, bool)
+            ):
+                return col, [("quantile", p, +1)]
+
+    ## Series methods, e.g. X.y.mean()
+    if (expr[0] == "call") and (len(expr[2]) == 0) and (len(expr[3]) == 0):
+        parent = expr[1]
+        if (
+            (_expr(parent) is not None)
+            and (_expr(parent)[0] == "attr")
+            and (_expr(parent)[2] in _AGG_METHODS)
+        ):
+            col = _column_name(df, _expr(parent)[1])
+            if col is not None:
+                return col, _AGG_METHODS[_expr(parent)[2]]
+
+    return None
+
+
+def _summarize_native(df, **kwargs):
+    r"""Grouped summarize with groupby reductions; None if not applicable"""
+    keys = df._grouped_by
+    if (df.shape[0] == 0) or (len(kwargs) == 0):
+        return None
+    if any(map(lambda k: k in keys, kwargs.keys())):
+        return None
+
+    reducers, constants = {}, {}
+    for key, value in kwargs.items():
+        if isinstance(value, Intention):
+            reducer = _reducer(df, value)
+            if reducer is None:
+                return None
+            reducers[key] = reducer
+        elif isinstance(value, (int, float, str, bool)):
+            constants[key] = value
+        else:
+            return None
+
+    ## Groupby reductions match the corresponding Series methods exactly
+    grouped = df.groupby(keys)
+    values = {}
+    for key, (col, agg) in reducers.items():
+        if isinstance(agg, str):
+            values[key] = getattr(grouped[col], agg)()
+        else:
+            values[key] = 0
+            for _, p, sign in agg:
+                values[key] = values[key] + sign * grouped[col].quantile(p)
+    if len(values) > 0:
+        df_res = pd.DataFrame(values)
+    else:
+        df_res = grouped.size().to_frame().iloc[:, []]
+    for key, value in constants.items():
+        df_res[key] = value
+
+    ## Match the layout of the per-group path: keys (in reverse order) first
+    df_res = df_res[list(kwargs.keys())].reset_index()
+    keys = list(df_res.columns[: len(keys)])
+
+    return df_res[keys[::-1] + list(kwargs.keys())]
+
+
+## Verbs
+# ------------------------------------------------------------------------------
 def summarize(df, **kwargs):
     return pd.DataFrame({k: [v] for k, v in kwargs.items()})
 
 
+summarize = dfpipe(summarize, native=_summarize_native)
+
+
 @dfpipe
 def summarize_each(df, functions, *args):
     columns, values = [], []
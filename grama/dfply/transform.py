@@ -1,7 +1,164 @@
 from .base import *
+from .base import _column_name, _expr, _ELEMENTWISE
+from .window_functions import lead, lag, dense_rank, min_rank, row_number
+from .window_functions import cumsum, cumprod, cummean, cummax, cummin
+from .window_functions import percent_rank
+from inspect import signature
 
+## Native grouped mutates
+# ------------------------------------------------------------------------------
+# Grouped mutates built from window helpers and elementwise operations are
+# computed with vectorized groupby operations (shift, cumsum, rank, ...),
+# rather than one symbolic evaluation per group.
 
-@dfpipe
+
+def _group_sizes(grouped):
+    ngroup = grouped.ngroup().values
+    counts = np.bincount(ngroup[ngroup >= 0], minlength=1)
+
+    return pd.Series(np.where(ngroup >= 0, counts[ngroup], 0), index=grouped.obj.index)
+
+
+def _window(grouped, col, f, params):
+    r"""Vectorized window helper on one column, or None"""
+    g = grouped[col]
+    has_na = grouped.obj[col].isnull().any()
+    ascending = params.get("ascending", True)
+
+    if f is lead.__wrapped__:
+        return g.shift(-params["i"])
+    if f is lag.__wrapped__:
+        return g.shift(params["i"])
+    if f is cumsum.__wrapped__:
+        return g.cumsum()
+    if f is cumprod.__wrapped__:
+        prods = g.cumprod()
+        ## Restore integer types; rows with missing keys are dropped later
+        if pd.api.types.is_integer_dtype(grouped.obj[col]):
+            prods = prods.fillna(0).astype(grouped.obj[col].dtype)
+        return prods
+    if f is dense_rank.__wrapped__:
+        return g.rank(method="dense", ascending=ascending)
+    if f is min_rank.__wrapped__:
+        return g.rank(method="min", ascending=ascending)
+    if f is row_number.__wrapped__:
+        return g.rank(method="first", ascending=ascending)
+    if f is percent_rank.__wrapped__:
+        size = _group_sizes(grouped)
+        percents = (g.rank(method="min", ascending=ascending) - 1) / (size - 1)
+        return percents.where(size != 1, 0.0)
+    ## Expanding windows skip missing values; only handled without them
+    if has_na:
+        return None
+    if f is cummean.__wrapped__:
+        return g.cumsum() / (grouped.cumcount() + 1)
+    if f is cummax.__wrapped__:
+        return g.cummax().astype(float)
+    if f is cummin.__wrapped__:
+        return g.cummin().astype(float)
+
+    return None
+
+
+_WINDOWS = [
+    f.__wrapped__
+    for f in (
+        lead,
+        lag,
+        cumsum,
+        cumprod,
+        dense_rank,
+        min_rank,
+        row_number,
+        percent_rank,
+        cummean,
+        cummax,
+        cummin,
+    )
+]
+
+
+def _mutate_value(grouped, node):
+    r"""Evaluate an elementwise expression of columns and window helpers
+
+    Returns None if the expression contains anything else.
+    """
+    df = grouped.obj
+    if isinstance(node, (int, float, str, bool)):
+        return node
+    if (not isinstance(node, Intention)) or (_expr(node) is None):
+        return None
+    ## Columns
+    col = _column_name(df, node)
+    if col is not None:
+        return df[col]
+    expr = _expr(node)
+
+    ## Window helpers, e.g. gr.lag(X.y)
+    if (expr[0] == "fn") and (expr[1] in _WINDOWS):
+        _, f, args, kwargs = expr
+        if len(args) < 1:
+            return None
+        col = _column_name(df, args[0])
+        try:
+            params = signature(f).bind(None, *args[1:], **kwargs)
+        except TypeError:
+            return None
+        params.apply_defaults()
+        params = dict(list(params.arguments.items())[1:])
+        if (col is None) or any(
+            map(lambda v: isinstance(v, Intention), params.values())
+        ):
+            return None
+        if (f in (lead.__wrapped__, lag.__wrapped__)) and not isinstance(
+            params["i"], int
+        ):
+            return None
+        return _window(grouped, col, f, params)
+
+    ## Elementwise operations
+    if (expr[0] == "method") and (expr[2] in _ELEMENTWISE) and (len(expr[4]) == 0):
+        _, parent, name, args, _ = expr
+        values = [_mutate_value(grouped, v) for v in (parent,) + tuple(args)]
+        if any(map(lambda v: v is None, values)):
+            return None
+        return getattr(values[0], name)(*values[1:])
+
+    return None
+
+
+def _mutate_native(df, **kwargs):
+    r"""Grouped mutate with vectorized groupby operations; None if not applicable"""
+    if (df.shape[0] == 0) or (len(kwargs) == 0) or (df.index.nlevels > 1):
+        return None
+    if any(map(lambda k: pd.api.types.is_categorical_dtype(df[k]), df._grouped_by)):
+        return None
+    grouped = df.groupby(df._grouped_by)
+    ngroup = grouped.ngroup().values
+    if (ngroup < 0).all():
+        return None
+
+    values = {}
+    for key, node in kwargs.items():
+        value = _mutate_value(grouped, node)
+        if value is None:
+            return None
+        if isinstance(value, pd.Series):
+            if isinstance(node, Intention) and node.inverted:
+                value = ~value
+            value = value.values
+        values[key] = value
+    df_res = df.assign(**values)
+
+    ## Keep input row order; rows with missing keys belong to no group
+    if (ngroup < 0).any():
+        return df_res[ngroup >= 0]
+
+    return df_res
+
+
+## Verbs
+# ------------------------------------------------------------------------------
 def mutate(df, **kwargs):
     """
     Creates new variables (columns) in the DataFrame specified by keyword
@@ -27,6 +184,9 @@ def mutate(df, **kwargs):
     return df.assign(**kwargs)
 
 
+mutate = dfpipe(mutate, native=_mutate_native)
+
+
 @dfpipe
 def mutate_if(df, predicate, fun):
     """
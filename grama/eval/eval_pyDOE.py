@@ -15,6 +15,7 @@ import warnings
 
 import grama as gr
 from grama import add_pipe, pipe, custom_formatwarning
+from grama.eval_sink import _write_meta
 from scipy.stats import norm, lognorm
 from toolz import curry
 from numpy.linalg import cholesky, inv
@@ -24,7 +25,15 @@ from numbers import Integral
 # --------------------------------------------------
 @curry
 def eval_lhs(
-    model, n=1, df_det=None, seed=None, append=True, skip=False, criterion=None
+    model,
+    n=1,
+    df_det=None,
+    seed=None,
+    append=True,
+    skip=False,
+    criterion=None,
+    sink=None,
+    chunk=1000,
 ):
     r"""Latin Hypercube evaluation
     Evaluates a given model on a latin hypercube sample (LHS) using the model's
@@ -40,6 +49,9 @@ def eval_lhs(
         criterion (str): flag for LHS sample criterion
             allowable values: None, "center" ("c"), "maxmin" ("m"),
             "centermaxmin" ("cm"), "correlation" ("corr")
+        sink (str or Path): Stream results to a Parquet or Feather dataset;
+            see gr.eval_df()
+        chunk (int): Number of rows per chunk written to sink
     Returns:
         DataFrame: Results of evaluation or unevaluated design
     Notes:
@@ -65,7 +77,11 @@ def eval_lhs(
     if skip:
         return df_samp
     else:
-        return gr.eval_df(model, df=df_samp, append=append)
+        df_res = gr.eval_df(model, df=df_samp, append=append, sink=sink, chunk=chunk)
+        if sink is not None:
+            _write_meta(sink, df_res, seed=seed)
+
+        return df_res
 
 
 ev_lhs = add_pipe(eval_lhs)
@@ -9,18 +9,29 @@ __all__ = [
     "ev_conservative",
 ]
 
-from numpy import ones, eye, tile, atleast_2d
+from numpy import ones, eye, tile, atleast_2d, arange, concatenate, repeat, unique
 from pandas import DataFrame, concat
 import itertools
 
 import grama as gr
 from grama import add_pipe, pipe
+from grama.dfply.set_ops import _row_keys
+from grama.eval_sink import _eval_sink
 from toolz import curry
 
 ## Default evaluation function
 # --------------------------------------------------
 @curry
-def eval_df(model, df=None, append=True, verbose=True):
+def eval_df(
+    model,
+    df=None,
+    append=True,
+    verbose=True,
+    dedupe=False,
+    sink=None,
+    checkpoint=None,
+    chunk=1000,
+):
     r"""Evaluate model at given values
 
     Evaluates a given model at a given dataframe.
@@ -29,6 +40,21 @@ def eval_df(model, df=None, append=True, verbose=True):
         model (gr.Model): Model to evaluate
         df (DataFrame): Input dataframe to evaluate
         append (bool): Append results to original dataframe?
+        verbose (bool): Print messages?
+        dedupe (bool): Evaluate only unique rows? Rows are compared on
+            model.var by hashing, with matches confirmed on their values;
+            results are copied back to duplicate rows. Assumes the model
+            functions are deterministic. Requires df to contain model.var.
+        sink (str or Path): Stream results to a partitioned dataset directory,
+            ending in .parquet or .feather; requires pyarrow. Results are
+            written in chunks as they finish; chunks already in the sink with
+            the same inputs are reused, resuming interrupted runs. Read with
+            gr.read_sink().
+        checkpoint (str or Path): Checkpoint directory for model evaluation;
+            see gr.Model.evaluate_df(). Results are saved in chunks keyed on
+            their inputs; a restarted evaluation recomputes only the missing
+            chunks.
+        chunk (int): Number of rows per chunk written to sink or checkpoint
 
     Returns:
         DataFrame: Results of model evaluation
@@ -53,7 +79,48 @@ def eval_df(model, df=None, append=True, verbose=True):
             + "eval_df() is dropping {}".format(out_intersect)
         )
 
-    df_res = model.evaluate_df(df)
+    if sink is not None:
+        df_res = _eval_sink(
+            model,
+            df,
+            sink,
+            chunk=chunk,
+            verbose=verbose,
+            dedupe=dedupe,
+            checkpoint=checkpoint,
+        )
+        if append:
+            return df_res
+        return df_res[model.out]
+
+    if dedupe and not set(model.var).issubset(set(df.columns)):
+        raise ValueError(
+            "dedupe requires df to contain model.var; missing {}".format(
+                set(model.var).difference(set(df.columns))
+            )
+        )
+
+    if dedupe:
+        ## Evaluate each unique input once, then scatter to all rows
+        labels, _ = _row_keys(df, df.iloc[:0], model.var, False)
+        _, i_unique, codes = unique(labels, return_index=True, return_inverse=True)
+        if verbose:
+            print(
+                "... eval_df() evaluating {0:} unique of {1:} rows ({2:.1%})".format(
+                    len(i_unique), df.shape[0], len(i_unique) / max(df.shape[0], 1)
+                )
+            )
+        df_res = model.evaluate_df(
+            df.iloc[i_unique].reset_index(drop=True),
+            checkpoint=checkpoint,
+            chunk=chunk,
+            verbose=verbose,
+        )
+        df_res = df_res.iloc[codes].reset_index(drop=True)
+    else:
+        df_res = model.evaluate_df(
+            df, checkpoint=checkpoint, chunk=chunk, verbose=verbose
+        )
 
     if append:
         df_res = concat(
@@ -115,7 +182,9 @@ ev_nominal = add_pipe(eval_nominal)
 ## Gradient finite-difference evaluation
 # --------------------------------------------------
 @curry
-def eval_grad_fd(model, h=1e-8, df_base=None, var=None, append=True, skip=False):
+def eval_grad_fd(
+    model, h=1e-8, df_base=None, var=None, append=True, skip=False, batch=False
+):
     r"""Finite-difference gradient approximation
 
     Evaluates a given model with a central-difference stencil to approximate the
@@ -130,6 +199,10 @@ def eval_grad_fd(model, h=1e-8, df_base=None, var=None, append=True, skip=False)
             or flag; "rand" for var_rand, "det" for var_det
         append (bool): Append results to base point inputs?
         skip (bool): Skip evaluation of the functions?
+        batch (bool): Evaluate the stencils for all base points in a single
+            call to eval_df? Faster for vectorized models, at the cost of
+            holding all 2 * len(var) * df_base.shape[0] stencil points in
+            memory.
 
     Returns:
         DataFrame: Gradient approximation or unevaluated design
@@ -179,6 +252,26 @@ def eval_grad_fd(model, h=1e-8, df_base=None, var=None, append=True, skip=False)
     ]
     grad_labels = list(itertools.chain.from_iterable(nested_labels))
 
+    ## Evaluate all stencils at once
+    if batch:
+        n_base = df_base.shape[0]
+        X = df_base[var].values
+        X_stencil = concatenate(
+            (X[:, None, :] - stencil[None, :, :], X[:, None, :] + stencil[None, :, :]),
+            axis=1,
+        ).reshape((-1, n_var))
+        df_stencil = DataFrame(columns=var, data=X_stencil)
+        I_fix = repeat(arange(n_base), 2 * n_var)
+        for v in var_fix:
+            df_stencil[v] = df_base[v].values[I_fix]
+
+        Y = eval_df(model, df_stencil, append=False)[outputs].values.reshape(
+            (n_base, 2, n_var, model.n_out)
+        )
+        G = stepscale[None, :, :] * (Y[:, 1] - Y[:, 0])
+
+        return DataFrame(columns=grad_labels, data=G.reshape((n_base, -1)))
+
     ## Loop over df_base
     results = []  # TODO: Preallocate?
     for row_i in range(df_base.shape[0]):
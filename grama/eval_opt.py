@@ -3,20 +3,66 @@ __all__ = [
     "ev_nls",
     "eval_min",
     "ev_min",
+    "eval_pareto",
+    "ev_pareto",
 ]
 
 from grama import add_pipe, pipe, custom_formatwarning, df_make
 from grama import eval_df, eval_nominal, eval_monte_carlo
 from grama import comp_marginals, comp_copula_independence
-from grama import tran_outer
-from numpy import Inf, isfinite
+from grama import tran_outer, pareto_rank
+from numpy import Inf, isfinite, array, zeros, argsort, unique, where, maximum
+from numpy import clip, concatenate, lexsort, arange, tile, repeat, sqrt, eye
+from numpy import finfo, full, maximum as npmax
+from numpy import abs as npabs
+from numpy import sum as npsum
+from numpy.random import random, randint
 from numpy.random import seed as setseed
 from pandas import DataFrame, concat
-from scipy.optimize import minimize
+from scipy.optimize import minimize, least_squares
 from toolz import curry
+from warnings import warn
+import warnings
 
 ## Nonlinear least squares
 # --------------------------------------------------
+def _nls_evaluator(model, df_data, var_feat, df_fix, var_fit, out):
+    r"""Build a batched NumPy evaluator for NLS
+
+    Returns a function mapping an (m, n_fit) array of parameter sets to an
+    (m, n_data, n_out) array of predictions, with one eval_df call for all m
+    parameter sets.
+    """
+    n_data = df_data.shape[0]
+    df_base = df_data[var_feat].reset_index(drop=True)
+    for var in df_fix.columns:
+        df_base[var] = df_fix[var].values[0]
+
+    def evaluate(P):
+        m = P.shape[0]
+        df_var = df_base.iloc[tile(arange(n_data), m)].reset_index(drop=True)
+        for j, var in enumerate(var_fit):
+            df_var[var] = repeat(P[:, j], n_data)
+        df_tmp = eval_df(model, df=df_var, append=False)
+
+        return df_tmp[out].values.reshape((m, n_data, len(out)))
+
+    return evaluate
+
+
+def _fd_jacobian(evaluate, x, lb, ub, scale):
+    r"""Forward-difference Jacobian of NLS residuals; one batched evaluation
+
+    Steps are reversed where a forward step would leave the bounds.
+    """
+    h = sqrt(finfo(float).eps) * npmax(1, npabs(x))
+    h = where(x + h > ub, -h, h)
+    P = concatenate((x[None, :], x[None, :] + eye(len(x)) * h[:, None]), axis=0)
+    F = evaluate(P).reshape((P.shape[0], -1))
+
+    return (F[1:] - F[0]).T / h / scale
+
+
 @curry
 def eval_nls(
     model,
@@ -47,10 +93,18 @@ def eval_nls(
         var_fix (list or None): Variables to fix to nominal levels. Note that
             variables with domain width zero will automatically be fixed.
         append (bool): Append metadata? (Initial guess, MSE, optimizer status)
+            With method "trf" or "lm" the result's _meta also holds the final
+            residuals (n_data, n_out) and Jacobian (n_data * n_out, n_fit) of
+            each restart, in the order of _meta["var_fit"].
         tol (float): Optimizer convergence tolerance
         maxiter (int): Optimizer maximum iterations
         n_restart (int): Number of restarts; beyond n_restart=1 random
             restarts are used.
+        method (str): Optimization method; "trf" or "lm" solve the problem
+            with scipy.optimize.least_squares on the residual vector, using a
+            forward-difference Jacobian whose stencil is evaluated in a single
+            eval_df call ("lm" ignores bounds). Any other value is passed to
+            scipy.optimize.minimize, which minimizes the scalar MSE.
         seed (int OR None): Random seed for restarts
 
     Returns:
@@ -157,37 +211,73 @@ def eval_nls(
         ## Generate random start points
         df_rand = eval_monte_carlo(md_sweep, n=n_restart - 1, df_det="nom", skip=True,)
         df_init = concat((df_init, df_rand[var_fit]), axis=0).reset_index(drop=True)
+    ## Build evaluator
+    var_fix = list(var_fix)
+    var_feat = list(var_feat)
+    evaluate = _nls_evaluator(model, df_data, var_feat, df_nom[var_fix], var_fit, out)
+    Y = df_data[out].values
+    scale = sqrt(Y.size)
+
+    def objective(x):
+        """x = [var_fit]"""
+        ## Compute joint MSE
+        return ((evaluate(x[None, :])[0] - Y) ** 2).mean()
+
+    def residual(x):
+        return (evaluate(x[None, :])[0] - Y).ravel() / scale
+
+    if method in ("trf", "lm"):
+        lb = array([b[0] for b in bounds], dtype=float)
+        ub = array([b[1] for b in bounds], dtype=float)
+        if method == "lm":
+            lb, ub = full(len(lb), -Inf), full(len(ub), Inf)
+
+        def jacobian(x):
+            return _fd_jacobian(evaluate, x, lb, ub, scale)
+
     ## Iterate over initial guesses
     df_res = DataFrame()
+    residuals, jacobians = [], []
     for i in range(n_restart):
         x0 = df_init[var_fit].iloc[i].values
-        ## Build evaluator
-        def objective(x):
-            """x = [var_fit]"""
-            ## Evaluate model
-            df_var = tran_outer(
-                df_data[var_feat],
-                concat(
-                    (df_nom[var_fix].iloc[[0]], df_make(**dict(zip(var_fit, x)))),
-                    axis=1,
-                ),
-            )
-            df_tmp = eval_df(model, df=df_var)
-
-            ## Compute joint MSE
-            return ((df_tmp[out].values - df_data[out].values) ** 2).mean()
 
         ## Run optimization
-        res = minimize(
-            objective,
-            x0,
-            args=(),
-            method=method,
-            jac=False,
-            tol=tol,
-            options={"maxiter": maxiter, "disp": False, "ftol": ftol, "gtol": gtol,},
-            bounds=bounds,
-        )
+        if method in ("trf", "lm"):
+            res = least_squares(
+                residual,
+                x0,
+                jac=jacobian,
+                bounds=(lb, ub),
+                method=method,
+                ftol=ftol,
+                xtol=tol,
+                gtol=gtol,
+                max_nfev=maxiter,
+            )
+            res.nit = res.nfev
+            mse = 2 * res.cost
+            ## Final residuals and Jacobian, in output units
+            residuals.append(res.fun.reshape(Y.shape) * scale)
+            jacobians.append(res.jac * scale)
+        else:
+            res = minimize(
+                objective,
+                x0,
+                args=(),
+                method=method,
+                jac=False,
+                tol=tol,
+                options={
+                    "maxiter": maxiter,
+                    "disp": False,
+                    "ftol": ftol,
+                    "gtol": gtol,
+                },
+                bounds=bounds,
+            )
+            mse = res.fun
+            residuals.append(None)
+            jacobians.append(None)
 
         ## Package results
         df_tmp = df_make(
@@ -197,12 +287,22 @@ def eval_nls(
         df_tmp["success"] = [res.success]
         df_tmp["message"] = [res.message]
         df_tmp["n_iter"] = [res.nit]
-        df_tmp["mse"] = [res.fun]
+        df_tmp["mse"] = [mse]
 
         df_res = concat((df_res, df_tmp,), axis=0,).reset_index(drop=True)
 
     ## Post-process
     if append:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            df_res._meta = dict(
+                type="eval_nls",
+                var_fit=var_fit,
+                out=out,
+                residuals=residuals,
+                jacobians=jacobians,
+            )
+
         return df_res
     else:
         return df_res[var_fit]
@@ -406,3 +506,246 @@ def eval_min(
 
 
 ev_min = add_pipe(eval_min)
+
+
+## Multi-objective optimization
+# --------------------------------------------------
+def _crowding(F):
+    r"""Crowding distance of points within a single front
+    """
+    n, d = F.shape
+    dist = zeros(n)
+    if n <= 2:
+        dist[:] = Inf
+        return dist
+
+    for j in range(d):
+        I = argsort(F[:, j], kind="stable")
+        f = F[I, j]
+        width = f[-1] - f[0]
+        dist[I[0]] = Inf
+        dist[I[-1]] = Inf
+        if width > 0:
+            dist[I[1:-1]] += (f[2:] - f[:-2]) / width
+
+    return dist
+
+
+def _nsga_sort(F, V):
+    r"""Constrained non-dominated sort (Deb et al., 2002)
+
+    Feasible points rank by Pareto front; infeasible points rank after all
+    feasible points, in order of increasing constraint violation.
+
+    Args:
+        F (2d array): Objective values; shape (n, n_obj)
+        V (array): Total constraint violation; zero for feasible points
+
+    Returns:
+        tuple: (rank, crowd); lower rank and higher crowding distance preferred
+    """
+    n = F.shape[0]
+    rank = zeros(n, dtype=int)
+    crowd = zeros(n)
+    I_feas = V <= 0
+
+    if I_feas.any():
+        rank[I_feas] = pareto_rank(*F[I_feas].T)
+    n_front = rank.max()
+    ## Rank infeasible points by violation
+    V_inf = V[~I_feas]
+    rank[~I_feas] = n_front + 1 + unique(V_inf, return_inverse=True)[1]
+
+    for k in unique(rank[I_feas]):
+        I_k = where(rank == k)[0]
+        crowd[I_k] = _crowding(F[I_k])
+
+    return rank, crowd
+
+
+@curry
+def eval_pareto(
+    model,
+    out_min=None,
+    out_geq=None,
+    out_leq=None,
+    out_eq=None,
+    tol_eq=1e-3,
+    n_pop=40,
+    n_gen=25,
+    eta_c=15,
+    eta_m=20,
+    seed=None,
+    df_start=None,
+):
+    r"""Multi-objective minimization using functions from a model
+
+    Approximate the Pareto set of multiple objectives with the NSGA-II
+    evolutionary algorithm, searching over the model's deterministic variable
+    bounds. Each generation is evaluated with a single gr.eval_df() call.
+    Constraints are handled by constrained domination: feasible designs are
+    preferred to infeasible ones, and infeasible designs are ranked by total
+    constraint violation. Model must have deterministic variables only.
+
+    Args:
+        model (gr.Model): Model to analyze. All model variables must be
+            deterministic, with finite bounds.
+        out_min (list of str): Outputs to use as minimization objectives.
+        out_geq (None OR list of str): Outputs to use as geq constraints; var >= 0
+        out_leq (None OR list of str): Outputs to use as leq constraints; var <= 0
+        out_eq (None OR list of str): Outputs to use as equality constraints; var == 0
+        tol_eq (float): Tolerance for equality constraints; |var| <= tol_eq
+
+        n_pop (int): Population size
+        n_gen (int): Number of generations; requires n_pop * (n_gen + 1)
+            model evaluations
+        eta_c (float): Distribution index for simulated binary crossover
+        eta_m (float): Distribution index for polynomial mutation
+        seed (int): Random seed to use
+        df_start (None or DataFrame): Specific starting values to include in
+            the initial population
+
+    Returns:
+        DataFrame: Non-dominated feasible designs found by the search
+
+    References:
+        Deb, Pratap, Agarwal, and Meyarivan, "A fast and elitist multiobjective
+        genetic algorithm: NSGA-II" (2002) IEEE Trans. Evol. Comp., Vol 6.
+
+    Examples:
+        >>> import grama as gr
+        >>> md = (
+        >>>     gr.Model("Binh and Korn")
+        >>>     >> gr.cp_vec_function(
+        >>>         fun=lambda df: gr.df_make(
+        >>>             f1=4 * df.x**2 + 4 * df.y**2,
+        >>>             f2=(df.x - 5)**2 + (df.y - 5)**2,
+        >>>             g1=(df.x - 5)**2 + df.y**2 - 25,
+        >>>         ),
+        >>>         var=["x", "y"],
+        >>>         out=["f1", "f2", "g1"],
+        >>>     )
+        >>>     >> gr.cp_bounds(x=(0, 5), y=(0, 3))
+        >>> )
+        >>> md >> gr.ev_pareto(out_min=["f1", "f2"], out_leq=["g1"], seed=101)
+
+    """
+    ## Check that model has only deterministic variables
+    if model.n_var_rand > 0:
+        raise ValueError("model must have no random variables")
+    ## Check that objectives are in model
+    if (out_min is None) or (len(out_min) < 2):
+        raise ValueError("out_min must contain at least two outputs")
+    out_diff = set(out_min).difference(set(model.out))
+    if len(out_diff) > 0:
+        raise ValueError("model must contain each out_min; missing {}".format(out_diff))
+    ## Check that constraints are in model
+    out_geq = [] if out_geq is None else out_geq
+    out_leq = [] if out_leq is None else out_leq
+    out_eq = [] if out_eq is None else out_eq
+    for name, out_con in [
+        ("out_geq", out_geq),
+        ("out_leq", out_leq),
+        ("out_eq", out_eq),
+    ]:
+        out_diff = set(out_con).difference(set(model.out))
+        if len(out_diff) > 0:
+            raise ValueError(
+                "model must contain each {0:}; missing {1:}".format(name, out_diff)
+            )
+    ## Check that bounds are finite
+    bounds = array(list(map(lambda k: model.domain.get_bound(k), model.var)))
+    if not isfinite(bounds).all():
+        raise ValueError("model must have finite bounds for all var")
+    if n_pop < 4:
+        raise ValueError("n_pop must be at least 4")
+    n_pop = n_pop + (n_pop % 2)
+
+    if not (seed is None):
+        setseed(seed)
+    lo, width = bounds[:, 0], bounds[:, 1] - bounds[:, 0]
+    n_var = len(model.var)
+
+    ## Evaluate a population in normalized coordinates
+    def evaluate(U):
+        df_res = eval_df(model, df=DataFrame(lo + U * width, columns=model.var))
+        F = df_res[out_min].values
+        V = (
+            npsum(maximum(0, -df_res[out_geq].values), axis=1)
+            + npsum(maximum(0, df_res[out_leq].values), axis=1)
+            + npsum(maximum(0, npabs(df_res[out_eq].values) - tol_eq), axis=1)
+        )
+
+        return df_res, F, V
+
+    ## Initial population
+    U = random((n_pop, n_var))
+    if not (df_start is None):
+        U_start = (df_start[model.var].values - lo) / where(width > 0, width, 1)
+        U = concatenate((clip(U_start, 0, 1), U))[:n_pop]
+    df_pop, F, V = evaluate(U)
+    rank, crowd = _nsga_sort(F, V)
+
+    for _ in range(n_gen):
+        ## Binary tournament selection
+        I_a, I_b = randint(n_pop, size=(2, n_pop))
+        better_a = (rank[I_a] < rank[I_b]) | (
+            (rank[I_a] == rank[I_b]) & (crowd[I_a] > crowd[I_b])
+        )
+        P = U[where(better_a, I_a, I_b)]
+        P1, P2 = P[0::2], P[1::2]
+
+        ## Simulated binary crossover
+        mu = random(P1.shape)
+        beta = where(
+            mu <= 0.5,
+            (2 * mu) ** (1 / (eta_c + 1)),
+            (1 / (2 * (1 - mu))) ** (1 / (eta_c + 1)),
+        )
+        beta = where(random(P1.shape) < 0.5, beta, 1)
+        C = concatenate(
+            (
+                0.5 * ((1 + beta) * P1 + (1 - beta) * P2),
+                0.5 * ((1 - beta) * P1 + (1 + beta) * P2),
+            )
+        )
+
+        ## Polynomial mutation
+        mu = random(C.shape)
+        delta = where(
+            mu < 0.5,
+            (2 * mu) ** (1 / (eta_m + 1)) - 1,
+            1 - (2 * (1 - mu)) ** (1 / (eta_m + 1)),
+        )
+        I_mut = random(C.shape) < 1 / n_var
+        C = clip(C + I_mut * delta, 0, 1)
+
+        ## Elitist survival
+        df_child, F_child, V_child = evaluate(C)
+        df_all = concat((df_pop, df_child), axis=0).reset_index(drop=True)
+        U_all = concatenate((U, C))
+        F_all = concatenate((F, F_child))
+        V_all = concatenate((V, V_child))
+
+        rank_all, crowd_all = _nsga_sort(F_all, V_all)
+        I_keep = lexsort((-crowd_all, rank_all))[:n_pop]
+
+        df_pop = df_all.iloc[I_keep].reset_index(drop=True)
+        U, F, V = U_all[I_keep], F_all[I_keep], V_all[I_keep]
+        rank, crowd = _nsga_sort(F, V)
+
+    ## Report non-dominated feasible set
+    I_front = (rank == 1) & (V <= 0)
+    if not I_front.any():
+        warn("No feasible designs found; returning least-violating design")
+        I_front = V == V.min()
+
+    return (
+        df_pop[I_front]
+        .drop_duplicates(subset=model.var)
+        .sort_values(out_min)
+        .reset_index(drop=True)
+    )
+
+
+ev_pareto = add_pipe(eval_pareto)
@@ -5,10 +5,17 @@ __all__ = [
     "ev_sinews",
     "eval_hybrid",
     "ev_hybrid",
+    "eval_morris",
+    "ev_morris",
+    "eval_quadrature",
+    "ev_quadrature",
 ]
 
-from numpy import tile, linspace, zeros, isfinite
-from numpy.random import random
+from numpy import tile, linspace, zeros, ones, isfinite, arange, tril
+from numpy import argmin, delete, array, prod, unique, round_, vstack, bincount
+from numpy import concatenate
+from numpy import abs as npabs
+from numpy.random import random, randint, choice, permutation
 from numpy.random import seed as set_seed
 from pandas import DataFrame
 
@@ -16,7 +23,12 @@ import warnings
 
 import grama as gr
 from grama import add_pipe, pipe, custom_formatwarning
+from grama.eval_sink import _write_meta
+from grama.fit_pce import _std_family, _gauss_rule
 from scipy.stats import norm, lognorm
+from scipy.spatial.distance import cdist
+from scipy.special import comb
+from itertools import product
 from toolz import curry
 from numpy.linalg import cholesky, inv
 from numbers import Integral
@@ -26,7 +38,9 @@ warnings.formatwarning = custom_formatwarning
 ## Simple Monte Carlo
 # --------------------------------------------------
 @curry
-def eval_monte_carlo(model, n=1, df_det=None, seed=None, append=True, skip=False):
+def eval_monte_carlo(
+    model, n=1, df_det=None, seed=None, append=True, skip=False, sink=None, chunk=1000
+):
     r"""Monte Carlo evaluation
 
     Evaluates a given model at a given dataframe. Generates outer product
@@ -40,6 +54,9 @@ def eval_monte_carlo(model, n=1, df_det=None, seed=None, append=True, skip=False
         seed (int): random seed to use
         append (bool): Append results to random values?
         skip (bool): Skip evaluation of the functions?
+        sink (str or Path): Stream results to a Parquet or Feather dataset;
+            see gr.eval_df()
+        chunk (int): Number of rows per chunk written to sink
 
     Returns:
         DataFrame: Results of evaluation or unevaluated design
@@ -89,12 +106,14 @@ def eval_monte_carlo(model, n=1, df_det=None, seed=None, append=True, skip=False
 
         return df_samp
     else:
-        df_res = gr.eval_df(model, df=df_samp, append=append)
+        df_res = gr.eval_df(model, df=df_samp, append=append, sink=sink, chunk=chunk)
 
         ## Attach metadata
         with warnings.catch_warnings():
             warnings.simplefilter("ignore")
             df_res._plot_info = {"type": "monte_carlo_outputs", "out": model.out}
+        if sink is not None:
+            _write_meta(sink, df_res, seed=seed)
 
         return df_res
 
@@ -380,3 +399,360 @@ def eval_hybrid(
 
 
 ev_hybrid = add_pipe(eval_hybrid)
+
+## Morris trajectories for elementary effects
+# --------------------------------------------------
+def _morris_trajectories(n, n_var, levels):
+    r"""Generate Morris trajectories in probability space
+
+    Args:
+        n (int): Number of trajectories
+        n_var (int): Number of variables
+        levels (int): Number of grid levels; must be even
+
+    Returns:
+        array: Trajectory points; shape (n, n_var + 1, n_var)
+        array: Index of variable moved at each step; shape (n, n_var)
+
+    """
+    ## Grid levels at the cell midpoints; finite quantiles for any marginal
+    n_jump = levels // 2
+    delta = n_jump / levels
+
+    ## Random base points, directions, and orderings; one per trajectory
+    K = randint(0, levels - n_jump, size=(n, 1, n_var))
+    X_base = (K + 0.5) / levels
+    D = choice([-1, +1], size=(n, 1, n_var))
+    P = zeros((n, n_var), dtype=int)
+    for i in range(n):
+        P[i] = permutation(n_var)
+
+    ## Morris orientation matrix; rows are steps, columns are variables
+    B = tril(ones((n_var + 1, n_var)), k=-1)
+    Q = X_base + 0.5 * delta * ((2 * B - 1) * D + 1)
+
+    ## Permute the order in which variables are moved
+    X = zeros((n, n_var + 1, n_var))
+    for i in range(n):
+        X[i][:, P[i]] = Q[i]
+
+    return X, P
+
+
+def _morris_select(X, r):
+    r"""Select spread-out Morris trajectories from a candidate pool
+
+    Drop trajectories one at a time until r remain; at each step drop the
+    trajectory that contributes least to the total squared spread of the
+    remaining pool (Campolongo et al., 2007; Ruano et al., 2012).
+
+    Args:
+        X (array): Trajectory points; shape (n_pool, n_var + 1, n_var)
+        r (int): Number of trajectories to keep
+
+    Returns:
+        array: Indices of selected trajectories
+
+    """
+    n_pool, n_step, n_var = X.shape
+    X_flat = X.reshape((n_pool * n_step, n_var))
+
+    ## Pairwise trajectory distances; sum of all point-to-point distances
+    D2 = zeros((n_pool, n_pool))
+    for i in range(n_pool):
+        d_all = cdist(X[i], X_flat).reshape((n_step, n_pool, n_step))
+        D2[i] = d_all.sum(axis=(0, 2)) ** 2
+    D2[arange(n_pool), arange(n_pool)] = 0
+
+    ## Greedy elimination
+    ind = arange(n_pool)
+    while len(ind) > r:
+        contrib = D2[ind][:, ind].sum(axis=1)
+        ind = delete(ind, argmin(contrib))
+
+    return ind
+
+
+@curry
+def eval_morris(
+    model,
+    r=10,
+    levels=4,
+    n_pool=None,
+    df_det=None,
+    varname="morris_var",
+    idname="morris_traj",
+    seed=None,
+    append=True,
+    skip=False,
+):
+    r"""Morris trajectories for elementary effects
+
+    Use the Morris "one-at-a-time" trajectory design (Morris, 1991) to support
+    screening of many variables. Each trajectory moves every random variable
+    once, so the design costs r * (n_var_rand + 1) evaluations. Trajectories
+    are constructed on a grid in probability space and mapped through the
+    model density. Use gr.tran_morris() to post-process the results and compute
+    the elementary effect statistics.
+
+    Args:
+        model (gr.Model): Model to evaluate; must have CopulaIndependence
+        r (numeric): Number of trajectories
+        levels (int): Number of grid levels; must be even. Levels are placed at
+            probability values (k + 0.5) / levels, and each step moves a
+            variable by levels / 2 grid levels.
+        n_pool (numeric or None): Size of candidate pool for optimized
+            trajectory selection; if None, use r random trajectories without
+            selection. Setting n_pool > r selects the r trajectories with the
+            greatest spread in probability space.
+        df_det (DataFrame): Deterministic levels for evaluation; use "nom"
+            for nominal deterministic levels.
+        varname (str): Column name to give for moved variable; default="morris_var"
+        idname (str): Column name to give for trajectory index; default="morris_traj"
+        seed (int): Random seed to use
+        append (bool): Append results to trajectory inputs?
+        skip (bool): Skip evaluation of the functions?
+
+    Returns:
+        DataFrame: Results of evaluation or unevaluated design
+
+    References:
+        M.D. Morris, "Factorial Sampling Plans for Preliminary Computational
+        Experiments" (1991) Technometrics, Vol 33.
+
+        Campolongo, Cariboni, and Saltelli, "An effective screening design for
+        sensitivity analysis of large models" (2007) Environmental Modelling &
+        Software, Vol 22.
+
+    Examples:
+
+        >>> import grama as gr
+        >>> from grama.models import make_composite_plate_tension
+        >>> md = make_composite_plate_tension([0])
+        >>> df_morris = md >> gr.ev_morris(r=10, n_pool=40, df_det="nom")
+        >>> df_morris >> gr.tf_morris()
+
+    """
+    ## Check invariants
+    if not isinstance(model.density.copula, gr.CopulaIndependence):
+        raise ValueError(
+            "model must have CopulaIndependence structure;\n"
+            + "Morris trajectories only defined for independent variables"
+        )
+    if (levels < 2) or (levels % 2 != 0):
+        raise ValueError("levels must be an even integer >= 2")
+
+    ## Set seed only if given
+    if seed is not None:
+        set_seed(seed)
+
+    if not isinstance(r, Integral):
+        print("eval_morris() is rounding r...")
+        r = int(r)
+    if n_pool is None:
+        n_pool = r
+    elif not isinstance(n_pool, Integral):
+        print("eval_morris() is rounding n_pool...")
+        n_pool = int(n_pool)
+    if n_pool < r:
+        raise ValueError("n_pool must be at least r")
+
+    ## Draw trajectories
+    X, P = _morris_trajectories(n_pool, model.n_var_rand, levels)
+    if n_pool > r:
+        I_sel = _morris_select(X, r)
+        X, P = X[I_sel], P[I_sel]
+
+    ## Label the variable moved at each step; "_" marks trajectory bases
+    n_step = model.n_var_rand + 1
+    C_var = ["_"] * (r * n_step)
+    C_ind = [0] * (r * n_step)
+    for i in range(r):
+        C_ind[i * n_step : (i + 1) * n_step] = [i] * n_step
+        C_var[i * n_step + 1 : (i + 1) * n_step] = [model.var_rand[j] for j in P[i]]
+
+    ## Construct sampling plan
+    df_pr = DataFrame(
+        data=X.reshape((r * n_step, model.n_var_rand)), columns=model.var_rand
+    )
+    ## Convert samples to desired marginals
+    df_rand = model.density.pr2sample(df_pr)
+    df_rand[varname] = C_var
+    df_rand[idname] = C_ind
+    ## Construct outer-product DOE
+    df_samp = model.var_outer(df_rand, df_det=df_det)
+
+    meta = dict(
+        type="eval_morris",
+        varname=varname,
+        idname=idname,
+        delta=(levels // 2) / levels,
+        var_rand=model.var_rand,
+        var_det=model.var_det,
+        out=model.out,
+    )
+
+    if skip:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            df_samp._meta = meta
+
+        return df_samp
+    else:
+        df_res = gr.eval_df(model, df=df_samp, append=append)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            df_res._meta = meta
+
+        return df_res
+
+
+ev_morris = add_pipe(eval_morris)
+
+## Gauss quadrature and sparse grids
+# --------------------------------------------------
+def _quadrature_nodes(families, level, plan):
+    r"""Construct tensor or Smolyak quadrature nodes
+
+    Args:
+        families (list of str): Polynomial family for each variable
+        level (int): Number of nodes for the finest 1d rule
+        plan (str): Grid type; "tensor" or "smolyak"
+
+    Returns:
+        tuple: (S, w); nodes in standard space with shape (n, d), and weights
+            summing to one
+
+    """
+    n_var = len(families)
+    if plan == "tensor":
+        terms = [((level,) * n_var, 1)]
+    elif plan == "smolyak":
+        ## Combination technique (Gerstner and Griebel, 1998)
+        q = n_var + level - 1
+        terms = []
+        for ind in product(range(1, level + 1), repeat=n_var):
+            k = q - sum(ind)
+            if (0 <= k) and (k <= n_var - 1):
+                terms.append((ind, (-1) ** k * comb(n_var - 1, k, exact=True)))
+    else:
+        raise ValueError("plan `{}` not valid".format(plan))
+
+    S_all, w_all = [], []
+    for ind, coef in terms:
+        rules = [_gauss_rule(f, i) for f, i in zip(families, ind)]
+        S_all.append(array(list(product(*[r[0] for r in rules]))).reshape((-1, n_var)))
+        w_all.append(coef * prod(array(list(product(*[r[1] for r in rules]))), axis=1))
+
+    ## Merge repeated nodes across rules
+    S, I_inv = unique(round_(vstack(S_all), 12), axis=0, return_inverse=True)
+    w = bincount(I_inv, weights=concatenate(w_all))
+    I_keep = npabs(w) > 1e-14
+
+    return S[I_keep], w[I_keep]
+
+
+@curry
+def eval_quadrature(
+    model,
+    level=3,
+    plan="smolyak",
+    df_det=None,
+    weightname="quad_weight",
+    append=True,
+    skip=False,
+):
+    r"""Quadrature evaluation
+
+    Evaluate a model on a Gaussian quadrature rule over its random variables.
+    Nodes follow each marginal: Gauss-Hermite for normal, Gauss-Legendre for
+    uniform, and Gauss-Hermite in standard normal space for other marginals.
+    Models with a Gaussian copula use Gauss-Hermite nodes in (independent)
+    standard normal space throughout. Use gr.tran_moments() to estimate output
+    moments from the results.
+
+    For smooth models with a handful of random variables, quadrature yields
+    accurate moments with far fewer evaluations than simple Monte Carlo.
+
+    Args:
+        model (gr.Model): Model to evaluate
+        level (int): Number of nodes in the finest 1d rule; the tensor rule
+            requires level^n_var_rand evaluations
+        plan (str): Quadrature plan; plan={"smolyak", "tensor"}
+        df_det (DataFrame): Deterministic levels for evaluation; use "nom"
+            for nominal deterministic levels.
+        weightname (str): Column name for quadrature weights
+        append (bool): Append results to input values?
+        skip (bool): Skip evaluation of the functions?
+
+    Returns:
+        DataFrame: Results of evaluation or unevaluated design
+
+    Notes:
+        - Smolyak weights may be negative
+        - Weights sum to one within each deterministic level
+
+    References:
+        Gerstner and Griebel, "Numerical integration using sparse grids" (1998)
+        Numerical Algorithms, Vol 18.
+
+    Examples:
+
+        >>> import grama as gr
+        >>> from grama.models import make_cantilever_beam
+        >>> md = make_cantilever_beam()
+        >>> df_quad = md >> gr.ev_quadrature(level=3, df_det="nom")
+        >>> df_quad >> gr.tf_moments()
+
+    """
+    ## Check invariants
+    if not isinstance(level, Integral) or (level < 1):
+        raise ValueError("level must be a positive integer")
+    if model.n_var_rand == 0:
+        raise ValueError("model must have random variables")
+
+    ## Build nodes in standard space
+    if isinstance(model.density.copula, gr.CopulaIndependence):
+        maps = [_std_family(var, density=model.density)[0::2] for var in model.var_rand]
+        families = [m[0] for m in maps]
+        S, w = _quadrature_nodes(families, level, plan)
+
+        data = zeros(S.shape)
+        for i, (_, s2x) in enumerate(maps):
+            data[:, i] = s2x(S[:, i])
+        df_rand = DataFrame(data=data, columns=model.var_rand)
+    else:
+        Z, w = _quadrature_nodes(["hermite"] * model.n_var_rand, level, plan)
+        ## Transform all nodes at once; z2u acts on columns
+        U = model.density.copula.z2u(Z.T).T
+        df_rand = model.density.pr2sample(DataFrame(data=U, columns=model.var_rand))[
+            model.var_rand
+        ]
+
+    df_rand[weightname] = w
+    ## Construct outer-product DOE
+    df_samp = model.var_outer(df_rand, df_det=df_det)
+
+    meta = dict(
+        type="eval_quadrature",
+        weightname=weightname,
+        var_det=model.var_det,
+        out=model.out,
+    )
+
+    if skip:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            df_samp._meta = meta
+
+        return df_samp
+    else:
+        df_res = gr.eval_df(model, df=df_samp, append=append)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            df_res._meta = meta
+
+        return df_res
+
+
+ev_quadrature = add_pipe(eval_quadrature)
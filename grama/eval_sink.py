@@ -0,0 +1,403 @@
+__all__ = ["read_sink"]
+
+## Streaming evaluation results to disk
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+
+    _PYARROW = True
+
+except ModuleNotFoundError:
+    _PYARROW = False
+
+import json
+import warnings
+from hashlib import sha1
+from pathlib import Path
+
+import grama as gr
+from pandas import concat, read_pickle
+from pandas.util import hash_pandas_object
+
+_SINK_KEY = b"grama"
+_SINK_META = "_common_metadata"
+_CHECKPOINT_MANIFEST = "manifest.json"
+
+## Helper functions
+# --------------------------------------------------
+def _check_pyarrow():
+    if not _PYARROW:
+        raise ModuleNotFoundError("module pyarrow not found")
+
+
+def _sink_format(sink):
+    suffix = Path(sink).suffix
+    if suffix in (".parquet", ".pq"):
+        return "parquet"
+    if suffix in (".feather", ".arrow"):
+        return "feather"
+
+    raise ValueError(
+        "sink must end in .parquet or .feather; given {}".format(str(sink))
+    )
+
+
+def _chunk_hash(df):
+    r"""Hash the contents (values and column names) of a DataFrame"""
+    hashes = hash_pandas_object(df, index=False).values
+    return sha1(hashes.tobytes() + ",".join(df.columns).encode()).hexdigest()
+
+
+def _code_hash(code, h):
+    r"""Update a hash with a code object; nested code objects are recursed"""
+    h.update(code.co_code)
+    h.update(",".join(code.co_names).encode())
+    for const in code.co_consts:
+        if hasattr(const, "co_code"):
+            _code_hash(const, h)
+        else:
+            h.update(repr(const).encode())
+
+
+def _model_fingerprint(model):
+    r"""Hash the model name, and the names, var, out, and code of its functions
+
+    Values captured by functions (closures, fitted parameters) are not hashed.
+    """
+    h = sha1(str(model.name).encode())
+    for f in model.functions:
+        h.update(
+            "|{0:}|{1:}|{2:}|{3:}".format(
+                type(f).__name__, f.name, ",".join(f.var), ",".join(f.out)
+            ).encode()
+        )
+        code = getattr(getattr(f, "func", None), "__code__", None)
+        if code is not None:
+            _code_hash(code, h)
+
+    return h.hexdigest()
+
+
+def _to_json(value):
+    ## Metadata may carry numpy arrays; store them as lists
+    return json.dumps(
+        value, default=lambda v: v.tolist() if hasattr(v, "tolist") else str(v)
+    )
+
+
+def _write_table(file, fmt, table):
+    ## Write to a temporary file first, so interrupted writes leave no part
+    file_tmp = file.with_name(file.name + ".tmp")
+    if fmt == "parquet":
+        pq.write_table(table, str(file_tmp))
+    else:
+        feather.write_feather(table, str(file_tmp))
+    file_tmp.replace(file)
+
+
+def _read_schema(file, fmt):
+    r"""Read the schema of a sink file; None if unavailable"""
+    if not file.exists():
+        return None
+    try:
+        if fmt == "parquet":
+            return pq.read_schema(str(file))
+        return feather.read_table(str(file), memory_map=True).schema
+    except Exception:
+        return None
+
+
+def _read_info(file, fmt):
+    r"""Read grama metadata from a sink file; None if unavailable"""
+    schema = _read_schema(file, fmt)
+    if schema is None:
+        return None
+    metadata = schema.metadata or {}
+    if _SINK_KEY not in metadata:
+        return None
+
+    return json.loads(metadata[_SINK_KEY].decode())
+
+
+def _write_part(file, fmt, df, info):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[_SINK_KEY] = _to_json(info).encode()
+    _write_table(file, fmt, table.replace_schema_metadata(metadata))
+
+
+def _read_part(file, fmt):
+    if fmt == "parquet":
+        return pq.read_table(str(file)).to_pandas()
+    return feather.read_feather(str(file))
+
+
+def _parts(path, fmt):
+    return sorted(path.glob("part-*.{}".format(fmt)))
+
+
+## Sink interface
+# --------------------------------------------------
+def _eval_sink(model, df, sink, chunk=1000, verbose=True, **kwargs):
+    r"""Evaluate a model in chunks, streaming results to a sink
+
+    Each chunk of rows is evaluated and written as one part of a partitioned
+    dataset; parts record a hash of their inputs. Parts already in the sink
+    with matching inputs are read rather than evaluated, which resumes
+    interrupted runs.
+
+    Args:
+        model (gr.Model): Model to evaluate
+        df (DataFrame): Input dataframe to evaluate
+        sink (str or Path): Dataset directory; ends in .parquet or .feather
+        chunk (int): Number of rows per part
+        verbose (bool): Print messages?
+        kwargs: Passed to gr.eval_df()
+
+    Returns:
+        DataFrame: Inputs with appended results
+
+    """
+    _check_pyarrow()
+    fmt = _sink_format(sink)
+    path = Path(sink)
+    path.mkdir(parents=True, exist_ok=True)
+
+    df = df.reset_index(drop=True)
+    chunk = max(int(chunk), 1)
+    results = []
+    n_reused = 0
+    for i, start in enumerate(range(0, df.shape[0], chunk)):
+        df_chunk = df.iloc[start : start + chunk].reset_index(drop=True)
+        key = _chunk_hash(df_chunk)
+        file = path / "part-{0:05d}.{1:}".format(i, fmt)
+
+        info = _read_info(file, fmt)
+        if (info is not None) and (info.get("input_hash") == key):
+            results.append(_read_part(file, fmt))
+            n_reused += df_chunk.shape[0]
+            continue
+
+        df_res = gr.eval_df(
+            model, df=df_chunk, append=True, verbose=False, chunk=chunk, **kwargs
+        )
+        _write_part(
+            file,
+            fmt,
+            df_res,
+            dict(
+                model=model.name,
+                part=i,
+                rows=[start, start + df_chunk.shape[0]],
+                input_hash=key,
+            ),
+        )
+        results.append(df_res)
+
+    ## Remove stale parts from earlier, larger runs
+    for file in _parts(path, fmt)[len(results) :]:
+        file.unlink()
+
+    if verbose and (n_reused > 0):
+        print(
+            "... eval_df() reused {0:} of {1:} rows from sink {2:}".format(
+                n_reused, df.shape[0], str(sink)
+            )
+        )
+
+    df_res = concat(results, axis=0).reset_index(drop=True)
+    _write_meta(sink, df_res, update=False, model=model.name)
+
+    return df_res
+
+
+def _write_meta(sink, df, update=True, **info):
+    r"""Record dataset-wide metadata in the sink's _common_metadata file
+
+    Stores the schema of the sink's parts, any grama metadata (_plot_info,
+    _meta) attached to df, and the given info (e.g. model name, seed). The
+    schema is taken from df only if the sink has no parts. With update,
+    existing info is kept unless overwritten.
+    """
+    _check_pyarrow()
+    fmt = _sink_format(sink)
+    path = Path(sink)
+    file = path / _SINK_META
+    info_all = (_read_info(file, fmt) or {}) if update else {}
+    info_all.update(info)
+    for attr in ("_plot_info", "_meta"):
+        value = getattr(df, attr, None)
+        if value is not None:
+            info_all[attr] = value
+
+    ## Parts hold inputs and outputs, even when df holds only outputs
+    parts = _parts(path, fmt)
+    schema = _read_schema(parts[0], fmt) if len(parts) > 0 else None
+    if schema is not None:
+        table = pa.Table.from_batches([], schema=schema)
+    else:
+        table = pa.Table.from_pandas(df.iloc[:0], preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[_SINK_KEY] = _to_json(info_all).encode()
+    _write_table(file, fmt, table.replace_schema_metadata(metadata))
+
+
+def read_sink(sink):
+    r"""Read evaluation results from a sink
+
+    Reads a partitioned Parquet or Feather dataset written by an evaluation
+    with sink=..., including the results of an interrupted run. Metadata
+    recorded by the evaluation (_plot_info, _meta) is re-attached.
+
+    Args:
+        sink (str or Path): Dataset directory; ends in .parquet or .feather
+
+    Returns:
+        DataFrame: Evaluation results
+
+    Examples:
+
+        >>> import grama as gr
+        >>> from grama.models import make_test
+        >>> md = make_test()
+        >>> md >> gr.ev_monte_carlo(n=1e4, df_det="nom", sink="results.parquet")
+        >>> df = gr.read_sink("results.parquet")
+
+    """
+    _check_pyarrow()
+    fmt = _sink_format(sink)
+    path = Path(sink)
+    files = _parts(path, fmt)
+    if len(files) == 0:
+        raise ValueError("No results found in sink {}".format(str(sink)))
+
+    df = concat([_read_part(file, fmt) for file in files], axis=0)
+    df = df.reset_index(drop=True)
+
+    info = _read_info(path / _SINK_META, fmt) or {}
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for attr in ("_plot_info", "_meta"):
+            if attr in info:
+                setattr(df, attr, info[attr])
+
+    return df
+
+
+## Checkpoint interface
+# --------------------------------------------------
+def _read_manifest(path):
+    file = path / _CHECKPOINT_MANIFEST
+    if not file.exists():
+        return dict(fingerprint=None, chunks={})
+    try:
+        with open(str(file), "r") as f:
+            return json.load(f)
+    except ValueError:
+        return dict(fingerprint=None, chunks={})
+
+
+def _write_manifest(path, manifest):
+    file = path / _CHECKPOINT_MANIFEST
+    file_tmp = file.with_name(file.name + ".tmp")
+    with open(str(file_tmp), "w") as f:
+        json.dump(manifest, f, indent=1)
+    file_tmp.replace(file)
+
+
+def _drop_entries(path, manifest, keys):
+    for key in keys:
+        file = path / manifest["chunks"].pop(key)["file"]
+        if file.exists():
+            file.unlink()
+
+
+def _eval_checkpoint(model, df, checkpoint, chunk=1000, verbose=True):
+    r"""Evaluate a model in chunks, checkpointing results to a directory
+
+    Chunk results are pickled to the checkpoint directory as they finish, and
+    recorded in a manifest keyed on a hash of the chunk inputs (model.var)
+    and outputs (model.out). Chunks found in the manifest are loaded rather
+    than evaluated, so a restarted evaluation recomputes only the missing
+    chunks.
+
+    The manifest also records a fingerprint of the model: its name, and the
+    names, var, out, and code of its functions. A changed fingerprint
+    discards all checkpointed chunks; values captured by the functions
+    (closures, fitted parameters) are not part of the fingerprint. Once an
+    evaluation completes, chunks not part of it are discarded, so the
+    checkpoint holds at most one evaluation.
+
+    Args:
+        model (gr.Model): Model to evaluate
+        df (DataFrame): Input dataframe to evaluate
+        checkpoint (str or Path): Checkpoint directory
+        chunk (int): Number of rows per chunk
+        verbose (bool): Print messages?
+
+    Returns:
+        DataFrame: Output results, as Model.evaluate_df()
+
+    """
+    path = Path(checkpoint)
+    path.mkdir(parents=True, exist_ok=True)
+    manifest = _read_manifest(path)
+    fingerprint = _model_fingerprint(model)
+    if manifest.get("fingerprint") != fingerprint:
+        _drop_entries(path, manifest, list(manifest["chunks"].keys()))
+        manifest["fingerprint"] = fingerprint
+        _write_manifest(path, manifest)
+
+    df_var = df[model.var].reset_index(drop=True)
+    chunk = max(int(chunk), 1)
+    results = []
+    keys = set()
+    n_reused = 0
+    for start in range(0, df.shape[0], chunk):
+        df_chunk = df.iloc[start : start + chunk].reset_index(drop=True)
+        key = sha1(
+            (
+                _chunk_hash(df_var.iloc[start : start + chunk]) + ",".join(model.out)
+            ).encode()
+        ).hexdigest()
+        keys.add(key)
+
+        entry = manifest["chunks"].get(key)
+        if (entry is not None) and (path / entry["file"]).exists():
+            results.append(read_pickle(str(path / entry["file"])))
+            n_reused += df_chunk.shape[0]
+            continue
+
+        df_res = model.evaluate_df(df_chunk)
+        file = path / "chunk-{}.pkl".format(key[:16])
+        file_tmp = file.with_name(file.name + ".tmp")
+        df_res.to_pickle(str(file_tmp))
+        file_tmp.replace(file)
+        manifest["chunks"][key] = dict(
+            file=file.name, model=model.name, rows=df_chunk.shape[0]
+        )
+        _write_manifest(path, manifest)
+        results.append(df_res)
+
+    ## Prune chunks from other evaluations
+    stale = [key for key in manifest["chunks"].keys() if key not in keys]
+    if len(stale) > 0:
+        _drop_entries(path, manifest, stale)
+        _write_manifest(path, manifest)
+
+    if verbose and (n_reused > 0):
+        runtime = model.runtime(n_reused)
+        print(
+            "... evaluate_df() reused {0:} of {1:} rows from checkpoint {2:}".format(
+                n_reused, df.shape[0], str(checkpoint)
+            )
+            + ("; saved ~{0:4.3} sec".format(runtime) if runtime > 0 else "")
+        )
+
+    if len(results) == 0:
+        return model.evaluate_df(df)
+    df_res = concat(results, axis=0)
+    df_res.index = df.index
+
+    return df_res
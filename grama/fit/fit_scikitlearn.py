@@ -1,6 +1,8 @@
 __all__ = [
     "fit_gp",
     "ft_gp",
+    "fit_sgp",
+    "ft_sgp",
     "fit_rf",
     "ft_rf",
     "fit_kmeans",
@@ -13,6 +15,7 @@ try:
     from sklearn.gaussian_process.kernels import RBF, ConstantKernel as Con
     from sklearn.cluster import KMeans
     from sklearn.ensemble import RandomForestRegressor
+    from joblib import Parallel, delayed
 
 except ModuleNotFoundError:
     raise ModuleNotFoundError("module sklearn not found")
@@ -20,52 +23,107 @@ except ModuleNotFoundError:
 import grama as gr
 
 from grama import add_pipe, pipe
+from copy import copy as shallow_copy, deepcopy
+from numpy import argmax, eye, minimum, sqrt, maximum, log, pi
+from numpy import concatenate, hstack, isscalar, vstack, zeros, ones, array
+from numpy import arange, argsort, bincount, cumsum, repeat
+from numpy import sum as npsum
+from numpy.linalg import cholesky
+from numpy.random import RandomState
+from scipy.linalg import cho_solve, solve_triangular
+from scipy.sparse import csr_matrix
 from pandas import DataFrame
 from toolz import curry
 from warnings import filterwarnings
 
 ## Helper functions and classes
 # --------------------------------------------------
-def standardize_cols(df, ser_min, ser_max, var):
-    """
-    @pre set(ser_min.index) == set(ser_max.index)
+def _scaling(df, cols):
+    r"""Min-max scaling vectors for the given columns
+
+    Returns:
+        tuple: (lo, den); scale values with (x - lo) / den
     """
+    lo = df[cols].min().values.astype(float)
+    den = df[cols].max().values - lo
+    den[den < 1e-16] = 1
 
-    df_std = df.copy()
-    for v in var:
-        den = ser_max[v] - ser_min[v]
-        if den < 1e-16:
-            den = 1
-        df_std[v] = (df_std[v] - ser_min[v]) / den
-    return df_std
+    return lo, den
 
 
-def restore_cols(df, ser_min, ser_max, var):
-    """
-    @pre set(ser_min.index) == set(ser_max.index)
+def _fit_gpr(X, Y, kernel, alpha, n_restart, n_jobs, seed):
+    r"""Fit a GP with (parallel) restarts of the hyperparameter optimization
+
+    The first start uses the kernel's initial hyperparameters; the remainder
+    draw hyperparameters log-uniformly within the kernel bounds. Returns the
+    fit with the largest log-marginal likelihood.
     """
-    df_res = df.copy()
-    for v in var:
-        den = ser_max[v] - ser_min[v]
-        if den < 1e-16:
-            den = 1
-        df_res[v] = den * df[v] + ser_min[v]
-    return df_res
+    rng = RandomState(seed)
+    bounds = kernel.bounds
+    thetas = [kernel.theta] + [
+        rng.uniform(bounds[:, 0], bounds[:, 1]) for i in range(n_restart)
+    ]
+
+    def fit_one(theta):
+        gpr = GaussianProcessRegressor(
+            kernel=kernel.clone_with_theta(theta),
+            random_state=seed,
+            normalize_y=False,
+            copy_X_train=False,
+            n_restarts_optimizer=0,
+            alpha=alpha,
+        )
+        return gpr.fit(X, Y)
+
+    gprs = Parallel(n_jobs=n_jobs)(delayed(fit_one)(theta) for theta in thetas)
+
+    return max(gprs, key=lambda gpr: gpr.log_marginal_likelihood_value_)
 
 
 class FunctionGPR(gr.Function):
-    def __init__(self, gpr, df_train, var, out, name, runtime):
+    def __init__(self, gpr, df_train, var, out, name, runtime, return_std=False):
         self.gpr = gpr
         self.df_train = df_train
         self.var = var
-        self.out = out
         self.name = name
         self.runtime = runtime
 
-        self.ser_min_in = df_train[var].min()
-        self.ser_max_in = df_train[var].max()
-        self.ser_min_out = df_train[out].min()
-        self.ser_max_out = df_train[out].max()
+        self.x_lo, self.x_den = _scaling(df_train, var)
+        self.y_lo, self.y_den = _scaling(df_train, out)
+
+        self.return_std = return_std
+        self.out_mean = out
+        if return_std:
+            self.out = out + list(map(lambda s: s + "_std", out))
+        else:
+            self.out = out
+
+    def _predict(self, X, chunk_elements=2 ** 22):
+        r"""Predict mean and standard deviation in memory-bounded chunks
+
+        The cross-kernel between prediction and training points is formed at
+        most chunk_elements entries at a time.
+        """
+        kernel = self.gpr.kernel_
+        n_train = self.gpr.X_train_.shape[0]
+        n_chunk = max(1, chunk_elements // n_train)
+
+        y, sd = [], []
+        for i in range(0, X.shape[0], n_chunk):
+            X_c = X[i : i + n_chunk]
+            K_trans = kernel(X_c, self.gpr.X_train_)
+            y.append(K_trans.dot(self.gpr.alpha_))
+
+            if self.return_std:
+                V = solve_triangular(self.gpr.L_, K_trans.T, lower=True)
+                var = kernel.diag(X_c) - npsum(V ** 2, axis=0)
+                sd.append(sqrt(maximum(var, 0)))
+
+        y = concatenate(y) if len(y) > 0 else zeros((0,) + self.gpr.alpha_.shape[1:])
+        if self.return_std:
+            return y, concatenate(sd) if len(sd) > 0 else zeros(0)
+
+        return y
 
     def eval(self, df):
         ## Check invariant; model inputs must be subset of df columns
@@ -75,36 +133,329 @@ class FunctionGPR(gr.Function):
                     self.name
                 )
             )
-        df_std = standardize_cols(df, self.ser_min_in, self.ser_max_in, self.var)
-        y = self.gpr.predict(df_std[self.var])
-        return restore_cols(
-            DataFrame(data=y, columns=self.out),
-            self.ser_min_out,
-            self.ser_max_out,
-            self.out,
-        )
+        X = (df[self.var].values - self.x_lo) / self.x_den
+        res = self._predict(X)
+        y = res[0] if self.return_std else res
+        Y = y.reshape((X.shape[0], -1)) * self.y_den + self.y_lo
+
+        ## Standard deviation scales with output range only
+        if self.return_std:
+            Y = hstack((Y, res[1][:, None] * self.y_den))
+
+        return DataFrame(data=Y, columns=self.out)
 
     def copy(self):
+        ## Training data is read-only; share the reference
         func_new = FunctionGPR(
-            self.gpr, self.df_train.copy(), self.var, self.out, self.name, self.runtime
+            self.gpr,
+            self.df_train,
+            self.var,
+            self.out_mean,
+            self.name,
+            self.runtime,
+            self.return_std,
         )
 
         return func_new
 
+    def __deepcopy__(self, memo):
+        ## Model.copy() deep-copies its functions; share the training data
+        return self.copy()
+
+    def loo(self):
+        r"""Leave-one-out residuals
+
+        Closed-form leave-one-out residuals of the training data at fixed
+        hyperparameters, e_i = [K^-1 y]_i / [K^-1]_ii (Rasmussen and
+        Williams, 2006, Sec. 5.4.2).
+
+        Returns:
+            DataFrame: Residuals y - y_loo for each output, one row per
+                training observation
+
+        """
+        n = self.gpr.X_train_.shape[0]
+        K_inv_diag = cho_solve((self.gpr.L_, True), eye(n)).diagonal()
+        E = self.gpr.alpha_.reshape((n, -1)) / K_inv_diag[:, None]
+
+        return DataFrame(data=E * self.y_den, columns=self.out_mean)
+
+    def update(self, df_new, optimize=False):
+        r"""Condition on new data
+
+        Add observations to the GP without refitting from scratch. With fixed
+        hyperparameters the Cholesky factor is extended by a rank-k block
+        update, at O(n^2 k) cost for n existing and k new observations.
+        Standardization remains fixed by the original training data.
+
+        Args:
+            df_new (DataFrame): New observations; must contain var and out
+            optimize (bool): Re-optimize hyperparameters, starting from their
+                current values?
+
+        Returns:
+            FunctionGPR: Updated function
+
+        """
+        ## Check invariants
+        if not set(self.var + self.out_mean).issubset(set(df_new.columns)):
+            raise ValueError(
+                "df_new must contain var and out of function `{}`".format(self.name)
+            )
+        if not isscalar(self.gpr.alpha):
+            raise ValueError("update() requires a scalar alpha")
+
+        X_new = (df_new[self.var].values - self.x_lo) / self.x_den
+        Y_new = (df_new[self.out_mean].values - self.y_lo) / self.y_den
+        if self.gpr.y_train_.ndim == 1:
+            Y_new = Y_new[:, 0]
+        X = vstack((self.gpr.X_train_, X_new))
+        Y = concatenate((self.gpr.y_train_, Y_new))
+
+        if optimize:
+            gpr = GaussianProcessRegressor(
+                kernel=self.gpr.kernel_,
+                random_state=self.gpr.random_state,
+                normalize_y=False,
+                copy_X_train=False,
+                n_restarts_optimizer=0,
+                alpha=self.gpr.alpha,
+            ).fit(X, Y)
+        else:
+            ## Block Cholesky update
+            n, k = self.gpr.X_train_.shape[0], X_new.shape[0]
+            kernel = self.gpr.kernel_
+            B = solve_triangular(
+                self.gpr.L_, kernel(self.gpr.X_train_, X_new), lower=True
+            )
+            L = zeros((n + k, n + k))
+            L[:n, :n] = self.gpr.L_
+            L[n:, :n] = B.T
+            L[n:, n:] = cholesky(kernel(X_new) + self.gpr.alpha * eye(k) - B.T.dot(B))
+
+            gpr = shallow_copy(self.gpr)
+            gpr.X_train_ = X
+            gpr.y_train_ = Y
+            gpr.L_ = L
+            gpr.alpha_ = cho_solve((L, True), Y)
+            gpr._K_inv = None
+
+            n_out = 1 if Y.ndim == 1 else Y.shape[1]
+            gpr.log_marginal_likelihood_value_ = -0.5 * npsum(
+                Y * gpr.alpha_
+            ) - n_out * (npsum(log(L.diagonal())) + 0.5 * (n + k) * log(2 * pi))
+
+        func_new = self.copy()
+        func_new.gpr = gpr
+
+        return func_new
+
+
+def _farthest_points(X, m, seed=None):
+    r"""Select m rows of X by greedy farthest-point (max-min distance) sampling
+    """
+    n = X.shape[0]
+    if m >= n:
+        return list(range(n))
+
+    I = [RandomState(seed).randint(n)]
+    d_min = npsum((X - X[I[0]]) ** 2, axis=1)
+    for i in range(m - 1):
+        I.append(int(argmax(d_min)))
+        d_min = minimum(d_min, npsum((X - X[I[-1]]) ** 2, axis=1))
+
+    return I
+
+
+class SparseGPR:
+    def __init__(self, kernel, Z, alpha, jitter=1e-8):
+        """Subset of regressors GP with inducing points
+
+        Args:
+            kernel (sklearn.gaussian_process.kernels.Kernel): Fitted kernel
+            Z (2d array): Inducing points
+            alpha (float): Noise variance
+            jitter (float): Value added to diagonal for numerical stability
+        """
+        self.kernel = kernel
+        self.Z = Z
+        self.alpha = alpha
+        self.jitter = jitter
+
+    def fit(self, X, Y):
+        m = self.Z.shape[0]
+        K_mm = self.kernel(self.Z)
+        K_mm[range(m), range(m)] += self.jitter * K_mm.diagonal().mean()
+        K_mn = self.kernel(self.Z, X)
+
+        ## Whitened form A = L (alpha I + V V^T) L^T, with K_mm = L L^T
+        self.L_mm = cholesky(K_mm)
+        V = solve_triangular(self.L_mm, K_mn, lower=True)
+        self.L_B = cholesky(self.alpha * eye(m) + V.dot(V.T))
+        self.w = solve_triangular(
+            self.L_mm.T, cho_solve((self.L_B, True), V.dot(Y)), lower=False
+        )
+
+        return self
+
+    def predict(self, X, return_std=False):
+        K_sm = self.kernel(X, self.Z)
+        y = K_sm.dot(self.w)
+
+        if not return_std:
+            return y
+
+        ## Deterministic training conditional (DTC) variance
+        V_s = solve_triangular(self.L_mm, K_sm.T, lower=True)
+        W_s = solve_triangular(self.L_B, V_s, lower=True)
+        var = (
+            self.kernel.diag(X)
+            - npsum(V_s ** 2, axis=0)
+            + self.alpha * npsum(W_s ** 2, axis=0)
+        )
+
+        return y, sqrt(maximum(var, 0))
+
+
+class FunctionSGPR(gr.Function):
+    def __init__(self, sgp, df_train, var, out, name, runtime, return_std):
+        """
+
+        Args:
+            sgp (SparseGPR): Fitted sparse GP
+            df_train (DataFrame): Training data, used for standardization
+        """
+        self.sgp = sgp
+        self.df_train = df_train
+        self.var = var
+        self.name = name
+        self.runtime = runtime
+
+        self.x_lo, self.x_den = _scaling(df_train, var)
+        self.y_lo, self.y_den = _scaling(df_train, out)
+
+        self.return_std = return_std
+        self.out_mean = out
+        if return_std:
+            self.out = out + list(map(lambda s: s + "_std", out))
+        else:
+            self.out = out
+
+    def eval(self, df):
+        ## Check invariant; model inputs must be subset of df columns
+        if not set(self.var).issubset(set(df.columns)):
+            raise ValueError(
+                "Model function `{}` var not a subset of given columns".format(
+                    self.name
+                )
+            )
+        X = (df[self.var].values - self.x_lo) / self.x_den
+        res = self.sgp.predict(X, return_std=self.return_std)
+        y = res[0] if self.return_std else res
+        Y = y.reshape((X.shape[0], -1)) * self.y_den + self.y_lo
+
+        ## Standard deviation scales with output range only
+        if self.return_std:
+            Y = hstack((Y, res[1][:, None] * self.y_den))
+
+        return DataFrame(data=Y, columns=self.out)
+
+    def copy(self):
+        ## Training data is read-only; share the reference
+        func_new = FunctionSGPR(
+            self.sgp,
+            self.df_train,
+            self.var,
+            self.out_mean,
+            self.name,
+            self.runtime,
+            self.return_std,
+        )
+
+        return func_new
+
+    def __deepcopy__(self, memo):
+        ## Model.copy() deep-copies its functions; share the training data
+        return self.copy()
+
+
+def _qrf_leaves(rf, X_train):
+    r"""Normalized leaf membership of training data, for quantile forests
+
+    Returns:
+        tuple: (A, offset); A is a sparse (n_leaves, n_train) matrix with
+            entries 1 / |leaf| for each training point in each tree's leaf,
+            offset gives the starting leaf index of each tree
+    """
+    n_train = X_train.shape[0]
+    n_nodes = [est.tree_.node_count for est in rf.estimators_]
+    offset = concatenate(([0], cumsum(n_nodes)[:-1]))
+
+    leaves = (rf.apply(X_train) + offset).ravel()
+    rows = repeat(arange(n_train), len(n_nodes))
+    count = bincount(leaves, minlength=sum(n_nodes))
+    A = csr_matrix((1 / count[leaves], (leaves, rows)), shape=(sum(n_nodes), n_train))
+
+    return A, offset
+
 
 class FunctionRFR(gr.Function):
-    def __init__(self, rf, var, out, name, runtime):
+    def __init__(
+        self, rf, var, out, name, runtime, quantiles=None, X_train=None, y_train=None
+    ):
         """
 
         Args:
             rf (scikit RandomForestRegressor):
+            quantiles (list of float or None): Predictive quantiles to report
+            X_train (2d array or None): Training inputs; required for quantiles
+            y_train (array or None): Training outputs; required for quantiles
         """
         self.rf = rf
         self.var = var
-        self.out = out
         self.name = name
         self.runtime = runtime
 
+        self.quantiles = quantiles
+        self.out_mean = out
+        if quantiles is None:
+            self.out = out
+        else:
+            self.X_train = X_train
+            self.y_train = y_train
+            self.A, self.offset = _qrf_leaves(rf, X_train)
+            self.I_sort = argsort(y_train, kind="stable")
+            self.out = out + [
+                "{0:}_q{1:g}".format(o, 100 * q) for o in out for q in quantiles
+            ]
+
+    def _predict_quantiles(self, X, chunk_elements=2 ** 22):
+        r"""Quantile regression forest prediction (Meinshausen, 2006)
+
+        Weight training outputs by leaf co-membership with each prediction
+        point, averaged over trees; report quantiles of the weighted empirical
+        distribution. Weights are formed at most chunk_elements at a time.
+        """
+        n_tree = len(self.offset)
+        leaves = self.rf.apply(X) + self.offset
+        n, n_train = X.shape[0], self.A.shape[1]
+        B = csr_matrix(
+            (ones(n * n_tree), (repeat(arange(n), n_tree), leaves.ravel())),
+            shape=(n, self.A.shape[0]),
+        )
+        y_sort = self.y_train[self.I_sort]
+        q = array(self.quantiles)
+
+        n_chunk = max(1, chunk_elements // (n_train * len(q)))
+        Q = zeros((n, len(q)))
+        for i in range(0, n, n_chunk):
+            W = B[i : i + n_chunk].dot(self.A).toarray()[:, self.I_sort] / n_tree
+            C = cumsum(W, axis=1)
+            I_q = npsum(C[:, :, None] < q[None, None, :] - 1e-12, axis=1)
+            Q[i : i + n_chunk] = y_sort[minimum(I_q, n_train - 1)]
+
+        return Q
+
     def eval(self, df):
         ## Check invariant; model inputs must be subset of df columns
         if not set(self.var).issubset(set(df.columns)):
@@ -115,9 +466,55 @@ class FunctionRFR(gr.Function):
             )
 
         ## Predict
-        y = self.rf.predict(df[self.var])
+        X = df[self.var].values
+        y = self.rf.predict(X)
+        if self.quantiles is not None:
+            y = hstack((y.reshape((X.shape[0], -1)), self._predict_quantiles(X)))
+
         return DataFrame(data=y, columns=self.out)
 
+    def update(self, df_new, n_estimators=10):
+        r"""Grow new trees on new data
+
+        Add trees fit to new observations only, keeping the existing trees.
+        In quantile mode, the new observations join the training data used to
+        weight predictive quantiles.
+
+        Args:
+            df_new (DataFrame): New observations; must contain var and out
+            n_estimators (int): Number of trees to add
+
+        Returns:
+            FunctionRFR: Updated function
+
+        """
+        ## Check invariants
+        if not set(self.var + self.out_mean).issubset(set(df_new.columns)):
+            raise ValueError(
+                "df_new must contain var and out of function `{}`".format(self.name)
+            )
+
+        rf = deepcopy(self.rf)
+        rf.set_params(warm_start=True, n_estimators=rf.n_estimators + n_estimators)
+        X = df_new[self.var].values
+        Y = df_new[self.out_mean].values
+        rf.fit(X, Y[:, 0] if Y.shape[1] == 1 else Y)
+        rf.set_params(warm_start=False)
+
+        if self.quantiles is None:
+            return FunctionRFR(rf, self.var, self.out_mean, self.name, self.runtime)
+
+        return FunctionRFR(
+            rf,
+            self.var,
+            self.out_mean,
+            self.name,
+            self.runtime,
+            quantiles=self.quantiles,
+            X_train=vstack((self.X_train, X)),
+            y_train=concatenate((self.y_train, Y[:, 0])),
+        )
+
 
 ## Fit GP model with sklearn
 # --------------------------------------------------
@@ -134,12 +531,20 @@ def fit_gp(
     suppress_warnings=True,
     n_restart=5,
     alpha=1e-10,
+    shared=False,
+    n_jobs=None,
+    return_std=False,
 ):
     r"""Fit a gaussian process
 
     Fit a gaussian process to given data. Specify inputs and outputs, or inherit
     from an existing model.
 
+    By default each output receives its own GP. With shared=True all outputs
+    share a single kernel (hyperparameters and Cholesky factor), fit jointly by
+    maximizing the summed log-marginal likelihood; this requires one
+    factorization for all outputs, and predicts all outputs in a single solve.
+
     Args:
         df (DataFrame): Data for function fitting
         md (gr.Model): Model from which to inherit metadata
@@ -152,12 +557,18 @@ def fit_gp(
         n_restart (int): Restarts for optimization
         alpha (float or iterable): Value added to diagonal of kernel matrix
         suppress_warnings (bool): Suppress warnings when fitting?
+        shared (bool): Share one kernel across all outputs?
+        n_jobs (int or None): Number of parallel jobs for optimizer restarts;
+            see joblib.Parallel
+        return_std (bool): Return predictive standard deviations? Adds an
+            output `<out>_std` for each output.
 
     Returns:
         gr.Model: A grama model with fitted function(s)
 
     Notes:
         - Wrapper for sklearn.gaussian_process.GaussianProcessRegressor
+        - All fitted functions share one reference to the training data
 
     """
     if suppress_warnings:
@@ -187,34 +598,35 @@ def fit_gp(
         raise ValueError("var must be subset of df.columns")
 
     ## Pre-process data
-    ser_min_in = df[var].min()
-    ser_max_in = df[var].max()
-    ser_min_out = df[out].min()
-    ser_max_out = df[out].max()
-    df_std = standardize_cols(df, ser_min_in, ser_max_in, var)
-    df_std = standardize_cols(df_std, ser_min_out, ser_max_out, out)
+    x_lo, x_den = _scaling(df, var)
+    y_lo, y_den = _scaling(df, out)
+    df_std = DataFrame(
+        data=hstack(((df[var].values - x_lo) / x_den, (df[out].values - y_lo) / y_den)),
+        columns=list(var) + list(out),
+    )
 
     ## Assign default kernel, if necessary
     if kernel is None:
         print("fit_gp is assigning default kernel")
         kernel = Con(1, (1e-3, 1e3)) * RBF([1] * len(var), (1e-8, 1e8))
 
-    ## Construct gaussian process for each output
-    functions = []
+    ## Construct gaussian process(es)
+    df_train = df[var + out].copy()
+    if shared:
+        groups = [out]
+    else:
+        groups = [[output] for output in out]
 
-    for output in out:
-        gpr = GaussianProcessRegressor(
-            kernel=kernel,
-            random_state=seed,
-            normalize_y=False,
-            copy_X_train=False,
-            n_restarts_optimizer=n_restart,
-            alpha=alpha,
-        )
-        gpr.fit(df_std[var], df_std[output])
+    X = df_std[var].values
+    functions = []
+    for group in groups:
+        Y = df_std[group].values
+        if len(group) == 1:
+            Y = Y[:, 0]
+        gpr = _fit_gpr(X, Y, kernel, alpha, n_restart, n_jobs, seed)
         name = "GP ({})".format(str(gpr.kernel_))
 
-        fun = FunctionGPR(gpr, df.copy(), var, [output], name, 0)
+        fun = FunctionGPR(gpr, df_train, var, group, name, 0, return_std)
         functions.append(fun)
 
     ## Construct model
@@ -223,6 +635,144 @@ def fit_gp(
 
 ft_gp = add_pipe(fit_gp)
 
+## Fit sparse GP model
+# --------------------------------------------------
+@curry
+def fit_sgp(
+    df,
+    md=None,
+    var=None,
+    out=None,
+    domain=None,
+    density=None,
+    kernel=None,
+    n_inducing=100,
+    seed=None,
+    suppress_warnings=True,
+    n_restart=5,
+    alpha=1e-6,
+    shared=False,
+    n_jobs=None,
+    return_std=False,
+):
+    r"""Fit a sparse gaussian process
+
+    Fit a sparse (inducing point) gaussian process to given data, for training
+    sets too large for gr.fit_gp(). The inducing points are a space-filling
+    subset of the data, chosen by farthest-point sampling. Kernel
+    hyperparameters are learned by an exact GP on the inducing points; the
+    subset of regressors approximation then conditions on all the data.
+    Training costs O(n m^2) and prediction O(m) for n observations and
+    m inducing points. Specify inputs and outputs, or inherit from an existing
+    model.
+
+    Args:
+        df (DataFrame): Data for function fitting
+        md (gr.Model): Model from which to inherit metadata
+        var (list(str) or None): List of features or None for all except outputs
+        out (list(str)): List of outputs to fit
+        domain (gr.Domain): Domain for new model
+        density (gr.Density): Density for new model
+        kernel (sklearn.gaussian_process.kernels.Kernel or None): Kernel for GP;
+            should not include a WhiteKernel, use alpha for noise
+        n_inducing (int): Number of inducing points
+        seed (int or None): Random seed for fitting process
+        suppress_warnings (bool): Suppress warnings when fitting?
+        n_restart (int): Restarts for hyperparameter optimization
+        alpha (float): Noise variance, relative to the standardized output
+        shared (bool): Share one kernel across all outputs?
+        n_jobs (int or None): Number of parallel jobs for optimizer restarts;
+            see joblib.Parallel
+        return_std (bool): Return predictive standard deviations?
+
+    Returns:
+        gr.Model: A grama model with fitted function(s)
+
+    References:
+        Quinonero-Candela and Rasmussen, "A unifying view of sparse approximate
+        Gaussian process regression" (2005) JMLR, Vol 6.
+
+    Examples:
+        >>> import grama as gr
+        >>> from grama.fit import ft_sgp
+        >>> from grama.models import make_cantilever_beam
+        >>> md = make_cantilever_beam()
+        >>> df_train = md >> gr.ev_monte_carlo(n=5000, df_det="nom")
+        >>> md_sgp = df_train >> ft_sgp(
+        >>>     var=md.var_rand,
+        >>>     out=md.out,
+        >>>     n_inducing=200,
+        >>>     return_std=True,
+        >>> )
+
+    """
+    if suppress_warnings:
+        filterwarnings("ignore")
+
+    ## Infer fitting metadata, if available
+    if not (md is None):
+        domain = md.domain
+        density = md.density
+        out = md.out
+
+    ## Check invariants
+    if not set(out).issubset(set(df.columns)):
+        raise ValueError("out must be subset of df.columns")
+    ## Default input value
+    if var is None:
+        var = list(set(df.columns).difference(set(out)))
+    ## Check more invariants
+    set_inter = set(out).intersection(set(var))
+    if len(set_inter) > 0:
+        raise ValueError(
+            "out and var must be disjoint; intersect = {}".format(set_inter)
+        )
+    if not set(var).issubset(set(df.columns)):
+        raise ValueError("var must be subset of df.columns")
+    if n_inducing < 1:
+        raise ValueError("n_inducing must be positive")
+
+    ## Pre-process data
+    x_lo, x_den = _scaling(df, var)
+    y_lo, y_den = _scaling(df, out)
+    df_std = DataFrame(
+        data=hstack(((df[var].values - x_lo) / x_den, (df[out].values - y_lo) / y_den)),
+        columns=list(var) + list(out),
+    )
+
+    ## Assign default kernel, if necessary
+    if kernel is None:
+        print("fit_sgp is assigning default kernel")
+        kernel = Con(1, (1e-3, 1e3)) * RBF([1] * len(var), (1e-8, 1e8))
+
+    ## Select inducing points
+    X = df_std[var].values
+    I_ind = _farthest_points(X, n_inducing, seed=seed)
+    Z = X[I_ind]
+
+    ## Construct sparse gaussian process(es)
+    df_train = df[var + out].copy()
+    if shared:
+        groups = [out]
+    else:
+        groups = [[output] for output in out]
+
+    functions = []
+    for group in groups:
+        Y = df_std[group].values
+        gpr = _fit_gpr(Z, Y[I_ind], kernel, alpha, n_restart, n_jobs, seed)
+        sgp = SparseGPR(gpr.kernel_, Z, alpha).fit(X, Y)
+        name = "SGP (m={0:}, {1:})".format(Z.shape[0], str(gpr.kernel_))
+
+        fun = FunctionSGPR(sgp, df_train, var, group, name, 0, return_std)
+        functions.append(fun)
+
+    ## Construct model
+    return gr.Model(functions=functions, domain=domain, density=density)
+
+
+ft_sgp = add_pipe(fit_sgp)
+
 ## Fit random forest model with sklearn
 # --------------------------------------------------
 @curry
@@ -235,6 +785,8 @@ def fit_rf(
     density=None,
     seed=None,
     suppress_warnings=True,
+    n_jobs=None,
+    quantiles=None,
     **kwargs
 ):
     r"""Fit a random forest
@@ -242,6 +794,11 @@ def fit_rf(
     Fit a random forest to given data. Specify inputs and outputs, or inherit
     from an existing model.
 
+    Optionally fit a quantile regression forest (Meinshausen, 2006) by
+    providing quantiles; each output then receives additional outputs
+    `<out>_q<percent>` with the requested predictive quantiles, e.g.
+    quantiles=[0.05, 0.95] adds `<out>_q5` and `<out>_q95`.
+
     Args:
         df (DataFrame): Data for function fitting
         md (gr.Model): Model from which to inherit metadata
@@ -251,6 +808,10 @@ def fit_rf(
         density (gr.Density): Density for new model
         seed (int or None): Random seed for fitting process
         suppress_warnings (bool): Suppress warnings when fitting?
+        n_jobs (int or None): Number of parallel jobs for training and
+            prediction; see joblib.Parallel
+        quantiles (list of float or None): Predictive quantiles to report,
+            values in (0, 1)
 
     Keyword Arguments:
         n_estimators (int):
@@ -265,8 +826,6 @@ def fit_rf(
         min_impurity_split (float):
         bootstrap (bool):
         oob_score (bool):
-        n_jobs (int or None):
-        random_state (int):
 
     Returns:
         gr.Model: A grama model with fitted function(s)
@@ -274,6 +833,22 @@ def fit_rf(
     Notes:
         - Wrapper for sklearn.ensemble.RandomForestRegressor
 
+    References:
+        N. Meinshausen, "Quantile Regression Forests" (2006) JMLR, Vol 7.
+
+    Examples:
+        >>> import grama as gr
+        >>> from grama.fit import ft_rf
+        >>> from grama.models import make_cantilever_beam
+        >>> md = make_cantilever_beam()
+        >>> df_train = md >> gr.ev_monte_carlo(n=500, df_det="nom")
+        >>> md_qrf = df_train >> ft_rf(
+        >>>     var=md.var_rand,
+        >>>     out=["g_stress"],
+        >>>     quantiles=[0.05, 0.95],
+        >>> )
+        >>> md_qrf >> gr.ev_monte_carlo(n=100, df_det="nom")
+
     """
     if suppress_warnings:
         filterwarnings("ignore")
@@ -300,16 +875,30 @@ def fit_rf(
         )
     if not set(var).issubset(set(df.columns)):
         raise ValueError("var must be subset of df.columns")
+    if not (quantiles is None):
+        if not all(map(lambda q: (0 < q) and (q < 1), quantiles)):
+            raise ValueError("quantiles must lie in (0, 1)")
 
-    ## Construct gaussian process for each output
+    ## Construct random forest for each output
     functions = []
 
     for output in out:
-        rf = RandomForestRegressor(random_state=seed, **kwargs)
+        rf = RandomForestRegressor(random_state=seed, n_jobs=n_jobs, **kwargs)
         rf.fit(df[var], df[output])
-        name = "RF"
 
-        fun = FunctionRFR(rf, var, [output], name, 0)
+        if quantiles is None:
+            fun = FunctionRFR(rf, var, [output], "RF", 0)
+        else:
+            fun = FunctionRFR(
+                rf,
+                var,
+                [output],
+                "QRF",
+                0,
+                quantiles=list(quantiles),
+                X_train=df[var].values,
+                y_train=df[output].values,
+            )
         functions.append(fun)
 
     ## Construct model
@@ -1,11 +1,15 @@
 __all__ = ["fit_ols", "ft_ols"]
 
 ## Fitting via statsmodels package
-from numpy import zeros
+from numpy import asarray, hstack, ones, inf, where
+from numpy import sum as npsum
+from numpy.linalg import pinv
 from pandas import DataFrame
 
 try:
-    import statsmodels.formula.api as smf
+    import statsmodels.api as sm
+    from patsy import dmatrix, build_design_matrices, NAAction
+    from patsy.eval import ast_names
 
 except ModuleNotFoundError:
     raise ModuleNotFoundError("module statsmodels not found")
@@ -14,55 +18,184 @@ import grama as gr
 from grama import add_pipe, pipe
 from toolz import curry
 
+## Helper functions and classes
+# --------------------------------------------------
+def _parse_formula(formula):
+    r"""Split a formula "y1 + y2 ~ rhs" into outputs and right-hand side"""
+    if formula.count("~") != 1:
+        raise ValueError("formula must contain one `~`; got {}".format(formula))
+    lhs, rhs = formula.split("~")
+    out = [o.strip() for o in lhs.split("+") if o.strip() != ""]
+    if len(out) == 0:
+        raise ValueError("formula must name an output; got {}".format(formula))
+
+    return out, rhs.strip()
+
+
+class FunctionOLS(gr.Function):
+    def __init__(self, designs, var, out, name, runtime, df_loo=None):
+        """
+
+        Args:
+            designs (list of tuple): One (design_info, params, out) per distinct
+                right-hand side; design_info is a patsy DesignInfo and params
+                has shape (n_terms, len(out))
+            df_loo (DataFrame or None): Leave-one-out residuals of the training
+                data
+        """
+        self.designs = designs
+        self.var = var
+        self.out = out
+        self.name = name
+        self.runtime = runtime
+        self.df_loo = df_loo
+
+    def eval(self, df):
+        ## Check invariant; model inputs must be subset of df columns
+        if not set(self.var).issubset(set(df.columns)):
+            raise ValueError(
+                "Model function `{}` var not a subset of given columns".format(
+                    self.name
+                )
+            )
+
+        ## Build each design matrix once, predict its outputs in one product;
+        # keep rows with missing values, so their predictions are NaN
+        n = df.shape[0]
+        results = []
+        for design_info, params, _ in self.designs:
+            ## Intercept-only designs reference no data; build them directly
+            if len(design_info.factor_infos) == 0:
+                X = ones((n, len(design_info.column_names)))
+            else:
+                X = asarray(
+                    build_design_matrices(
+                        [design_info], df, NA_action=NAAction(NA_types=[])
+                    )[0]
+                )
+            results.append(X.dot(params))
+
+        return DataFrame(data=hstack(results), columns=self.out)
+
+    def copy(self):
+        func_new = FunctionOLS(
+            self.designs,
+            self.var.copy(),
+            self.out.copy(),
+            self.name,
+            self.runtime,
+            self.df_loo,
+        )
+
+        return func_new
+
+    def loo(self):
+        r"""Leave-one-out residuals
+
+        Closed-form leave-one-out residuals of the training data,
+        e_i = r_i / (1 - h_ii), with h_ii the leverage of observation i.
+
+        Returns:
+            DataFrame: Residuals y - y_loo for each output, one row per
+                training observation
+
+        """
+        return self.df_loo
+
+
 ## Fit model via OLS
 # --------------------------------------------------
 @curry
-def fit_ols(df, formulae=[""], domain=None, density=None):
-    """Fit a function via Ordinary Least Squares
+def fit_ols(df, formulae=None, md=None, domain=None, density=None):
+    r"""Fit a function via Ordinary Least Squares
 
     Fit a function via ordinary least squares. Specify features via
-    statsmodels formula.
+    statsmodels (patsy) formulae; several outputs may share one formula, as in
+    "y1 + y2 ~ x1 + x2".
+
+    Formulae with identical right-hand sides share a single design matrix: the
+    coefficients for all their outputs are fit in one least squares solve, and
+    at prediction time the design matrix is built once per batch and applied
+    to all outputs with one matrix product.
 
     Args:
         df (DataFrame): Data for function fitting
-        formulae (list(str)): List of statsmodels formulae
+        formulae (list(str) or None): List of statsmodels formulae; None
+            fits linear features in md.var for each of md.out
+        md (gr.Model): Model from which to inherit metadata
         domain (gr.Domain): Domain for new model
         density (gr.Density): Density for new model
 
     Returns:
         gr.Model: A grama model with fitted function(s)
 
-    @pre domain is not None
-    @pre len(formulae) == len(domain.inputs)
-
     Notes:
-        - Wrapper for statsmodels.formula.api.ols
+        - Wrapper for statsmodels.api.OLS
+
+    Examples:
+        >>> import grama as gr
+        >>> from grama.fit import ft_ols
+        >>> from grama.models import make_test
+        >>> md = make_test()
+        >>> df_train = md >> gr.ev_monte_carlo(n=20, df_det="nom")
+        >>> md_lin = df_train >> ft_ols(md=md)
+        >>> md_quad = df_train >> ft_ols(formulae=["y0 ~ x0 + I(x0**2) + x1"])
 
     """
-    n_obs, n_in = df.shape
-
-    ## Parse formulae for output names
-    n_out = len(formulae)
-    outputs = [""] * n_out
-    for ind in range(n_out):
-        ind_start = formulae[ind].find("~")
-        outputs[ind] = formulae[ind][:ind_start].strip()
-
-    ## Construct fits
-    fits = []
-    for ind in range(n_out):
-        fits.append(smf.ols(formulae[ind], data=df).fit())
-
-    def fit_all(df_new):
-        n_obs_new, _ = df_new.shape
-        result = zeros((n_obs_new, n_out))
-        for ind in range(n_out):
-            result[:, ind] = fits[ind].predict(df_new)
-        return DataFrame(data=result, columns=outputs)
+    if not (md is None):
+        domain = md.domain
+        density = md.density
+
+    if formulae is None:
+        if md is None:
+            raise ValueError("Must provide `formulae` or `md` argument")
+        formulae = ["+".join(md.out) + "~" + "+".join(md.var)]
+
+    ## Group outputs by right-hand side
+    groups = {}
+    for formula in formulae:
+        out, rhs = _parse_formula(formula)
+        groups.setdefault(rhs, []).extend(out)
+
+    out_all = [o for out in groups.values() for o in out]
+    if len(set(out_all)) < len(out_all):
+        raise ValueError("each output must appear in only one formula")
+    if not set(out_all).issubset(set(df.columns)):
+        raise ValueError("formula outputs must be subset of df.columns")
+
+    ## Fit all outputs of each group in one solve
+    designs = []
+    var = []
+    loo = []
+    for rhs, out in groups.items():
+        X = dmatrix(rhs, df, return_type="dataframe", NA_action="raise")
+        Y = df[out].values
+        params = asarray(sm.OLS(Y, X.values).fit().params).reshape((X.shape[1], -1))
+        designs.append((X.design_info, params, out))
+
+        ## Leave-one-out residuals via leverages
+        h = npsum(X.values * pinv(X.values).T, axis=1)
+        R = Y - X.values.dot(params)
+        loo.append(where(h[:, None] < 1 - 1e-10, R / (1 - h[:, None]), inf))
+
+        ## Inputs are the data columns the design's factors reference
+        for term in X.design_info.terms:
+            for factor in term.factors:
+                var.extend(
+                    v
+                    for v in sorted(ast_names(factor.code))
+                    if (v in df.columns) and (v not in var)
+                )
 
     ## Construct model
-    return gr.model_vectorized(
-        function=fit_all, outputs=outputs, domain=domain, density=density
+    return gr.Model(
+        functions=[
+            FunctionOLS(
+                designs, var, out_all, "OLS", 0, DataFrame(hstack(loo), columns=out_all)
+            )
+        ],
+        domain=domain,
+        density=density,
     )
 
 
@@ -0,0 +1,495 @@
+__all__ = [
+    "FunctionPCE",
+    "fit_pce",
+    "ft_pce",
+]
+
+## Polynomial chaos expansion (PCE) fitting
+
+from grama import add_pipe, pipe, Function, Model, MarginalNamed
+from numpy import (
+    arange,
+    argmax,
+    array,
+    atleast_2d,
+    concatenate,
+    isfinite,
+    ones,
+    sqrt,
+    zeros,
+)
+from numpy import abs as npabs
+from numpy import any as npany
+from numpy import sum as npsum
+from numpy.linalg import lstsq, norm, pinv
+from numpy.polynomial.hermite_e import hermegauss, hermevander
+from numpy.polynomial.legendre import leggauss, legvander
+from pandas import DataFrame, concat
+from scipy.special import factorial
+from scipy.stats import norm as dist_norm
+from toolz import curry
+
+## Helper functions and classes
+# --------------------------------------------------
+def _std_family(var, domain=None, density=None):
+    r"""Determine the orthogonal polynomial family for a variable
+
+    Random variables with a normal marginal use (probabilists') Hermite
+    polynomials; uniform marginals use Legendre polynomials. Other marginals are
+    mapped to standard normal space through their CDF, and use Hermite
+    polynomials. Deterministic variables with finite bounds are treated as
+    uniform over their bounds.
+
+    Args:
+        var (str): Variable name
+        domain (gr.Domain): Domain with variable bounds
+        density (gr.Density): Density with variable marginals
+
+    Returns:
+        tuple: (family, x2s, s2x); family is "hermite" or "legendre", x2s maps
+            values to the standard space of the family, s2x is its inverse
+
+    """
+    try:
+        marginal = density.marginals[var]
+    except (AttributeError, KeyError, TypeError):
+        marginal = None
+
+    if marginal is not None:
+        if isinstance(marginal, MarginalNamed) and (marginal.d_name == "norm"):
+            loc = marginal.d_param.get("loc", 0)
+            scale = marginal.d_param.get("scale", 1)
+
+            return (
+                "hermite",
+                lambda x: (x - loc) / scale,
+                lambda z: loc + scale * z,
+            )
+
+        if isinstance(marginal, MarginalNamed) and (marginal.d_name == "uniform"):
+            loc = marginal.d_param.get("loc", 0)
+            scale = marginal.d_param.get("scale", 1)
+
+            return (
+                "legendre",
+                lambda x: 2 * (x - loc) / scale - 1,
+                lambda t: loc + scale * (t + 1) / 2,
+            )
+
+        ## Isoprobabilistic transform to standard normal space
+        return (
+            "hermite",
+            lambda x: dist_norm.ppf(marginal.p(x)),
+            lambda z: marginal.q(dist_norm.cdf(z)),
+        )
+
+    lo, up = (-float("inf"), +float("inf")) if domain is None else domain.get_bound(var)
+    if not (isfinite(lo) and isfinite(up) and (up > lo)):
+        raise ValueError(
+            "var {} must have a marginal or finite, nonzero-width bounds".format(var)
+        )
+
+    return (
+        "legendre",
+        lambda x: 2 * (x - lo) / (up - lo) - 1,
+        lambda t: lo + (up - lo) * (t + 1) / 2,
+    )
+
+
+def _vander(family, s, order):
+    r"""Orthonormal polynomial values up to given order
+
+    Args:
+        family (str): "hermite" or "legendre"
+        s (array): Values in standard space
+        order (int): Maximum polynomial order
+
+    Returns:
+        array: Polynomial values; shape (len(s), order + 1)
+
+    """
+    n = arange(order + 1)
+    if family == "hermite":
+        return hermevander(s, order) / sqrt(factorial(n))
+    elif family == "legendre":
+        return legvander(s, order) * sqrt(2 * n + 1)
+    else:
+        raise ValueError("family {} not recognized".format(family))
+
+
+def _gauss_rule(family, n):
+    r"""Gauss quadrature rule for a polynomial family
+
+    Args:
+        family (str): "hermite" or "legendre"
+        n (int): Number of nodes
+
+    Returns:
+        tuple: (nodes, weights); nodes in standard space, weights sum to one
+
+    """
+    if family == "hermite":
+        s, w = hermegauss(n)
+    elif family == "legendre":
+        s, w = leggauss(n)
+    else:
+        raise ValueError("family {} not recognized".format(family))
+
+    return s, w / w.sum()
+
+
+def _multi_indices(n_var, order, q=1.0):
+    r"""Hyperbolic-truncated multi-indices
+
+    Enumerate the multi-indices alpha with ||alpha||_q <= order. The choice q=1
+    gives the total-degree basis; q < 1 discards high-order interactions.
+
+    Args:
+        n_var (int): Number of variables
+        order (int): Maximum total polynomial order
+        q (float): Truncation norm, 0 < q <= 1
+
+    Returns:
+        array: Multi-indices; shape (n_terms, n_var), constant term first
+
+    """
+    ## Build indices variable by variable, within the remaining budget
+    ## sum_i alpha_i^q <= order^q; prefixes over budget are never extended
+    tol = 1e-10
+
+    def extend(prefix, budget):
+        if len(prefix) == n_var:
+            return [prefix]
+        alphas, k = [], 0
+        while (k <= order) and (k ** q <= budget + tol):
+            alphas.extend(extend(prefix + (k,), budget - k ** q))
+            k += 1
+        return alphas
+
+    alphas = array(extend((), float(order) ** q), dtype=int).reshape((-1, n_var))
+
+    ## Sort by total order for a readable basis
+    total = alphas.sum(axis=1)
+    return alphas[total.argsort(kind="stable")]
+
+
+def _basis(S, families, alphas):
+    r"""Evaluate the tensor-product basis
+
+    Args:
+        S (array): Values in standard space; shape (n, n_var)
+        families (list of str): Polynomial family for each variable
+        alphas (array): Multi-indices; shape (n_terms, n_var)
+
+    Returns:
+        array: Basis values; shape (n, n_terms)
+
+    """
+    order = alphas.max() if alphas.size > 0 else 0
+    Psi = ones((S.shape[0], alphas.shape[0]))
+    for j, family in enumerate(families):
+        V = _vander(family, S[:, j], order)
+        Psi = Psi * V[:, alphas[:, j]]
+
+    return Psi
+
+
+def _loo_error(Psi, y):
+    r"""Least-squares fit with leave-one-out error
+
+    Args:
+        Psi (array): Basis values; shape (n, n_terms)
+        y (array): Response values; shape (n,)
+
+    Returns:
+        tuple: (coefficients, leave-one-out mean squared error)
+
+    """
+    A = pinv(Psi)
+    c = A.dot(y)
+    h = npsum(Psi * A.T, axis=1)
+    if npany(1 - h < 1e-10):
+        return c, float("inf")
+    r = (y - Psi.dot(c)) / (1 - h)
+
+    return c, (r ** 2).mean()
+
+
+def _fit_omp(Psi, y):
+    r"""Sparse least squares via orthogonal matching pursuit
+
+    Greedily add the basis term most correlated with the residual, refitting by
+    least squares at each step. Keep the sparsity level with the lowest
+    leave-one-out error (Blatman and Sudret, 2011).
+
+    Args:
+        Psi (array): Basis values; shape (n, n_terms)
+        y (array): Response values; shape (n,)
+
+    Returns:
+        array: Coefficients; shape (n_terms,)
+
+    """
+    n, n_terms = Psi.shape
+    col_norm = norm(Psi, axis=0)
+    col_norm[col_norm == 0] = 1
+
+    active = [0]
+    c, err = _loo_error(Psi[:, active], y)
+    best = (err, list(active), c)
+
+    for _ in range(min(n_terms, n - 1) - 1):
+        r = y - Psi[:, active].dot(c)
+        corr = npabs(Psi.T.dot(r)) / col_norm
+        corr[active] = -1
+        active.append(int(argmax(corr)))
+
+        c, err = _loo_error(Psi[:, active], y)
+        if err < best[0]:
+            best = (err, list(active), c)
+
+    coef = zeros(n_terms)
+    coef[best[1]] = best[2]
+
+    return coef
+
+
+class FunctionPCE(Function):
+    def __init__(self, coef, alphas, families, x2s, var, out, name, runtime):
+        """
+
+        Args:
+            coef (array): Expansion coefficients; shape (n_terms, n_out)
+            alphas (array): Multi-indices; shape (n_terms, n_var)
+            families (list of str): Polynomial family for each variable
+            x2s (list of functions): Maps from variables to standard space
+        """
+        self.coef = coef
+        self.alphas = alphas
+        self.families = families
+        self.x2s = x2s
+        self.var = var
+        self.out = out
+        self.name = name
+        self.runtime = runtime
+
+    def eval(self, df):
+        ## Check invariant; model inputs must be subset of df columns
+        if not set(self.var).issubset(set(df.columns)):
+            raise ValueError(
+                "Model function `{}` var not a subset of given columns".format(
+                    self.name
+                )
+            )
+
+        X = df[self.var].values
+        S = zeros(X.shape)
+        for j in range(len(self.var)):
+            S[:, j] = self.x2s[j](X[:, j])
+
+        y = _basis(S, self.families, self.alphas).dot(self.coef)
+        return DataFrame(data=y, columns=self.out)
+
+    def copy(self):
+        func_new = FunctionPCE(
+            self.coef.copy(),
+            self.alphas.copy(),
+            list(self.families),
+            list(self.x2s),
+            list(self.var),
+            list(self.out),
+            self.name,
+            self.runtime,
+        )
+
+        return func_new
+
+    def moments(self, outcol="out"):
+        r"""Output moments from expansion coefficients
+
+        Returns:
+            DataFrame: Mean, variance, and standard deviation of each output
+
+        """
+        var = npsum(self.coef[1:] ** 2, axis=0)
+
+        return DataFrame(
+            {outcol: self.out, "mean": self.coef[0], "var": var, "sd": sqrt(var)}
+        )
+
+    def sobol(self, plan="first", typename="ind", full=False):
+        r"""Sobol' indices from expansion coefficients
+
+        Compute Sobol' indices analytically from the expansion (Sudret, 2008).
+        Results use the same layout as gr.tran_sobol().
+
+        Args:
+            plan (str): Sobol' index to compute; plan={"first", "total"}
+            typename (str): Name to give index type column in results
+            full (bool): Return un-normalized indices and variance?
+
+        Returns:
+            DataFrame: Sobol' indices
+
+        References:
+            B. Sudret, "Global sensitivity analysis using polynomial chaos
+            expansions" (2008) Reliability Engineering & System Safety, Vol 93.
+
+        """
+        c2 = self.coef ** 2
+        df_var = DataFrame(atleast_2d(npsum(c2[1:], axis=0)), columns=self.out)
+        df_var[typename] = "var"
+
+        df_res = df_var.copy()
+        for i_var, var in enumerate(self.var):
+            I_var = self.alphas[:, i_var] > 0
+            if plan == "first":
+                I_only = (self.alphas > 0).sum(axis=1) == 1
+                I_var = I_var & I_only
+            elif plan != "total":
+                raise ValueError("plan `{}` not valid".format(plan))
+
+            df_tau = DataFrame(atleast_2d(npsum(c2[I_var], axis=0)), columns=self.out)
+            df_tau[typename] = "T_" + var
+
+            df_index = df_tau[self.out].truediv(df_var[self.out])
+            df_index[typename] = "S_" + var
+
+            df_res = concat((df_res, df_tau, df_index))
+
+        df_res.sort_values(typename, inplace=True)
+        if not full:
+            I_normalized = list(map(lambda s: s[0] == "S", df_res[typename]))
+            df_res = df_res[I_normalized]
+
+        return df_res.fillna(value=0).reset_index(drop=True)
+
+
+## Fit PCE model
+# --------------------------------------------------
+@curry
+def fit_pce(
+    df,
+    md=None,
+    var=None,
+    out=None,
+    domain=None,
+    density=None,
+    order=3,
+    q=1.0,
+    sparse=True,
+):
+    r"""Fit a polynomial chaos expansion
+
+    Fit a polynomial chaos expansion (PCE) to given data by least squares
+    regression. Each variable receives an orthonormal polynomial basis matched
+    to its marginal: Hermite for normal, Legendre for uniform, and Hermite in
+    standard normal space for all other marginals. Deterministic variables are
+    treated as uniform over their (finite) bounds. Data may come from any
+    design, e.g. gr.eval_monte_carlo().
+
+    The fitted function provides output moments and Sobol' indices directly
+    from the expansion coefficients, without further model evaluations; see
+    FunctionPCE.moments() and FunctionPCE.sobol().
+
+    Args:
+        df (DataFrame): Data for function fitting
+        md (gr.Model): Model from which to inherit metadata
+        var (list(str) or None): List of features or None for all except outputs
+        out (list(str)): List of outputs to fit
+        domain (gr.Domain): Domain for new model
+        density (gr.Density): Density for new model
+        order (int): Maximum total polynomial order
+        q (float): Hyperbolic truncation norm, 0 < q <= 1; q < 1 drops high-order
+            interaction terms
+        sparse (bool): Select a sparse basis by orthogonal matching pursuit with
+            leave-one-out error? If False, use ordinary least squares on the full
+            basis.
+
+    Returns:
+        gr.Model: A grama model with fitted function
+
+    Notes:
+        - Moments and Sobol' indices assume independent variables
+
+    References:
+        Blatman and Sudret, "Adaptive sparse polynomial chaos expansion based on
+        least angle regression" (2011) Journal of Computational Physics, Vol 230.
+
+    Examples:
+        >>> import grama as gr
+        >>> from grama.models import make_ishigami
+        >>> md = make_ishigami()
+        >>> df_data = md >> gr.ev_monte_carlo(n=500, df_det="nom", seed=101)
+        >>> md_pce = df_data >> gr.ft_pce(md=md, order=6, var=md.var_rand)
+        >>> md_pce.functions[0].moments()
+        >>> md_pce.functions[0].sobol(plan="total")
+
+    """
+    ## Infer fitting metadata, if available
+    if not (md is None):
+        domain = md.domain
+        density = md.density
+        out = md.out
+        if var is None:
+            var = md.var
+
+    ## Check invariants
+    if out is None:
+        raise ValueError("Must provide out or md")
+    if not set(out).issubset(set(df.columns)):
+        raise ValueError("out must be subset of df.columns")
+    ## Default input value
+    if var is None:
+        var = list(set(df.columns).difference(set(out)))
+    ## Check more invariants
+    set_inter = set(out).intersection(set(var))
+    if len(set_inter) > 0:
+        raise ValueError(
+            "out and var must be disjoint; intersect = {}".format(set_inter)
+        )
+    if not set(var).issubset(set(df.columns)):
+        raise ValueError("var must be subset of df.columns")
+    if not ((0 < q) and (q <= 1)):
+        raise ValueError("q must lie in (0, 1]")
+
+    ## Build basis
+    families, x2s = [], []
+    for v in var:
+        family, x2s_v, _ = _std_family(v, domain=domain, density=density)
+        families.append(family)
+        x2s.append(x2s_v)
+
+    alphas = _multi_indices(len(var), order, q=q)
+    X = df[var].values
+    S = concatenate([atleast_2d(x2s[j](X[:, j])).T for j in range(len(var))], axis=1)
+    Psi = _basis(S, families, alphas)
+
+    n_obs, n_terms = Psi.shape
+    if (not sparse) and (n_obs < n_terms):
+        raise ValueError(
+            "Full basis has {0:} terms but only {1:} observations; ".format(
+                n_terms, n_obs
+            )
+            + "use sparse=True or reduce order"
+        )
+
+    ## Fit coefficients
+    Y = df[out].values
+    if sparse:
+        coef = zeros((n_terms, len(out)))
+        for i in range(len(out)):
+            coef[:, i] = _fit_omp(Psi, Y[:, i])
+    else:
+        coef = lstsq(Psi, Y, rcond=None)[0]
+
+    name = "PCE (order={0:}, terms={1:})".format(
+        order, int((npabs(coef).sum(axis=1) > 0).sum())
+    )
+    fun = FunctionPCE(coef, alphas, families, x2s, list(var), list(out), name, 0)
+
+    ## Construct model
+    return Model(functions=[fun], domain=domain, density=density)
+
+
+ft_pce = add_pipe(fit_pce)
@@ -13,7 +13,7 @@ from grama import cp_function, cp_md_det, cp_marginals
 from grama import cp_copula_gaussian, cp_bounds
 from toolz import curry
 from pandas import concat, DataFrame
-from numpy import zeros, diag, atleast_2d, triu_indices
+from numpy import zeros, diag, atleast_2d, triu_indices, stack
 from numpy import sum as npsum
 from numpy import power as nppow
 from numpy import sqrt as npsqrt
@@ -23,7 +23,14 @@ from warnings import warn
 
 @curry
 def fit_nls(
-    df_data, md=None, out=None, var_fix=None, verbose=True, uq_method=None, **kwargs,
+    df_data,
+    md=None,
+    out=None,
+    var_fix=None,
+    verbose=True,
+    uq_method=None,
+    batch_grad=True,
+    **kwargs,
 ):
     r"""Fit a model with Nonlinear Least Squares (NLS)
 
@@ -50,6 +57,10 @@ def fit_nls(
             uncertainties. If None, provide best-fit values only. Methods:
             uq_method = "linpool": assume normal errors; linearly approximate
                 parameter effects; equally pool variance matrices for each output
+        batch_grad (bool): When uq_method requires a fresh Jacobian, evaluate
+            the finite-difference stencil for all data in a single call?
+            Optimizer methods "trf" and "lm" return their final Jacobian and
+            residuals, which are reused instead.
 
     Returns:
         gr.Model: Model for evaluation with best-fit variables frozen to
@@ -91,8 +102,10 @@ def fit_nls(
 
     ## Run eval_nls to fit model parameter values
     df_fit = eval_nls(md, df_data=df_data, var_fix=var_fix, append=True, **kwargs)
+    meta = df_fit._meta
     ## Select best-fit values
-    df_best = df_fit.sort_values(by="mse", axis=0).iloc[[0]].reset_index(drop=True)
+    i_best = df_fit.sort_values(by="mse", axis=0).index[0]
+    df_best = df_fit.iloc[[i_best]].reset_index(drop=True)
     if verbose:
         print(df_fit.sort_values(by="mse", axis=0))
 
@@ -111,27 +124,41 @@ def fit_nls(
 
     ## Calibrate parametric uncertainty, if requested
     if uq_method == "linpool":
-        ## Precompute data
-        df_nom = eval_nominal(md, df_det="nom")
-        df_base = tran_outer(
-            df_data, concat((df_best[var_fitted], df_nom[var_fix]), axis=1)
-        )
-        df_pred = eval_df(md, df=df_base)
-        df_grad = eval_grad_fd(md, df_base=df_base, var=var_fitted)
-
-        ## Pool variance matrices
         n_obs = df_data.shape[0]
         n_fitted = len(var_fitted)
+        df_nom = eval_nominal(md, df_det="nom", skip=True)
+
+        if meta["jacobians"][i_best] is not None:
+            ## Reuse the optimizer's final residuals and Jacobian
+            I_var = [meta["var_fit"].index(v) for v in var_fitted]
+            I_out = [meta["out"].index(o) for o in out]
+            R = meta["residuals"][i_best][:, I_out]
+            J = meta["jacobians"][i_best][:, I_var].reshape(
+                (n_obs, len(meta["out"]), n_fitted)
+            )[:, I_out, :]
+        else:
+            ## Evaluate residuals and Jacobian at the best fit
+            df_base = tran_outer(
+                df_data, concat((df_best[var_fitted], df_nom[var_fix]), axis=1)
+            )
+            df_pred = eval_df(md, df=df_base)
+            df_grad = eval_grad_fd(
+                md, df_base=df_base, var=var_fitted, batch=batch_grad
+            )
+            R = df_data[out].values - df_pred[out].values
+            J = stack(
+                [df_grad[["D" + o + "_D" + v for v in var_fitted]].values for o in out],
+                axis=1,
+            )
+
+        ## Pool variance matrices
         Sigma_pooled = zeros((n_fitted, n_fitted))
 
-        for output in out:
+        for k, output in enumerate(out):
             ## Approximate sigma_sq
-            sigma_sq = npsum(
-                nppow(df_data[output].values - df_pred[output].values, 2)
-            ) / (n_obs - n_fitted)
+            sigma_sq = npsum(nppow(R[:, k], 2)) / (n_obs - n_fitted)
             ## Approximate (pseudo)-inverse hessian
-            var_grad = list(map(lambda v: "D" + output + "_D" + v, var_fitted))
-            Z = df_grad[var_grad].values
+            Z = J[:, k, :]
             Hinv = pinv(Z.T.dot(Z), hermitian=True)
 
             ## Add variance matrix to pooled Sigma
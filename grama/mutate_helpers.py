@@ -16,11 +16,13 @@ __all__ = [
     "pnorm",
     "dnorm",
     "pareto_min",
+    "pareto_rank",
 ]
 
 from grama import make_symbolic
 
-from numpy import argsort, array, median, zeros, ones
+from numpy import argsort, array, median, zeros, ones, arange, inf
+from numpy import concatenate, cumsum, lexsort, minimum
 from numpy import any as npany
 from numpy import all as npall
 from numpy import abs as npabs
@@ -149,32 +151,132 @@ def pnorm(x):
 
 # Pareto frontier calculation
 # -------------------------
+def _pareto_costs(args, name):
+    r"""Stack features into a cost matrix; name is the caller, for errors
+    """
+    # Check invariants
+    lengths = map(len, args)
+    if len(set(lengths)) > 1:
+        raise ValueError("All arguments to {} must be of equal length".format(name))
+
+    return array([*args], dtype=float).T
+
+
+def _pareto_front(costs, block=256):
+    r"""Find the non-dominated rows of a cost matrix
+
+    Point q dominates p if q <= p in every feature and q < p in at least one;
+    duplicate points do not dominate each other. Two features use a sort-based
+    sweep; more features use a block-nested-loop over points sorted by their
+    feature sum, so that every dominating point is visited first.
+
+    Args:
+        costs (2d array): Features to minimize; shape (n, d)
+        block (int): Number of candidates to test at once
+
+    Returns:
+        array: Boolean mask of non-dominated rows
+    """
+    n, d = costs.shape
+    is_efficient = zeros(n, dtype=bool)
+    if n == 0:
+        return is_efficient
+
+    if d == 1:
+        return costs[:, 0] == costs[:, 0].min()
+
+    if d == 2:
+        # Sort by first feature, breaking ties by second
+        order = lexsort((costs[:, 1], costs[:, 0]))
+        x, y = costs[order, 0], costs[order, 1]
+        # Minimum y within each run of equal x
+        I_start = concatenate(([True], x[1:] != x[:-1]))
+        y_group = y[I_start][cumsum(I_start) - 1]
+        # Minimum y over all strictly smaller x
+        y_prev = concatenate(([inf], minimum.accumulate(y[I_start])[:-1]))
+        y_prev = y_prev[cumsum(I_start) - 1]
+
+        is_efficient[order] = (y == y_group) & (y < y_prev)
+        return is_efficient
+
+    # Dominating points have strictly smaller sum, or equal sum and precede in
+    # lexicographic order
+    order = lexsort(tuple(costs[:, ::-1].T) + (costs.sum(axis=1),))
+    front = costs[order[:0]]
+    for i in range(0, n, block):
+        I_block = order[i : i + block]
+        C = costs[I_block]
+        C_all = concatenate((front, C))
+        # dom[i, j] == True iff C_all[j] dominates C[i]
+        leq = npall(C_all[None, :, :] <= C[:, None, :], axis=2)
+        lt = npany(C_all[None, :, :] < C[:, None, :], axis=2)
+        I_nd = ~npany(leq & lt, axis=1)
+
+        is_efficient[I_block] = I_nd
+        front = concatenate((front, C[I_nd]))
+
+    return is_efficient
+
+
 @make_symbolic
 def pareto_min(*args):
     r"""Determine if observation is a Pareto point
 
     Find the Pareto-efficient points that minimize the provided features.
+    Identical observations do not dominate each other; if one is efficient,
+    all its copies are.
 
     Args:
         xi (iterable OR gr.Intention()): Feature to minimize
 
     Returns:
         boolean: Indicates if observation is Pareto-efficient
+
+    Examples:
+        >>> import grama as gr
+        >>> X = gr.Intention()
+        >>> df = gr.df_make(x=[1, 2, 0, 1, 2], y=[0, 0, 1, 1, 1])
+        >>> df >> gr.tf_filter(gr.pareto_min(X.x, X.y))
     """
-    # Check invariants
-    lengths = map(len, args)
-    if len(set(lengths)) > 1:
-        raise ValueError("All arguments to pareto_min must be of equal length")
+    return _pareto_front(_pareto_costs(args, "pareto_min"))
 
-    # Compute pareto points
-    costs = array([*args]).T
-    is_efficient = ones(costs.shape[0], dtype=bool)
-    for i, c in enumerate(costs):
-        is_efficient[i] = npall(npany(costs[:i] > c, axis=1)) and npall(
-            npany(costs[i + 1 :] > c, axis=1)
-        )
 
-    return is_efficient
+@make_symbolic
+def pareto_rank(*args):
+    r"""Non-dominated sorting rank
+
+    Rank observations by Pareto front for the provided features: rank 1 marks
+    the Pareto-efficient points, rank 2 the points efficient once rank 1 is
+    removed, and so on (Deb et al., 2002).
+
+    Args:
+        xi (iterable OR gr.Intention()): Feature to minimize
+
+    Returns:
+        array: Integer rank of each observation; 1 is the Pareto frontier
+
+    References:
+        Deb, Pratap, Agarwal, and Meyarivan, "A fast and elitist multiobjective
+        genetic algorithm: NSGA-II" (2002) IEEE Trans. Evol. Comp., Vol 6.
+
+    Examples:
+        >>> import grama as gr
+        >>> X = gr.Intention()
+        >>> df = gr.df_make(x=[1, 2, 0, 1, 2], y=[0, 0, 1, 1, 1])
+        >>> df >> gr.tf_mutate(rank=gr.pareto_rank(X.x, X.y))
+    """
+    costs = _pareto_costs(args, "pareto_rank")
+    rank = zeros(costs.shape[0], dtype=int)
+    I_left = arange(costs.shape[0])
+
+    k = 1
+    while len(I_left) > 0:
+        I_front = _pareto_front(costs[I_left])
+        rank[I_left[I_front]] = k
+        I_left = I_left[~I_front]
+        k += 1
+
+    return rank
 
 
 # Factors
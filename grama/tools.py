@@ -8,6 +8,7 @@ __all__ = [
     "marg_named",
     "param_dist",
     "pipe",
+    "set_pipe_copy",
     "valid_dist",
 ]
 
@@ -263,6 +264,101 @@ def copy_meta(df_source, df_target):
     return df_target
 
 
+## Pipe copy mode
+_PIPE_COPY = {"mode": "deep"}
+## Verbs that never write into their input; see _register_cow()
+_COW_VERBS = set()
+
+
+def set_pipe_copy(mode="deep"):
+    r"""Set how pipes copy their inputs
+
+    By default every pipe stage (>>) receives a deep copy of its input, so no
+    verb can modify the caller's data. On large frames these copies dominate
+    the cost of a chain of verbs; copy-on-write mode avoids them.
+
+    Args:
+        mode (str): Copy mode; one of
+            "deep": each stage receives a deep copy of its input (default)
+            "cow": copy-on-write; verbs known not to write into their input
+                (e.g. tf_mutate, tf_filter, tf_select, tf_summarize) receive
+                a shallow copy of a DataFrame that shares data with its
+                input. All other stages receive a deep copy, as in "deep"
+                mode.
+                Metadata (_grouped_by, _plot_info, _meta) is carried over.
+                Models are passed without copying, as comp_ verbs copy them
+                internally.
+
+    Returns:
+        str: Previous mode
+
+    Notes:
+        - In "cow" mode, results may share memory with their inputs; copy a
+          result before modifying it in place outside a pipe.
+
+    Examples:
+        >>> import grama as gr
+        >>> from grama.data import df_diamonds
+        >>> mode = gr.set_pipe_copy("cow")
+        >>> df_res = (
+        >>>     df_diamonds
+        >>>     >> gr.tf_filter(gr.Intention().carat > 1)
+        >>>     >> gr.tf_mutate(ppc=gr.Intention().price / gr.Intention().carat)
+        >>> )
+        >>> gr.set_pipe_copy(mode)
+
+    """
+    if mode not in ("deep", "cow"):
+        raise ValueError("mode must be 'deep' or 'cow'; got {}".format(mode))
+    mode_old = _PIPE_COPY["mode"]
+    _PIPE_COPY["mode"] = mode
+
+    return mode_old
+
+
+def _copy_input(other, deep=True):
+    r"""Copy a pipe input, carrying DataFrame metadata"""
+    other_copy = other.copy() if deep else other.copy(deep=False)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        if isinstance(other, pd.DataFrame):
+            other_copy = copy_meta(other, other_copy)
+
+    return other_copy
+
+
+def _register_cow(*verbs):
+    r"""Mark verbs that never write into their input DataFrame
+
+    Registered verbs share data with their input in copy-on-write mode; see
+    set_pipe_copy().
+    """
+    _COW_VERBS.update(verbs)
+
+
+def _apply_cow(function, other, verb=None):
+    r"""Apply a pipe stage with copy-on-write semantics
+
+    Only registered verbs share data with their input; other stages receive a
+    deep copy up front. Each stage runs exactly once. Data is not marked
+    read-only, as some pandas routines reject read-only buffers; registration
+    is the guarantee that a verb does not write into its input.
+    """
+    if not isinstance(other, pd.DataFrame):
+        return function(other)
+    if verb not in _COW_VERBS:
+        return function(_copy_input(other))
+
+    ## Share data through a shallow copy; the axes are copied, so stages may
+    ## rename them without affecting the input
+    view = _copy_input(other, deep=False)
+    view.index = other.index.copy()
+    view.columns = other.columns.copy()
+
+    return function(view)
+
+
 ## Pipe decorator
 class pipe(object):
     __name__ = "pipe"
@@ -278,14 +374,10 @@ class pipe(object):
         return self
 
     def __rrshift__(self, other):
-        other_copy = other.copy()
-
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore")
-            if isinstance(other, pd.DataFrame):
-                other_copy = copy_meta(other, other_copy)
-
-        result = self.function(other_copy)
+        if _PIPE_COPY["mode"] == "cow":
+            result = _apply_cow(self.function, other, getattr(self, "_verb", self))
+        else:
+            result = self.function(_copy_input(other))
 
         for p in self.chained_pipes:
             result = p.__rrshift__(result)
@@ -300,7 +392,11 @@ class pipe(object):
         )
 
     def __call__(self, *args, **kwargs):
-        return pipe(lambda x: self.function(x, *args, **kwargs))
+        p = pipe(lambda x: self.function(x, *args, **kwargs))
+        ## Record verb and arguments for query planning; see gr.lazy()
+        p._verb, p._args, p._kwargs = self, args, kwargs
+
+        return p
 
 
 ## Pipe applicator
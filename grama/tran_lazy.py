@@ -0,0 +1,400 @@
+__all__ = ["lazy", "collect", "LazyFrame"]
+
+## Lazy execution of transform chains
+from grama import pipe, copy_meta
+from grama import tf_mutate, tf_transmute, tf_filter, tf_select, tf_drop
+from grama import tf_rename, tf_arrange, tf_summarize, tf_head, tf_tail
+from grama import tf_group_by
+from grama.dfply.base import Intention, symbolic_evaluation, _expr, _ELEMENTWISE
+from pandas import DataFrame
+import warnings
+
+## Verbs whose output holds only the columns they name
+_VERBS_PROJECT = [tf_select, tf_transmute, tf_summarize]
+
+## Helper functions
+# --------------------------------------------------
+def _is_verb(step, verb):
+    return (getattr(step, "_verb", None) is verb) and (len(step.chained_pipes) == 0)
+
+
+def _step_name(step):
+    if hasattr(step, "_fused"):
+        return "mutate (fused x{})".format(len(step._fused))
+    f = getattr(step, "_verb", step)
+    while hasattr(f, "function"):
+        f = f.function
+
+    return getattr(f, "__name__", "<function>")
+
+
+def _run(df, steps):
+    for step in steps:
+        df = df >> step
+
+    return df
+
+
+def _assign(df, **kwargs):
+    for key, value in kwargs.items():
+        df[key] = value(df) if callable(value) else value
+
+    return df
+
+
+_assign_symbolic = symbolic_evaluation(_assign)
+
+
+def _fuse_mutates(kwargs_all):
+    r"""Fuse a run of mutates into one stage that copies its input once"""
+
+    def fused(df):
+        for kwargs in kwargs_all:
+            df = _assign_symbolic(df, **kwargs)
+        return df
+
+    step = pipe(fused)
+    step._fused = kwargs_all
+
+    return step
+
+
+def _column_ref(node):
+    r"""Column name referenced by an expression like X.y or X["y"], or None"""
+    if (not isinstance(node, Intention)) or (_expr(node) is None) or node.inverted:
+        return None
+    expr = _expr(node)
+    ## Attributes of the frame itself (e.g. X.shape) are not columns
+    if (expr[0] == "attr") and (_expr(expr[1]) == ("ctx",)):
+        return None if hasattr(DataFrame, expr[2]) else expr[2]
+    if (
+        (expr[0] == "method")
+        and (_expr(expr[1]) == ("ctx",))
+        and (expr[2] == "__getitem__")
+        and (len(expr[3]) == 1)
+        and (len(expr[4]) == 0)
+        and isinstance(expr[3][0], str)
+    ):
+        return expr[3][0]
+
+    return None
+
+
+def _columns_used(value):
+    r"""Columns referenced by an expression; None if not known statically"""
+    if isinstance(value, (list, tuple)):
+        values = value
+    elif isinstance(value, dict):
+        values = list(value.values())
+    elif isinstance(value, Intention):
+        if _column_ref(value) is not None:
+            return {_column_ref(value)}
+        expr = _expr(value)
+        if (expr is None) or (expr[0] == "ctx"):
+            return None
+        if expr[0] == "attr":
+            values = [expr[1]]
+        elif expr[0] == "method":
+            values = [expr[1], expr[3], expr[4]]
+        elif expr[0] == "call":
+            values = [expr[1], expr[2], expr[3]]
+        else:
+            values = [expr[2], expr[3]]
+    elif callable(value):
+        return None
+    else:
+        return set()
+
+    columns = set()
+    for v in values:
+        used = _columns_used(v)
+        if used is None:
+            return None
+        columns |= used
+
+    return columns
+
+
+def _elementwise(value):
+    r"""Check whether an expression is elementwise over rows
+
+    Allows scalars, column references, and whitelisted operators (arithmetic,
+    comparison, logical) applied to these; rejects everything else, e.g.
+    reducers (mean(), colmax()), window helpers (lag()), and opaque functions.
+    """
+    if isinstance(value, (bool, int, float, str)) or (value is None):
+        return True
+    if not isinstance(value, Intention):
+        return False
+    if _column_ref(value) is not None:
+        return True
+    expr = _expr(value)
+    if (expr is None) or value.inverted or (expr[0] != "method"):
+        return False
+    _, parent, name, args, kwargs = expr
+
+    return (
+        (name in _ELEMENTWISE)
+        and (len(kwargs) == 0)
+        and _elementwise(parent)
+        and all(map(_elementwise, args))
+    )
+
+
+def _pushable(step_mutate, step_filter):
+    r"""Check whether a filter may run before a mutate
+
+    Requires that the mutate be statically elementwise, and that the filter
+    reference (statically) none of the columns the mutate assigns.
+    """
+    if (len(step_mutate._args) > 0) or (len(step_filter._kwargs) > 0):
+        return False
+    if not all(map(_elementwise, step_mutate._kwargs.values())):
+        return False
+    used = _columns_used(step_filter._args)
+
+    return (used is not None) and (len(used & set(step_mutate._kwargs.keys())) == 0)
+
+
+def _columns_selected(args):
+    r"""Columns named by selection arguments; None unless all are names"""
+    columns = set()
+    for arg in args:
+        if isinstance(arg, (list, tuple)):
+            used = _columns_selected(arg)
+        elif isinstance(arg, str):
+            used = {arg}
+        else:
+            used = None if _column_ref(arg) is None else {_column_ref(arg)}
+        if used is None:
+            return None
+        columns |= used
+
+    return columns
+
+
+def _columns_step(step):
+    r"""Columns referenced by a verb; None if not known statically"""
+    args, kwargs = getattr(step, "_args", ()), getattr(step, "_kwargs", {})
+    if _is_verb(step, tf_mutate) or _is_verb(step, tf_summarize):
+        return _columns_used(list(kwargs.values())) if len(args) == 0 else None
+    if _is_verb(step, tf_filter):
+        return _columns_used(list(args)) if len(kwargs) == 0 else None
+    if _is_verb(step, tf_select):
+        return _columns_selected(args) if len(kwargs) == 0 else None
+    if _is_verb(step, tf_transmute):
+        selected = _columns_selected(args)
+        used = _columns_used(list(kwargs.values()))
+        return None if (selected is None) or (used is None) else selected | used
+    if _is_verb(step, tf_arrange):
+        if any(map(lambda a: isinstance(a, int), args)):
+            return None
+        names = {a for a in args if isinstance(a, str)}
+        used = _columns_used([a for a in args if not isinstance(a, str)])
+        return None if used is None else names | used
+    if _is_verb(step, tf_head) or _is_verb(step, tf_tail):
+        return set()
+
+    return None
+
+
+def _columns_plan(df, steps):
+    r"""Source columns a plan needs, if it projects columns; else all"""
+    columns = list(df.columns)
+    used = set()
+    for step in steps:
+        step_used = _columns_step(step)
+        if step_used is None:
+            return columns
+        used |= step_used
+        ## Later verbs see only the projected columns
+        if any(map(lambda v: _is_verb(step, v), _VERBS_PROJECT)):
+            return [c for c in columns if c in used]
+
+    return columns
+
+
+def _optimize(df, steps):
+    r"""Rewrite a plan; returns source columns to keep and new steps"""
+    columns = list(df.columns)
+    steps = list(steps)
+    ## Grouped plans are executed as written
+    grouped = getattr(df, "_grouped_by", None) is not None
+    if grouped or any(map(lambda s: _is_verb(s, tf_group_by), steps)):
+        return columns, steps
+
+    ## Push filters before elementwise mutates
+    changed = True
+    while changed:
+        changed = False
+        for i in range(len(steps) - 1):
+            if (
+                _is_verb(steps[i], tf_mutate)
+                and _is_verb(steps[i + 1], tf_filter)
+                and _pushable(steps[i], steps[i + 1])
+            ):
+                steps[i], steps[i + 1] = steps[i + 1], steps[i]
+                changed = True
+
+    ## Prune source columns the plan does not use
+    columns = _columns_plan(df, steps)
+
+    ## Fuse consecutive mutates
+    steps_fused, run = [], []
+    for step in steps + [None]:
+        if _is_verb(step, tf_mutate) and (len(step._args) == 0):
+            run.append(step)
+            continue
+        if len(run) > 1:
+            steps_fused.append(_fuse_mutates([s._kwargs for s in run]))
+        else:
+            steps_fused.extend(run)
+        run = []
+        if step is not None:
+            steps_fused.append(step)
+
+    return columns, steps_fused
+
+
+## Lazy frame
+# --------------------------------------------------
+class LazyFrame:
+    r"""DataFrame with deferred verbs
+
+    Records verbs applied with >> as a logical plan; the plan is optimized
+    and executed by collect(). Construct with gr.lazy().
+
+    """
+
+    def __init__(self, df, steps=None):
+        self.df = df
+        self.steps = [] if steps is None else steps
+
+    def __rshift__(self, other):
+        if isinstance(other, _Collect):
+            return self.collect(**other.kwargs)
+        if not isinstance(other, pipe):
+            raise TypeError("LazyFrame accepts only verbs, e.g. gr.tf_mutate()")
+
+        return LazyFrame(self.df, self.steps + [other])
+
+    def plan(self, optimize=True):
+        r"""Build the execution plan
+
+        Args:
+            optimize (bool): Rewrite the plan before execution?
+
+        Returns:
+            list(str): Source columns read by the plan
+            list(gr.pipe): Verbs to execute
+
+        """
+        if optimize:
+            return _optimize(self.df, self.steps)
+
+        return list(self.df.columns), list(self.steps)
+
+    def explain(self, optimize=True):
+        r"""Describe the execution plan
+
+        Returns:
+            str: One line for the source, one per verb
+
+        """
+        columns, steps = self.plan(optimize=optimize)
+        lines = [
+            "source: {0:} rows, {1:} of {2:} columns".format(
+                self.df.shape[0], len(columns), self.df.shape[1]
+            )
+        ]
+        lines.extend(map(lambda s: "  >> " + _step_name(s), steps))
+
+        return "\n".join(lines)
+
+    def collect(self, optimize=True):
+        r"""Execute the plan
+
+        Args:
+            optimize (bool): Rewrite the plan before execution?
+
+        Returns:
+            DataFrame: Result of the plan
+
+        """
+        columns, steps = self.plan(optimize=optimize)
+        df = self.df
+        if len(columns) < df.shape[1]:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                df = copy_meta(self.df, self.df[columns])
+
+        return _run(df, steps)
+
+    def __repr__(self):
+        return "LazyFrame\n" + self.explain(optimize=False)
+
+
+class _Collect:
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+
+
+def lazy(df):
+    r"""Defer verbs applied to a DataFrame
+
+    Start a lazy plan: verbs piped into the result are recorded rather than
+    executed, until the plan is ended with gr.collect(). Before execution
+    the plan is optimized:
+
+    - filters are moved ahead of mutates that are elementwise and do not
+      assign any column the filter uses, so the mutates run on fewer rows;
+    - consecutive mutates are fused into one stage that copies its input once;
+    - in plans that project columns (select, transmute, or summarize), source
+      columns the plan never uses are dropped before the first verb
+      (projection pruning).
+
+    Rewrites are decided statically from the Intention expressions: a mutate
+    is elementwise only if built from column references, constants, and
+    arithmetic, comparison, or logical operators. Filters never move ahead
+    of reducers (e.g. mean(), colmax()), window helpers (e.g. lag()), or
+    other functions. Pruning requires every verb up to the projection to be
+    one of mutate, filter, arrange, head, or tail, referencing columns only
+    by name (X.y, X["y"], or strings in select and arrange). Grouped plans
+    are executed as written.
+
+    Args:
+        df (DataFrame): Data to transform
+
+    Returns:
+        LazyFrame: Deferred plan; pipe verbs into it, then gr.collect()
+
+    Examples:
+        >>> import grama as gr
+        >>> from grama.data import df_diamonds
+        >>> X = gr.Intention()
+        >>> df_res = (
+        >>>     gr.lazy(df_diamonds)
+        >>>     >> gr.tf_mutate(ppc=X.price / X.carat)
+        >>>     >> gr.tf_filter(X.cut == "Ideal")
+        >>>     >> gr.tf_summarize(ppc_mean=gr.mean(X.ppc))
+        >>>     >> gr.collect()
+        >>> )
+
+    """
+    return LazyFrame(df)
+
+
+def collect(optimize=True):
+    r"""Execute a lazy plan
+
+    End a plan started with gr.lazy(); see gr.lazy() for the optimizations
+    applied.
+
+    Args:
+        optimize (bool): Rewrite the plan before execution?
+
+    Returns:
+        DataFrame: Result of the plan (when piped from a LazyFrame)
+
+    """
+    return _Collect(optimize=optimize)
@@ -5,13 +5,18 @@ __all__ = [
     "tf_describe",
     "tran_inner",
     "tf_inner",
+    "tran_morris",
+    "tf_morris",
+    "tran_moments",
+    "tf_moments",
     "tran_pca",
     "tf_pca",
     "tran_sobol",
     "tf_sobol",
 ]
 
-from numpy import round, dot
+from numpy import round, dot, sign, array, sqrt, maximum
+from numpy import abs as npabs
 from numpy.linalg import svd
 from pandas import concat, DataFrame
 
@@ -156,6 +161,189 @@ def tran_sobol(df, typename="ind", digits=2, full=False):
 
 tf_sobol = add_pipe(tran_sobol)
 
+## Compute Morris elementary effects
+# --------------------------------------------------
+@curry
+def tran_morris(df, varcol="var", outcol="out"):
+    r"""Post-process results from gr.eval_morris()
+
+    Estimate elementary effect statistics based on Morris trajectory
+    evaluations (Morris, 1991). Intended as post-processor for
+    gr.eval_morris().
+
+    Args:
+        df (DataFrame): Trajectory results from gr.eval_morris()
+        varcol (str): Name to give variable column in results
+        outcol (str): Name to give output column in results
+
+    Returns:
+        DataFrame: Elementary effect statistics, one row per variable and
+            output
+
+    Notes:
+        - Elementary effects are computed in probability space; a step moves
+          a variable's CDF value by the grid step recorded in df._meta
+          by gr.eval_morris().
+        - Steps are differenced within each trajectory and deterministic
+          level, so rows of different trajectories may appear in any order.
+          Steps that do not change the moved variable (e.g. a degenerate
+          marginal) are skipped with a warning.
+        - Statistics reported in the columns
+          mu: Mean of elementary effects
+          mu_star: Mean of absolute elementary effects (Campolongo et al., 2007)
+          sigma: Standard deviation of elementary effects
+
+    References:
+        M.D. Morris, "Factorial Sampling Plans for Preliminary Computational
+        Experiments" (1991) Technometrics, Vol 33.
+
+    Examples:
+
+        >>> import grama as gr
+        >>> from grama.models import make_cantilever_beam
+        >>> md = make_cantilever_beam()
+        >>> df_morris = md >> gr.ev_morris(r=20, df_det="nom")
+        >>> df_morris >> gr.tf_morris()
+
+    """
+    ## Determine design from dataframe metadata
+    metadata = df._meta
+    if metadata["type"] == "eval_morris":
+        varname = metadata["varname"]
+        idname = metadata["idname"]
+        delta = metadata["delta"]
+        var_rand = metadata["var_rand"]
+        var_det = metadata["var_det"]
+        out = metadata["out"]
+    else:
+        raise ValueError("df not Morris trajectories!")
+
+    ## Check invariants
+    if not (varname in df.columns):
+        raise ValueError("{} not in df.columns".format(varname))
+    if not (idname in df.columns):
+        raise ValueError("{} not in df.columns".format(idname))
+    if not set(var_rand).issubset(set(df.columns)):
+        raise ValueError("var_rand must be subset of df.columns")
+    if not set(var_det).issubset(set(df.columns)):
+        raise ValueError("var_det must be subset of df.columns")
+
+    ## Differences between consecutive steps of each trajectory; trajectories
+    # repeat at each deterministic level
+    df_traj = df.groupby([idname] + var_det, sort=False)
+    I_step = (df[varname] != "_").values
+    var_step = df[varname].values[I_step]
+    dY = df_traj[out].diff().values[I_step]
+    dX = df_traj[var_rand].diff().values[I_step]
+
+    ## Signed step in probability space; marginal quantiles are monotone
+    ind_step = array([var_rand.index(v) for v in var_step], dtype=int)
+    step = delta * sign(dX[range(len(ind_step)), ind_step])
+
+    ## Steps along degenerate marginals do not move; skip them
+    I_move = step != 0
+    if not I_move.all():
+        warnings.warn(
+            "skipping {} steps that do not change {}".format(
+                (~I_move).sum(), sorted(set(var_step[~I_move]))
+            ),
+            UserWarning,
+        )
+
+    df_ee = DataFrame(data=dY[I_move] / step[I_move, None], columns=out)
+    df_ee[varcol] = var_step[I_move]
+
+    ## Aggregate over trajectories
+    df_res = (
+        df_ee.melt(id_vars=[varcol], var_name=outcol, value_name="ee")
+        .groupby([varcol, outcol])["ee"]
+        .agg(mu="mean", mu_star=lambda s: npabs(s).mean(), sigma="std")
+        .reset_index()
+    )
+
+    return df_res
+
+
+tf_morris = add_pipe(tran_morris)
+
+
+## Estimate moments from quadrature
+# --------------------------------------------------
+@curry
+def tran_moments(df, outcol="out"):
+    r"""Post-process results from gr.eval_quadrature()
+
+    Estimate output means and variances from quadrature-weighted evaluations.
+    Intended as post-processor for gr.eval_quadrature().
+
+    Args:
+        df (DataFrame): Quadrature results from gr.eval_quadrature()
+        outcol (str): Name to give output column in results
+
+    Returns:
+        DataFrame: Output moments; one row per output and deterministic level,
+            with columns mean, var, and sd
+
+    Notes:
+        - Sparse (Smolyak) grids carry negative weights, so the variance
+          estimate can be negative when the level is too low to resolve the
+          output; such estimates are clipped to zero with a warning.
+
+    Examples:
+
+        >>> import grama as gr
+        >>> from grama.models import make_cantilever_beam
+        >>> md = make_cantilever_beam()
+        >>> df_quad = md >> gr.ev_quadrature(level=3, df_det="nom")
+        >>> df_quad >> gr.tf_moments()
+
+    """
+    ## Determine design from dataframe metadata
+    metadata = df._meta
+    if metadata["type"] == "eval_quadrature":
+        weightname = metadata["weightname"]
+        var_det = metadata["var_det"]
+        out = metadata["out"]
+    else:
+        raise ValueError("df not quadrature results!")
+
+    ## Check invariants
+    if not (weightname in df.columns):
+        raise ValueError("{} not in df.columns".format(weightname))
+    if not set(var_det).issubset(set(df.columns)):
+        raise ValueError("var_det must be subset of df.columns")
+
+    ## Weighted moments within each deterministic level
+    def _moments(df_group):
+        w = df_group[weightname].values[:, None]
+        Y = df_group[out].values
+        mean = (w * Y).sum(axis=0)
+        var = (w * (Y - mean) ** 2).sum(axis=0)
+        ## Negative (Smolyak) weights can give a negative estimate
+        if (var < 0).any():
+            warnings.warn(
+                "negative variance estimate for {}; clipped to zero".format(
+                    [o for o, v in zip(out, var) if v < 0]
+                ),
+                UserWarning,
+            )
+            var = maximum(var, 0)
+
+        return DataFrame({outcol: out, "mean": mean, "var": var, "sd": sqrt(var)})
+
+    if len(var_det) == 0:
+        return _moments(df)
+
+    return (
+        df.groupby(var_det, sort=False)
+        .apply(_moments)
+        .reset_index(level=var_det)
+        .reset_index(drop=True)
+    )
+
+
+tf_moments = add_pipe(tran_moments)
+
 ## Linear algebra tools
 ##################################################
 ## Principal Component Analysis (PCA)
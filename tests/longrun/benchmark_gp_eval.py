@@ -0,0 +1,84 @@
+## Benchmark: FunctionGPR.eval throughput versus batch size
+#
+# Times GP surrogate prediction on frames with many passthrough columns, as
+# when a surrogate sits inside a Monte Carlo loop. Compares the vectorized
+# scaling in FunctionGPR.eval against the former approach, which copied the
+# full frame and scaled column-by-column before and after prediction.
+#
+# Usage:
+#   cd tests/longrun; python benchmark_gp_eval.py
+
+import sys
+import time
+
+sys.path.insert(0, "..")
+
+import pandas as pd
+
+from context import grama as gr
+from context import fit
+from context import models
+
+N_TRAIN = 200
+N_PASS = 50
+BATCHES = [10, 100, 1000, 10000, 100000]
+
+
+def scale_copy(df, lo, den, cols):
+    ## Former approach: copy full frame, loop over columns
+    df_res = df.copy()
+    for i, c in enumerate(cols):
+        df_res[c] = (df_res[c] - lo[i]) / den[i]
+    return df_res
+
+
+def restore_copy(df, lo, den, cols):
+    df_res = df.copy()
+    for i, c in enumerate(cols):
+        df_res[c] = den[i] * df[c] + lo[i]
+    return df_res
+
+
+def eval_copy(fun, df):
+    df_std = scale_copy(df, fun.x_lo, fun.x_den, fun.var)
+    y = fun._predict(df_std[fun.var].values)
+    return restore_copy(
+        pd.DataFrame(data=y.reshape((df.shape[0], -1)), columns=fun.out),
+        fun.y_lo,
+        fun.y_den,
+        fun.out,
+    )
+
+
+def best_time(f, n_rep=5):
+    times = []
+    for i in range(n_rep):
+        t0 = time.perf_counter()
+        f()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+if __name__ == "__main__":
+    md = models.make_cantilever_beam()
+    df_train = md >> gr.ev_monte_carlo(n=N_TRAIN, df_det="nom", seed=101)
+    md_gp = fit.fit_gp(df_train, var=md.var_rand, out=["g_stress"], n_restart=0)
+    fun = md_gp.functions[0]
+
+    print(
+        "{0:>8s} {1:>12s} {2:>12s} {3:>8s}".format(
+            "batch", "copy (r/s)", "vec (r/s)", "speedup"
+        )
+    )
+    for n in BATCHES:
+        df = md.density.sample(n=n, seed=102)
+        for i in range(N_PASS):
+            df["pass{}".format(i)] = 0.0
+
+        t_copy = best_time(lambda: eval_copy(fun, df))
+        t_vec = best_time(lambda: fun.eval(df))
+        print(
+            "{0:8d} {1:12.0f} {2:12.0f} {3:8.2f}".format(
+                n, n / t_copy, n / t_vec, t_copy / t_vec
+            )
+        )
@@ -17,6 +17,18 @@ class TestData(unittest.TestCase):
     def test_make(self):
         df_stang = data.df_stang
 
+    def test_lazy(self):
+        ## Loaded once, then cached
+        self.assertTrue(data.df_ruff is data.df_ruff)
+        self.assertTrue("df_ruff" in dir(data))
+        with self.assertRaises(AttributeError):
+            data.df_missing
+
+        ## Binary cache matches the source CSV
+        df_csv = pd.read_csv(data.datasets.path_grama / "data/ruff.csv")
+        self.assertTrue(data.datasets._load("df_ruff").equals(df_csv))
+        self.assertTrue(data.datasets._load("df_ruff").equals(df_csv))
+
     def test_install(self):
         # Only works if grama installed locally!
         from grama.data import df_stang
@@ -88,6 +88,33 @@ class TestJoins(unittest.TestCase):
         d = self.dfA >> gr.tf_set_diff(self.dfC)
         self.assertTrue(d.equals(ac))
 
+    def test_set_ops_by(self):
+        dfD = pd.DataFrame({"x1": ["B", "B", "E"], "x2": [1.0, 2.0, 3.0]})
+
+        ## Compare on a subset of columns
+        d = self.dfA >> gr.tf_intersect(dfD, by="x1")
+        self.assertTrue(d.equals(pd.DataFrame({"x1": ["B"], "x2": [2]})))
+        d = self.dfA >> gr.tf_set_diff(dfD, by=["x1"])
+        self.assertTrue(d.equals(self.dfA.iloc[[0, 2]]))
+        d = dfD >> gr.tf_union(self.dfC, by="x1", keep="last")
+        self.assertTrue(list(d.x1) == ["E", "B", "C", "D"])
+
+        ## Integer and float columns match
+        d = self.dfA >> gr.tf_intersect(dfD)
+        self.assertTrue(d.equals(pd.DataFrame({"x1": ["B"], "x2": [2]})))
+
+        ## Mixed-type object columns compare values, not their strings
+        dfE = pd.DataFrame(dict(x=[1, "1"]))
+        d = dfE >> gr.tf_set_diff(pd.DataFrame(dict(x=["1"])))
+        self.assertTrue(d.x.tolist() == [1] and isinstance(d.x[0], int))
+        d = dfE >> gr.tf_intersect(pd.DataFrame(dict(x=["1"])))
+        self.assertTrue(d.x.tolist() == ["1"])
+        d = dfE >> gr.tf_union(pd.DataFrame(dict(x=["1", 1, "2"])))
+        self.assertTrue(d.x.tolist() == [1, "1", "2"])
+
+        with self.assertRaises(ValueError):
+            self.dfA >> gr.tf_intersect(self.dfB, by="x2")
+
     ##==============================================================================
     ## bind rows, cols
     ##==============================================================================
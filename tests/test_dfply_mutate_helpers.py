@@ -48,3 +48,34 @@ class TestFactors(unittest.TestCase):
         # Check for ValueError
         with self.assertRaises(ValueError):
             gr.pareto_min([1], [1, 2, 3])
+
+        # Duplicates do not dominate each other
+        self.assertTrue(
+            (gr.pareto_min([0, 0, 1], [1, 1, 0]) == [True, True, True]).all()
+        )
+        # Higher dimensions
+        self.assertTrue(
+            (
+                gr.pareto_min([0, 1, 1, 0], [1, 0, 1, 1], [1, 1, 0, 2])
+                == [True, True, True, False]
+            ).all()
+        )
+
+    def test_pareto_rank(self):
+        df_test = gr.df_make(
+            x=[1, 2, 0, 1, 2, 0, 1, 2],
+            y=[0, 0, 1, 1, 1, 2, 2, 2],
+            r=[1, 2, 1, 2, 3, 2, 3, 4],
+        )
+
+        self.assertTrue(
+            (
+                df_test
+                >> gr.tf_mutate(r_comp=gr.pareto_rank(X.x, X.y))
+                >> gr.tf_mutate(flag=X.r == X.r_comp)
+            ).flag.all()
+        )
+
+        # Check for ValueError
+        with self.assertRaisesRegex(ValueError, "pareto_rank"):
+            gr.pareto_rank([1], [1, 2, 3])
@@ -36,13 +36,63 @@ class TestSummarize(unittest.TestCase):
             data.df_diamonds[data.df_diamonds.cut == c].price.std()
             for c in pcut.cut.values
         ]
+        df_res = (
+            data.df_diamonds
+            >> gr.tf_group_by("cut")
+            >> gr.tf_summarize(price_mean=X.price.mean(), price_std=X.price.std())
+        )
+        ## Grouped reductions may differ from Series methods in the last ulp
+        self.assertTrue(pcut.cut.equals(df_res.cut))
         self.assertTrue(
-            pcut.equals(
-                data.df_diamonds
-                >> gr.tf_group_by("cut")
-                >> gr.tf_summarize(price_mean=X.price.mean(), price_std=X.price.std())
+            np.allclose(
+                pcut[["price_mean", "price_std"]],
+                df_res[["price_mean", "price_std"]],
+                rtol=1e-12,
+                atol=0,
+            )
+        )
+
+    def test_summarize_native(self):
+        df = data.df_diamonds >> gr.tf_group_by("cut", "color")
+        summaries = dict(
+            mu=gr.mean(X.price),
+            sd=gr.sd(X.price),
+            var=X.price.var(),
+            med=gr.median(X["depth"]),
+            lo=gr.colmin(X.x),
+            hi=gr.colmax(X.x),
+            tot=gr.colsum(X.carat),
+            n=gr.n(X.x),
+            q=gr.quant(X.x, p=0.9),
+            iqr=gr.IQR(X.y),
+            c=1,
+        )
+
+        ## Native path matches per-group evaluation
+        delegation = gr.tf_summarize.function
+        native = delegation.native
+        df_native = df >> gr.tf_summarize(**summaries)
+        delegation.native = None
+        try:
+            df_apply = df >> gr.tf_summarize(**summaries)
+        finally:
+            delegation.native = native
+        self.assertTrue(list(df_native.columns) == list(df_apply.columns))
+        self.assertTrue(all(df_native.dtypes == df_apply.dtypes))
+        self.assertTrue(df_native[["color", "cut"]].equals(df_apply[["color", "cut"]]))
+        self.assertTrue(
+            np.allclose(
+                df_native.drop(columns=["color", "cut"]),
+                df_apply.drop(columns=["color", "cut"]),
+                rtol=1e-12,
+                atol=0,
             )
         )
+        self.assertTrue(df_native._grouped_by == ["cut", "color"])
+
+        ## Unrecognized functions fall back to per-group evaluation
+        df_res = df >> gr.tf_summarize(x0=gr.first(X.x), mu=gr.mean(X.price))
+        self.assertTrue(df_res.shape[0] == df_native.shape[0])
 
     def test_summarize_each(self):
         to_match = pd.DataFrame(
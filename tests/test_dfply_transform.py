@@ -29,6 +29,64 @@ class testTransform(unittest.TestCase):
             df.equals(data.df_diamonds >> gr.tf_mutate(testcol=np.mean(X.x)))
         )
 
+    def test_compiled(self):
+        base = gr.dfply.base
+        df = data.df_diamonds.head(100)
+
+        ## Compiled expressions match direct evaluation
+        exprs = [
+            X.x * X.y - 2 / X.z,
+            -(X.x ** 2) + 1,
+            (X.x > 4) & (X.cut == "Ideal"),
+            X.x.mean(),
+            X["price"].shift(1),
+            np.mean(X.x),
+            gr.if_else(X.x > 4, X.y, X.z),
+            gr.make_symbolic(lambda l, k=0: l[0] + l[1] * k)((X.x, X.y), k=X.z),
+        ]
+        for expr in exprs:
+            res = pd.Series(np.atleast_1d(expr.evaluate(df)))
+            self.assertTrue(res.equals(pd.Series(np.atleast_1d(expr.function(df)))))
+        ## Compilation is cached
+        expr = exprs[0]
+        expr.evaluate(df)
+        compiled = expr._Intention__compiled
+        expr.evaluate(df)
+        self.assertTrue(expr._Intention__compiled is compiled)
+
+        ## Arithmetic compiles to an eval string
+        self.assertTrue(
+            gr.compile_intention(X.x * X.y - 2 / X.z)[1] == "((x * y) - (2 / z))"
+        )
+        self.assertTrue(gr.compile_intention(X.x.mean())[1] is None)
+        self.assertTrue(gr.compile_intention(X.cut == "Ideal")[1] is None)
+
+        ## Eval path matches closure path
+        flag, rows = base._NUMEXPR, base._EVAL_ROWS
+        base._NUMEXPR, base._EVAL_ROWS = True, 10
+        try:
+            expr = X.x * X.y - 2 / X.z
+            self.assertTrue(np.allclose(expr.evaluate(df), expr.function(df)))
+            ## Names follow the closure path
+            self.assertTrue((X.x ** 2).evaluate(df).name == "x")
+            self.assertTrue(expr.evaluate(df).name is None)
+            ## Columns named like numexpr builtins
+            df_sin = pd.DataFrame(dict(sin=np.arange(20.0)))
+            res = (X.sin + 1).evaluate(df_sin)
+            self.assertTrue(res.equals(df_sin.sin + 1))
+        finally:
+            base._NUMEXPR, base._EVAL_ROWS = flag, rows
+
+        ## Columns named like Intention internals remain accessible
+        df_expr = pd.DataFrame(dict(expr=[1.0, 2.0], _compiled=[3.0, 4.0]))
+        df_res = df_expr >> gr.tf_mutate(y=X.expr + 1, z=X._compiled * 2)
+        self.assertTrue(df_res.y.tolist() == [2.0, 3.0])
+        self.assertTrue(df_res.z.tolist() == [6.0, 8.0])
+
+        ## Inversion is preserved through selection
+        df_sel = df >> gr.tf_select(~X.x)
+        self.assertTrue("x" not in df_sel.columns)
+
     def test_group_mutate(self):
         df = data.df_diamonds.copy()
         df = df.groupby("cut").apply(group_mutate_helper)
@@ -40,6 +98,54 @@ class testTransform(unittest.TestCase):
         )
         self.assertTrue(df.equals(d.sort_index()))
 
+    def test_group_mutate_native(self):
+        df = data.df_diamonds.sample(n=500, random_state=101).assign(
+            x=lambda df: df.x.where(df.y > 4), t=lambda df: df.table / 50
+        )
+        df_grouped = df >> gr.tf_group_by("cut", "color")
+        mutates = dict(
+            lg=gr.lag(X.x),
+            ld=gr.lead(X.x, i=2),
+            dx=X.x - gr.lag(X.x),
+            cs=gr.cumsum(X.price),
+            cp=gr.cumprod(X["t"]),
+            cm=gr.cummean(X.price),
+            cx=gr.cummax(X.price),
+            dr=gr.dense_rank(X.price),
+            mr=gr.min_rank(X.x, ascending=False),
+            rn=gr.row_number(X.price),
+            pr=gr.percent_rank(X.price),
+            big=X.carat > 1,
+            one=1,
+        )
+
+        ## Native path matches per-group evaluation
+        delegation = gr.tf_mutate.function
+        native = delegation.native
+        self.assertTrue(native(df_grouped, **mutates) is not None)
+        df_native = df_grouped >> gr.tf_mutate(**mutates)
+        delegation.native = None
+        try:
+            df_apply = df_grouped >> gr.tf_mutate(**mutates)
+        finally:
+            delegation.native = native
+        self.assertTrue(df_native.index.equals(df.index))
+        self.assertTrue(df_native.equals(df_apply.loc[df.index]))
+        self.assertTrue(df_native._grouped_by == ["cut", "color"])
+
+        ## Unrecognized functions fall back to per-group evaluation
+        df_res = df_grouped >> gr.tf_mutate(dx=X.x - gr.mean(X.x))
+        self.assertTrue(df_res.index.sort_values().equals(df.index.sort_values()))
+
+        ## Rows keep their input order, with interleaved groups
+        df_il = pd.DataFrame(
+            dict(g=list("ababab"), x=[1, 2, 3, 4, 5, 6]), index=range(10, 16)
+        )
+        df_res = df_il >> gr.tf_group_by("g") >> gr.tf_mutate(cs=gr.cumsum(X.x))
+        self.assertTrue(list(df_res.index) == list(range(10, 16)))
+        self.assertTrue(list(df_res.g) == list("ababab"))
+        self.assertTrue(list(df_res.cs) == [1, 2, 4, 6, 9, 12])
+
     def test_transmute(self):
         df = data.df_diamonds.copy()
         df["testcol"] = df["x"] * df["y"]
@@ -1,6 +1,9 @@
 import numpy as np
 import pandas as pd
+import os
+import tempfile
 import unittest
+import warnings
 
 from collections import OrderedDict as od
 from context import core
@@ -45,6 +48,80 @@ class TestDefaults(unittest.TestCase):
 
     ## Test default evaluations
 
+    def test_df_dedupe(self):
+        """Checks deduplicated evaluation matches full evaluation
+        """
+        rows = []
+
+        def fun(df):
+            rows.append(df.shape[0])
+            return gr.df_make(f=df.x + df.y, g=df.y)
+
+        md = gr.Model() >> gr.cp_vec_function(fun=fun, var=["x", "y"], out=["f", "g"])
+        df = gr.df_make(x=[0, 1, 0, 1, 0], y=[0.5, 0.5, 0.5, 0.25, 0.5], z=range(5))
+
+        df_full = gr.eval_df(md, df=df)
+        df_dedupe = gr.eval_df(md, df=df, dedupe=True, verbose=False)
+
+        ## Only unique rows evaluated; results scattered back
+        self.assertTrue(rows == [5, 3])
+        self.assertTrue(gr.df_equal(df_full, df_dedupe))
+        self.assertTrue(df_dedupe.z.tolist() == list(range(5)))
+
+        ## Mixed-type object inputs compare values
+        df_obj = gr.df_make(x=[1, "1", 1], y=0.5)
+        md_obj = gr.Model() >> gr.cp_vec_function(
+            fun=lambda df: gr.df_make(f=df.x.apply(type).astype(str)),
+            var=["x", "y"],
+            out=["f"],
+        )
+        df_res = gr.eval_df(md_obj, df=df_obj, dedupe=True, verbose=False)
+        self.assertTrue(gr.df_equal(df_res, gr.eval_df(md_obj, df=df_obj)))
+
+        ## Missing inputs raise
+        with self.assertRaises(ValueError):
+            gr.eval_df(md, df=df[["x"]], dedupe=True)
+
+    def test_df_checkpoint(self):
+        """Checks checkpointed evaluation recomputes only missing chunks
+        """
+        rows = []
+
+        def fun(df):
+            rows.append(df.shape[0])
+            return gr.df_make(f=df.x + df.y, g=df.y)
+
+        md = gr.Model() >> gr.cp_vec_function(fun=fun, var=["x", "y"], out=["f", "g"])
+        df = gr.df_make(x=range(25), y=0.5)
+        df_ref = gr.eval_df(md, df=df)
+
+        with tempfile.TemporaryDirectory() as path:
+            rows.clear()
+            df_res = gr.eval_df(md, df=df, checkpoint=path, chunk=10)
+            self.assertTrue(rows == [10, 10, 5])
+            self.assertTrue(gr.df_equal(df_res, df_ref))
+
+            ## Restart after losing a chunk
+            os.remove(os.path.join(path, sorted(os.listdir(path))[0]))
+            rows.clear()
+            df_res = gr.eval_df(md, df=df, checkpoint=path, chunk=10, verbose=False)
+            self.assertTrue(len(rows) == 1)
+            self.assertTrue(gr.df_equal(df_res, df_ref))
+
+            ## Changed model functions invalidate the checkpoint
+            md_new = gr.Model() >> gr.cp_vec_function(
+                fun=lambda df: gr.df_make(f=df.x - df.y, g=df.y),
+                var=["x", "y"],
+                out=["f", "g"],
+            )
+            df_res = gr.eval_df(md_new, df=df, checkpoint=path, chunk=10)
+            self.assertTrue(gr.df_equal(df_res, gr.eval_df(md_new, df=df)))
+
+            ## Chunks from other evaluations are pruned
+            gr.eval_df(md_new, df=df.head(10), checkpoint=path, chunk=10)
+            files = [f for f in os.listdir(path) if f.startswith("chunk-")]
+            self.assertTrue(len(files) == 1)
+
     def test_nominal(self):
         """Checks the nominal evaluation is accurate
         """
@@ -213,6 +290,49 @@ class TestRandom(unittest.TestCase):
         df_noappend = gr.eval_monte_carlo(self.md, df_det="nom", append=False)
         self.assertTrue(set(df_noappend.columns) == set(self.md.out))
 
+    def test_sink(self):
+        df_ref = gr.eval_monte_carlo(self.md, n=250, df_det="nom", seed=101)
+        with tempfile.TemporaryDirectory() as path:
+            for ext in (".parquet", ".feather"):
+                sink = os.path.join(path, "results" + ext)
+                df_res = gr.eval_monte_carlo(
+                    self.md, n=250, df_det="nom", seed=101, sink=sink
+                )
+                self.assertTrue(df_res.equals(df_ref))
+
+                ## Results and metadata read back
+                df_read = gr.read_sink(sink)
+                self.assertTrue(df_read.equals(df_ref))
+                self.assertTrue(df_read._plot_info["type"] == "monte_carlo_outputs")
+
+                ## Interrupted runs resume from completed chunks
+                df_in = df_ref.drop(columns=self.md.out)
+                gr.eval_df(self.md, df=df_in, sink=sink, chunk=100)
+                os.remove(os.path.join(sink, "part-00000" + ext))
+                df_resume = gr.eval_df(self.md, df=df_in, sink=sink, chunk=100)
+                self.assertTrue(df_resume.equals(df_ref))
+                self.assertTrue(gr.read_sink(sink).equals(df_ref))
+                self.assertTrue(len(os.listdir(sink)) == 4)
+
+            ## Metadata schema matches the parts, without appended inputs
+            sink = os.path.join(path, "outputs.parquet")
+            df_out = ev.eval_lhs(
+                self.md,
+                n=250,
+                df_det="nom",
+                seed=101,
+                append=False,
+                sink=sink,
+                chunk=100,
+            )
+            self.assertTrue(set(df_out.columns) == set(self.md.out))
+            self.assertTrue(len(os.listdir(sink)) == 4)
+            df_meta = pd.read_parquet(os.path.join(sink, "_common_metadata"))
+            self.assertTrue(list(df_meta.columns) == list(gr.read_sink(sink).columns))
+
+            with self.assertRaises(ValueError):
+                gr.eval_df(self.md, df=df_ref, sink=os.path.join(path, "res.csv"))
+
     def test_lhs(self):
         df_min = ev.eval_lhs(self.md, df_det="nom")
         self.assertTrue(df_min.shape == (1, self.md.n_var + self.md.n_out))
@@ -270,6 +390,115 @@ class TestRandom(unittest.TestCase):
         with self.assertRaises(ValueError):
             gr.eval_hybrid(md_buckle, df_det="nom")
 
+    def test_morris(self):
+        df_min = gr.eval_morris(self.md, df_det="nom")
+        self.assertTrue(
+            set(df_min.columns)
+            == set(self.md.var + self.md.out + ["morris_var", "morris_traj"])
+        )
+        self.assertTrue(df_min.shape[0] == 10 * (self.md.n_var_rand + 1))
+        self.assertTrue(df_min._meta["type"] == "eval_morris")
+
+        df_seeded = gr.eval_morris(self.md, df_det="nom", seed=101)
+        df_piped = self.md >> gr.ev_morris(df_det="nom", seed=101)
+        self.assertTrue(df_seeded.equals(df_piped))
+
+        ## Each step moves one variable
+        df_skip = gr.eval_morris(self.md, r=3, n_pool=6, df_det="nom", skip=True)
+        self.assertTrue(
+            set(df_skip.columns) == set(self.md.var + ["morris_var", "morris_traj"])
+        )
+        dX = df_skip[self.md.var_rand].diff().abs() > 0
+        I_step = df_skip.morris_var != "_"
+        self.assertTrue((dX[I_step].sum(axis=1) == 1).all())
+
+        ## Raises
+        with self.assertRaises(ValueError):
+            gr.eval_morris(self.md, levels=3, df_det="nom")
+        with self.assertRaises(ValueError):
+            gr.eval_morris(self.md, r=4, n_pool=2, df_det="nom")
+        md_buckle = models.make_plate_buckle()
+        with self.assertRaises(ValueError):
+            gr.eval_morris(md_buckle, df_det="nom")
+
+    def test_quadrature(self):
+        md_poly = (
+            gr.Model()
+            >> gr.cp_vec_function(
+                fun=lambda df: gr.df_make(y=df.x1 + df.x2 ** 2 + df.z),
+                var=["x1", "x2", "z"],
+                out=["y"],
+            )
+            >> gr.cp_bounds(z=[0, 1])
+            >> gr.cp_marginals(
+                x1=dict(dist="norm", loc=1, scale=2),
+                x2=dict(dist="uniform", loc=-1, scale=2),
+            )
+            >> gr.cp_copula_independence()
+        )
+
+        ## Quadrature is exact for low-order polynomials
+        for plan in ["smolyak", "tensor"]:
+            df_quad = md_poly >> gr.ev_quadrature(
+                level=3, plan=plan, df_det=gr.df_make(z=[0, 1])
+            )
+            self.assertTrue(df_quad._meta["type"] == "eval_quadrature")
+            self.assertTrue(
+                gr.df_equal(
+                    df_quad >> gr.tf_moments(),
+                    gr.df_make(
+                        z=[0, 1],
+                        out="y",
+                        mean=[4 / 3, 7 / 3],
+                        var=4 + 4 / 45,
+                        sd=np.sqrt(4 + 4 / 45),
+                    ),
+                    close=True,
+                )
+            )
+
+        ## Sparse grid uses fewer nodes than tensor grid
+        md_beam = models.make_cantilever_beam()
+        df_smolyak = md_beam >> gr.ev_quadrature(level=3, df_det="nom", skip=True)
+        df_tensor = md_beam >> gr.ev_quadrature(
+            level=3, plan="tensor", df_det="nom", skip=True
+        )
+        self.assertTrue(df_smolyak.shape[0] < df_tensor.shape[0])
+
+        ## Correlated variables
+        md_corr = (
+            gr.Model()
+            >> gr.cp_vec_function(
+                fun=lambda df: gr.df_make(y=df.x + df.w), var=["x", "w"], out=["y"],
+            )
+            >> gr.cp_marginals(
+                x=dict(dist="norm", loc=0, scale=1), w=dict(dist="norm", loc=0, scale=1)
+            )
+            >> gr.cp_copula_gaussian(
+                df_corr=pd.DataFrame(dict(var1=["x"], var2=["w"], corr=[0.5]))
+            )
+        )
+        df_moments = md_corr >> gr.ev_quadrature(level=2) >> gr.tf_moments()
+        self.assertTrue(np.isclose(df_moments["var"][0], 3))
+
+        ## Negative weights can give a negative variance; clip with warning
+        df_neg = gr.df_make(y=[0, 1, 2], _weight=[-0.5, 2, -0.5])
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            df_neg._meta = dict(
+                type="eval_quadrature", weightname="_weight", var_det=[], out=["y"]
+            )
+        with self.assertWarns(UserWarning):
+            df_neg_moments = df_neg >> gr.tf_moments()
+        self.assertTrue(df_neg_moments["var"][0] == 0)
+        self.assertTrue(df_neg_moments["sd"][0] == 0)
+
+        ## Raises
+        with self.assertRaises(ValueError):
+            gr.eval_quadrature(self.md, level=0, df_det="nom")
+        with self.assertRaises(ValueError):
+            gr.eval_quadrature(self.md, plan="foo", df_det="nom")
+
 
 ##################################################
 class TestOpt(unittest.TestCase):
@@ -324,6 +553,47 @@ class TestOpt(unittest.TestCase):
         df_multi = gr.eval_nls(md_feat, df_data=df_data, n_restart=2,)
         self.assertTrue(df_multi.shape[0] == 2)
 
+        ## Least squares methods
+        for method in ["trf", "lm"]:
+            df_ls = md_feat >> gr.ev_nls(df_data=df_data, method=method, append=True)
+            self.assertTrue(np.isclose(df_ls.x0[0], 0.1))
+            self.assertTrue(df_ls.mse[0] < 1e-12)
+
+    def test_pareto(self):
+        md_bk = (
+            gr.Model("Binh and Korn")
+            >> gr.cp_vec_function(
+                fun=lambda df: gr.df_make(
+                    f1=4 * df.x ** 2 + 4 * df.y ** 2,
+                    f2=(df.x - 5) ** 2 + (df.y - 5) ** 2,
+                    g1=(df.x - 5) ** 2 + df.y ** 2 - 25,
+                ),
+                var=["x", "y"],
+                out=["f1", "f2", "g1"],
+            )
+            >> gr.cp_bounds(x=(0, 5), y=(0, 3))
+        )
+
+        df_res = md_bk >> gr.ev_pareto(out_min=["f1", "f2"], out_leq=["g1"], seed=101)
+
+        # Check result is feasible and non-dominated
+        self.assertTrue((df_res.g1 <= 0).all())
+        self.assertTrue(gr.pareto_min(df_res.f1, df_res.f2).all())
+        self.assertTrue(df_res.shape[0] > 10)
+        # Check result spans the frontier
+        self.assertTrue(df_res.f1.min() < 1)
+        self.assertTrue(df_res.f2.min() < 5)
+
+        # Check errors for violated invariants
+        with self.assertRaises(ValueError):
+            gr.eval_pareto(md_bk, out_min=["f1"])
+        with self.assertRaises(ValueError):
+            gr.eval_pareto(md_bk, out_min=["f1", "FALSE"])
+        with self.assertRaises(ValueError):
+            gr.eval_pareto(md_bk, out_min=["f1", "f2"], out_geq=["FALSE"])
+        with self.assertRaises(ValueError):
+            gr.eval_pareto(md_bk >> gr.cp_bounds(x=(0, np.Inf)), out_min=["f1", "f2"])
+
     def test_opt(self):
         md_bowl = (
             gr.Model("Constrained bowl")
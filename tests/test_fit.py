@@ -54,7 +54,11 @@ class TestFits(unittest.TestCase):
         df_res = gr.eval_df(md_fit, self.df_smooth[self.md_smooth.var])
 
         ## GP provides std estimates
-        # self.assertTrue("y_std" in df_res.columns)
+        md_std = fit.fit_gp(self.df_smooth, md=self.md_smooth, return_std=True)
+        df_std = gr.eval_df(md_std, gr.df_make(x=[0, 0.5, 10]))
+        self.assertTrue("y_std" in df_std.columns)
+        self.assertTrue(df_std.y_std[0] < 1e-3)
+        self.assertTrue(df_std.y_std[1] < df_std.y_std[2])
 
         ## GP is an interpolation
         self.assertTrue(gr.df_equal(df_res, self.df_smooth, close=True))
@@ -63,6 +67,39 @@ class TestFits(unittest.TestCase):
         self.assertTrue(set(md_fit.var) == set(self.md_smooth.var))
         self.assertTrue(set(md_fit.out) == set(self.md_smooth.out))
 
+        ## Shared kernel fits all outputs with one function
+        md_shared = fit.fit_gp(self.df_smooth, md=self.md_smooth, shared=True)
+        df_shared = gr.eval_df(md_shared, self.df_smooth[self.md_smooth.var])
+        self.assertTrue(len(md_shared.functions) == 1)
+        self.assertTrue(gr.df_equal(df_shared, self.df_smooth, close=True))
+
+        ## Functions share training data
+        self.assertTrue(md_fit.functions[0].df_train is md_fit.functions[1].df_train)
+        ## Model copies share training data
+        md_copy = md_fit.copy()
+        self.assertTrue(md_copy.functions[0] is not md_fit.functions[0])
+        self.assertTrue(md_copy.functions[0].df_train is md_fit.functions[0].df_train)
+        self.assertTrue(gr.df_equal(gr.eval_df(md_copy, self.df_smooth), df_res))
+
+    def test_sgp(self):
+        ## Fit routine creates usable model
+        df_train = self.md_smooth >> gr.ev_df(
+            df=pd.DataFrame(dict(x=np.linspace(0, 2, num=50)))
+        )
+        md_fit = fit.fit_sgp(df_train, md=self.md_smooth, n_inducing=10, seed=101)
+        df_res = gr.eval_df(md_fit, self.df_smooth[self.md_smooth.var])
+
+        ## Sparse GP is accurate for smooth data
+        self.assertTrue(gr.df_equal(df_res, self.df_smooth, close=True))
+
+        ## Sparse GP provides std estimates
+        md_std = fit.fit_sgp(
+            df_train, md=self.md_smooth, n_inducing=10, seed=101, return_std=True
+        )
+        df_std = gr.eval_df(md_std, gr.df_make(x=[1, 10]))
+        self.assertTrue(set(md_std.out) == {"y", "z", "y_std", "z_std"})
+        self.assertTrue(df_std.y_std[0] < df_std.y_std[1])
+
     def test_rf(self):
         ## Fit routine creates usable model
         md_fit = fit.fit_rf(
@@ -87,6 +124,150 @@ class TestFits(unittest.TestCase):
         self.assertTrue(set(md_fit.var) == set(self.md_tree.var))
         self.assertTrue(set(md_fit.out) == set(self.md_tree.out))
 
+        ## Quantile regression forest reports ordered quantiles
+        md_qrf = fit.fit_rf(
+            self.df_tree,
+            md=self.md_tree,
+            quantiles=[0.1, 0.9],
+            n_jobs=2,
+            n_estimators=10,
+            seed=101,
+        )
+        self.assertTrue(
+            set(md_qrf.out) == {"y", "z", "y_q10", "y_q90", "z_q10", "z_q90"}
+        )
+        df_qrf = gr.eval_df(md_qrf, self.df_tree[self.md_tree.var])
+        self.assertTrue((df_qrf.z_q10 <= df_qrf.z_q90).all())
+        self.assertTrue(set(df_qrf.z_q10).issubset(set(self.df_tree.z)))
+
+        with self.assertRaises(ValueError):
+            fit.fit_rf(self.df_tree, md=self.md_tree, quantiles=[1.5])
+
+    def test_update(self):
+        df_new = self.md_smooth >> gr.ev_df(df=gr.df_make(x=[0.5, 1.5]))
+
+        ## GP update conditions on new data with fixed hyperparameters
+        md_gp = fit.fit_gp(self.df_smooth, md=self.md_smooth)
+        md_up = md_gp >> gr.cp_update(df=df_new)
+        gpr = md_up.functions[0].gpr
+        self.assertTrue(gpr.X_train_.shape[0] == 5)
+        self.assertTrue(gpr.kernel_ == md_gp.functions[0].gpr.kernel_)
+        ## Updated GP interpolates new data
+        df_res = gr.eval_df(md_up, df_new[self.md_smooth.var])
+        self.assertTrue(gr.df_equal(df_res, df_new, close=True))
+        ## Rank-k update matches factorization from scratch
+        K = gpr.kernel_(gpr.X_train_) + gpr.alpha * np.eye(5)
+        self.assertTrue(np.allclose(gpr.L_, np.linalg.cholesky(K)))
+
+        ## RF update grows new trees
+        md_rf = fit.fit_rf(self.df_tree, md=self.md_tree, n_estimators=4, seed=101)
+        md_rf_up = md_rf >> gr.cp_update(df=self.df_tree, n_estimators=2)
+        self.assertTrue(len(md_rf.functions[0].rf.estimators_) == 4)
+        self.assertTrue(len(md_rf_up.functions[0].rf.estimators_) == 6)
+
+        ## Mixed models pass each function only the arguments it accepts
+        md_mix = gr.Model(functions=[md_gp.functions[0], md_rf.functions[1]])
+        md_mix_up = md_mix >> gr.cp_update(df=df_new, optimize=False, n_estimators=2)
+        self.assertTrue(md_mix_up.functions[0].gpr.X_train_.shape[0] == 5)
+        self.assertTrue(len(md_mix_up.functions[1].rf.estimators_) == 6)
+        with self.assertRaises(ValueError):
+            md_mix >> gr.cp_update(df=df_new, n_trees=2)
+
+        ## Models without fitted functions cannot update
+        with self.assertRaises(ValueError):
+            self.md_smooth >> gr.cp_update(df=df_new)
+
+    def test_ols(self):
+        df = gr.df_make(x=[0, 1, 2, 3], y=[1, 2, 5, 10], z=[1, 3, 5, 7])
+
+        ## Outputs with identical RHS share one design
+        md_ols = fit.fit_ols(df, formulae=["y ~ x + I(x**2)", "z ~ x + I(x**2)"])
+        self.assertTrue(len(md_ols.functions[0].designs) == 1)
+        self.assertTrue(set(md_ols.var) == {"x"})
+        df_res = gr.eval_df(md_ols, df[["x"]])
+        self.assertTrue(gr.df_equal(df_res, df, close=True))
+
+        ## Distinct RHS and multi-output LHS
+        md_mix = df >> fit.ft_ols(formulae=["y + z ~ x", "x ~ 1"])
+        self.assertTrue(len(md_mix.functions[0].designs) == 2)
+        self.assertTrue(md_mix.functions[0].out == ["y", "z", "x"])
+        df_mix = md_mix.functions[0].eval(df)
+        self.assertTrue(np.allclose(df_mix.z, df.z))
+        self.assertTrue(np.allclose(df_mix.x, 1.5))
+
+        ## Inputs come from the design, not names in the formula text
+        md_log = fit.fit_ols(df, formulae=["y ~ I(z ** 2) + x"])
+        self.assertTrue(md_log.functions[0].var == ["z", "x"])
+
+        ## Missing values keep their rows, with NaN predictions
+        df_na = gr.df_make(x=[0, np.nan, 2])
+        df_pred = md_ols.functions[0].eval(df_na)
+        self.assertTrue(df_pred.shape[0] == 3)
+        self.assertTrue(np.isnan(df_pred.y[1]) and not np.isnan(df_pred.y[2]))
+        with self.assertRaises(Exception):
+            fit.fit_ols(
+                gr.df_make(x=[0, 1, np.nan], y=[0, 1, 2]), formulae=["y ~ x"]
+            )
+
+        ## Default linear features from model metadata
+        md_lin = fit.fit_ols(self.df_smooth, md=self.md_smooth)
+        df_lin = gr.eval_df(md_lin, self.df_smooth[["x"]])
+        self.assertTrue(gr.df_equal(df_lin, self.df_smooth, close=True))
+
+        ## Invariants
+        with self.assertRaises(ValueError):
+            fit.fit_ols(df)
+        with self.assertRaises(ValueError):
+            fit.fit_ols(df, formulae=["y ~ x", "y ~ z"])
+
+        ## Closed-form leave-one-out residuals
+        df_loo = md_ols.functions[0].loo()
+        e = (
+            df.y[0]
+            - fit.fit_ols(df.iloc[1:], formulae=["y ~ x + I(x**2)"])
+            .functions[0]
+            .eval(df.iloc[[0]])
+            .y[0]
+        )
+        self.assertTrue(np.isclose(df_loo.y[0], e))
+
+    def test_metamodel(self):
+        ## Default metamodel recipe
+        md_meta = self.md_smooth >> gr.cp_metamodel(n=10, seed=101)
+        df_meta = gr.eval_df(md_meta, self.df_smooth[["x"]])
+        self.assertTrue(gr.df_equal(df_meta, self.df_smooth, close=True))
+
+        ## Adaptive construction stops at target accuracy
+        md_ad = self.md_smooth >> gr.cp_metamodel(
+            n=20, adaptive=True, n_init=4, tol=1e-6, seed=101
+        )
+        self.assertTrue(isinstance(md_ad, gr.Model))
+        df_hist = md_ad.history
+        self.assertTrue(df_hist.n_eval.tolist() == [4])
+        self.assertTrue(df_hist.error[0] < 1e-6)
+
+        ## Adaptive construction stops at budget, with k-fold error estimate
+        md_sin = (
+            gr.Model()
+            >> gr.cp_function(fun=lambda x: np.sin(3 * x), var=["x"], out=["y"])
+            >> gr.cp_marginals(x={"dist": "uniform", "loc": 0, "scale": 2})
+            >> gr.cp_copula_independence()
+        )
+        md_rf = md_sin >> gr.cp_metamodel(
+            n=12,
+            ft=fit.ft_rf(md=md_sin, n_estimators=5, seed=101),
+            adaptive=True,
+            n_init=6,
+            n_add=3,
+            seed=101,
+        )
+        df_hist = md_rf.history
+        self.assertTrue(df_hist.n_eval.tolist() == [6, 9, 12])
+        ## History survives copies and further composition
+        md_rf_b = md_rf >> gr.cp_bounds(x=(0, 2))
+        self.assertTrue(md_rf_b.history.equals(df_hist))
+        self.assertTrue(set(df_hist.columns) == {"n_eval", "error", "error_y"})
+
     def test_lolo(self):
         ## Fit routine creates usable model
         md_fit = fit.fit_lolo(
@@ -165,6 +346,23 @@ class TestFits(unittest.TestCase):
         ## Fit the model
         md_fit = df_data >> gr.ft_nls(md=md_param, verbose=False, uq_method="linpool",)
 
+        ## Reused optimizer Jacobian matches a fresh one
+        # -------------------------
+        md_trf = df_data >> gr.ft_nls(
+            md=md_param, verbose=False, uq_method="linpool", method="trf"
+        )
+        md_fresh = df_data >> gr.ft_nls(
+            md=md_param, verbose=False, uq_method="linpool", batch_grad=False
+        )
+        for v in ["a", "c"]:
+            self.assertTrue(
+                np.isclose(
+                    md_trf.density.marginals[v].d_param["scale"],
+                    md_fresh.density.marginals[v].d_param["scale"],
+                    rtol=1e-2,
+                )
+            )
+
         ## Unidentifiable model throws warning
         # -------------------------
         md_unidet = (
@@ -217,3 +415,53 @@ class TestFits(unittest.TestCase):
             md=md_base, method="SLSQP", tol=1e-3
         )
         df_tmp = md_fit >> gr.ev_nominal(df_det="nom")
+
+    def test_pce(self):
+        ## Additive model with exact polynomial representation
+        md_true = (
+            gr.Model()
+            >> gr.cp_vec_function(
+                fun=lambda df: gr.df_make(y=df.x1 + df.x2 ** 2 + df.z),
+                var=["x1", "x2", "z"],
+                out=["y"],
+            )
+            >> gr.cp_bounds(z=[0, 1])
+            >> gr.cp_marginals(
+                x1={"dist": "norm", "loc": 0, "scale": 1},
+                x2={"dist": "uniform", "loc": -1, "scale": 2},
+            )
+            >> gr.cp_copula_independence()
+        )
+        df_data = md_true >> gr.ev_monte_carlo(
+            n=20, seed=101, df_det=gr.df_make(z=np.linspace(0, 1, num=5))
+        )
+        md_pce = df_data >> gr.ft_pce(md=md_true, order=3)
+
+        ## Fit recovers the function
+        df_test = md_true >> gr.ev_monte_carlo(n=10, seed=102, df_det="nom")
+        df_pred = md_pce >> gr.ev_df(df=df_test[md_true.var])
+        self.assertTrue(np.allclose(df_pred.y, df_test.y))
+
+        ## Moments and Sobol' indices from coefficients
+        df_mom = md_pce.functions[0].moments()
+        var_true = 1 + 4 / 45 + 1 / 12
+        self.assertTrue(np.isclose(df_mom.loc[0, "mean"], 1 / 3 + 1 / 2))
+        self.assertTrue(np.isclose(df_mom.loc[0, "var"], var_true))
+
+        df_first = md_pce.functions[0].sobol(plan="first")
+        df_total = md_pce.functions[0].sobol(plan="total")
+        self.assertTrue(
+            gr.df_equal(
+                df_first,
+                gr.df_make(
+                    y=[1 / var_true, (4 / 45) / var_true, (1 / 12) / var_true],
+                    ind=["S_x1", "S_x2", "S_z"],
+                ),
+                close=True,
+            )
+        )
+        self.assertTrue(np.allclose(df_first.y, df_total.y))
+
+        ## Invalid basis
+        with self.assertRaises(ValueError):
+            df_data >> gr.ft_pce(md=md_true, order=10, sparse=False)
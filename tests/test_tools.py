@@ -16,6 +16,57 @@ class TestPipe(unittest.TestCase):
         ## Chain
         res = self.md >> gr.ev_hybrid(df_det="nom") >> gr.tf_sobol()
 
+    def test_pipe_cow(self):
+        df = gr.df_make(x=[1.0, 2.0], y=[0.1, 0.2])
+        df_orig = df.copy()
+        mode = gr.set_pipe_copy("cow")
+        try:
+            ## Verbs that write into their input do not modify the original
+            df_res = df >> gr.tf_mutate_if(lambda c: c.mean() < 1, lambda c: c * 10)
+            self.assertTrue(gr.df_equal(df, df_orig))
+            self.assertTrue(np.allclose(df_res.y, [1, 2]))
+            ## Stages renaming the axes do not modify the original
+            def rename_axes(df):
+                df.index.name = "i"
+                df.columns.name = "c"
+                return df
+
+            df_res = df >> gr.pipe(rename_axes)
+            self.assertTrue(df_res.index.name == "i")
+            self.assertTrue((df.index.name is None) and (df.columns.name is None))
+
+            ## Other stages receive a copy up front, and run once
+            calls = []
+
+            def write_input(df):
+                calls.append(1)
+                df["x"] = 0.0
+                return df
+
+            df_res = df >> gr.pipe(write_input)
+            self.assertTrue(len(calls) == 1)
+            self.assertTrue(gr.df_equal(df, df_orig))
+
+            ## Registered verbs share data with their input
+            df_head = df >> gr.tf_head(1)
+            self.assertTrue(np.shares_memory(df_head.x.values, df.x.values))
+
+            ## Original remains writable
+            self.assertTrue(all(df[c].values.flags.writeable for c in df.columns))
+
+            ## Metadata is carried
+            df_grouped = df >> gr.tf_group_by("x") >> gr.tf_mutate(z=1)
+            self.assertTrue(df_grouped._grouped_by == ["x"])
+
+            ## Models are passed through
+            md = self.md >> gr.cp_bounds(x0=(-2, 2))
+            self.assertTrue(self.md.domain.get_bound("x0") != (-2, 2))
+        finally:
+            gr.set_pipe_copy(mode)
+
+        with self.assertRaises(ValueError):
+            gr.set_pipe_copy("shallow")
+
 
 class TestMarginals(unittest.TestCase):
     def setUp(self):
@@ -3,6 +3,7 @@ import pandas as pd
 import unittest
 import io
 import sys
+import warnings
 
 from context import grama as gr
 from context import data
@@ -150,6 +151,85 @@ class TestTools(unittest.TestCase):
             check_column_type=False,
         )
 
+    def test_lazy(self):
+        X = gr.Intention()
+        df = gr.df_make(
+            x=[1.0, 2.0, 3.0, 4.0], y=[4.0, 3.0, 2.0, 1.0], z=["a", "b", "a", "b"]
+        )
+
+        ## Filters move ahead of elementwise mutates; mutates fuse; columns prune
+        lf = (
+            gr.lazy(df)
+            >> gr.tf_mutate(s=X.x + X.y)
+            >> gr.tf_mutate(t=X.s * 2)
+            >> gr.tf_filter(X.z == "a")
+            >> gr.tf_select("t", "x")
+        )
+        columns, steps = lf.plan()
+        self.assertTrue(set(columns) == {"x", "y", "z"})
+        self.assertTrue(len(steps) == 3)
+        self.assertTrue(steps[0]._verb is gr.tf_filter)
+        self.assertTrue(
+            gr.df_equal(lf >> gr.collect(), gr.df_make(t=[10.0, 10.0], x=[1.0, 3.0]))
+        )
+        self.assertTrue(gr.df_equal(lf >> gr.collect(), lf.collect(optimize=False)))
+
+        ## Filters stay behind mutates that depend on other rows
+        lf_lag = gr.lazy(df) >> gr.tf_mutate(l=gr.lag(X.x)) >> gr.tf_filter(X.z == "b")
+        self.assertTrue(lf_lag.plan()[1][0]._verb is gr.tf_mutate)
+        self.assertTrue(
+            gr.df_equal(lf_lag >> gr.collect(), lf_lag.collect(optimize=False))
+        )
+
+        ## Filters stay behind mutates that assign their columns
+        lf_dep = gr.lazy(df) >> gr.tf_mutate(x=X.y) >> gr.tf_filter(X.x > 2)
+        self.assertTrue(lf_dep.plan()[1][0]._verb is gr.tf_mutate)
+
+        ## Filters stay behind reducers and window helpers
+        df_y = gr.df_make(y=[1.0, 8.0, 3.0, 4.0])
+        for value in (gr.colmax(X.y), gr.lag(X.y), X.y - gr.mean(X.y)):
+            lf_red = gr.lazy(df_y) >> gr.tf_mutate(z=value) >> gr.tf_filter(X.y < 5)
+            self.assertTrue(lf_red.plan()[1][0]._verb is gr.tf_mutate)
+            self.assertTrue(
+                gr.df_equal(lf_red >> gr.collect(), lf_red.collect(optimize=False))
+            )
+        self.assertTrue(
+            all(
+                (
+                    gr.lazy(df_y)
+                    >> gr.tf_mutate(z=gr.colmax(X.y))
+                    >> gr.tf_filter(X.y < 5)
+                    >> gr.collect()
+                ).z
+                == 8
+            )
+        )
+
+        ## Unused columns are pruned in plans that project columns
+        lf_sum = gr.lazy(df) >> gr.tf_summarize(x_mean=gr.mean(X.x))
+        self.assertTrue(lf_sum.plan()[0] == ["x"])
+        lf_sel = (
+            gr.lazy(df)
+            >> gr.tf_mutate(s=X.x * 2)
+            >> gr.tf_arrange("y")
+            >> gr.tf_select("s")
+            >> gr.tf_mutate(t=X.s + 1)
+        )
+        self.assertTrue(lf_sel.plan()[0] == ["x", "y"])
+        self.assertTrue(
+            gr.df_equal(lf_sel >> gr.collect(), lf_sel.collect(optimize=False))
+        )
+        lf_all = gr.lazy(df) >> gr.tf_mutate(s=X.x * 2)
+        self.assertTrue(lf_all.plan()[0] == ["x", "y", "z"])
+        lf_opq = gr.lazy(df) >> gr.tf_filter(lambda d: d.x > 1) >> gr.tf_select("x")
+        self.assertTrue(lf_opq.plan()[0] == ["x", "y", "z"])
+
+        ## Filters with opaque expressions stay in place
+        lf_opq = (
+            gr.lazy(df) >> gr.tf_mutate(s=X.x + 1) >> gr.tf_filter(lambda d: d.s > 2)
+        )
+        self.assertTrue(lf_opq.plan()[1][0]._verb is gr.tf_mutate)
+
 
 # --------------------------------------------------
 class TestSummaries(unittest.TestCase):
@@ -176,6 +256,55 @@ class TestSummaries(unittest.TestCase):
         self.assertTrue(set(df_sobol.columns) == set(["y0", "ind"]))
         self.assertTrue(set(df_sobol["ind"]) == set(["S_x0", "S_x1"]))
 
+    def test_morris(self):
+        md_linear = (
+            gr.Model()
+            >> gr.cp_function(fun=lambda x: x[0] - 2 * x[1], var=2, out=1)
+            >> gr.cp_marginals(
+                x0={"dist": "uniform", "loc": 0, "scale": 1},
+                x1={"dist": "uniform", "loc": 0, "scale": 1},
+            )
+            >> gr.cp_copula_independence()
+        )
+        df_morris = gr.eval_morris(md_linear, r=5, seed=101)
+        df_res = df_morris >> gr.tf_morris()
+
+        df_true = pd.DataFrame(
+            dict(
+                var=["x0", "x1"],
+                out=["y0", "y0"],
+                mu=[1.0, -2.0],
+                mu_star=[1.0, 2.0],
+                sigma=[0.0, 0.0],
+            )
+        )
+        self.assertTrue(gr.df_equal(df_true, df_res, close=True))
+
+        ## Trajectories are differenced separately, so they may interleave
+        df_shuffled = df_morris.iloc[
+            np.argsort(df_morris.groupby("morris_traj").cumcount(), kind="stable")
+        ]
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            df_shuffled._meta = df_morris._meta
+        self.assertTrue(gr.df_equal(df_true, df_shuffled >> gr.tf_morris(), close=True))
+
+        ## Steps that do not move the variable are skipped
+        df_flat = gr.eval_morris(md_linear, r=5, seed=101, skip=True)
+        df_flat["x1"] = 0.5
+        df_flat = gr.eval_df(md_linear, df=df_flat)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            df_flat._meta = df_morris._meta
+        with self.assertWarns(UserWarning):
+            df_res_flat = df_flat >> gr.tf_morris()
+        self.assertTrue(set(df_res_flat["var"]) == {"x0"})
+        self.assertTrue(np.isclose(df_res_flat.mu[0], 1.0))
+
+        ## Raises
+        with self.assertRaises(ValueError):
+            gr.tran_morris(gr.eval_hybrid(self.md, df_det="nom"))
+
     def test_pca(self):
         df_test = pd.DataFrame(dict(x0=[1, 2, 3], x1=[1, 2, 3]))
         df_offset = pd.DataFrame(dict(x0=[1, 2, 3], x1=[3, 4, 5]))